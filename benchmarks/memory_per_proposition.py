@@ -0,0 +1,88 @@
+"""
+Memory retained by the specification and by the ASP program of a fact-heavy input, per proposition.
+With --without-slots, the classes of cnl2asp are loaded without their __slots__, so that their instances have
+a dictionary as before the slots were declared.
+
+Usage: PYTHONPATH=src python benchmarks/memory_per_proposition.py [--without-slots] [number of nodes]
+"""
+import ast
+import gc
+import importlib.abc
+import importlib.machinery
+import sys
+import tracemalloc
+
+
+class _WithoutSlotsLoader(importlib.machinery.SourceFileLoader):
+    def get_code(self, fullname):
+        tree = ast.parse(self.get_data(self.path), self.path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                node.body = [statement for statement in node.body if not _is_slots(statement)] or [ast.Pass()]
+        return compile(ast.fix_missing_locations(tree), self.path, 'exec')
+
+
+def _is_slots(statement: ast.stmt) -> bool:
+    targets = statement.targets if isinstance(statement, ast.Assign) else \
+        [statement.target] if isinstance(statement, ast.AnnAssign) else []
+    return any(isinstance(target, ast.Name) and target.id == '__slots__' for target in targets)
+
+
+class _WithoutSlotsFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        if fullname.split('.')[0] != 'cnl2asp':
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is not None and isinstance(spec.loader, importlib.machinery.SourceFileLoader):
+            spec.loader = _WithoutSlotsLoader(fullname, spec.origin)
+        return spec
+
+
+def generate_input(nodes: int) -> str:
+    sentences = [f'A node goes from 1 to {nodes}.',
+                 'A color is one of red, green, blue.']
+    for node in range(1, nodes + 1):
+        neighbours = ', '.join(str((node + shift) % nodes + 1) for shift in range(3))
+        sentences.append(f'Node {node} is connected to node X, where X is one of {neighbours}.')
+    sentences.append('Every node can be assigned to exactly 1 color.')
+    sentences.append('It is required that when node X is connected to node Y then node X is not assigned '
+                     'to color C and also node Y is not assigned to color C.')
+    return '\n'.join(sentences)
+
+
+def measure(nodes: int) -> tuple[int, int]:
+    from cnl2asp.converter.asp_converter import ASPConverter
+    from cnl2asp.parser.parser import CNLTransformer
+    from cnl2asp.parser.sentence_parser import SentenceParser
+    from cnl2asp.utility.compilation_context import CompilationContext
+
+    tree = SentenceParser(propagate_positions=False).parse(generate_input(nodes))
+    context = CompilationContext()
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    specification = CNLTransformer(context).transform(tree)
+    encoding = specification.convert(ASPConverter(context))
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    propositions = sum(len(problem.get_propositions()) for problem in specification.get_problems())
+    del encoding
+    return end - start, propositions
+
+
+def main():
+    arguments = sys.argv[1:]
+    without_slots = '--without-slots' in arguments
+    if without_slots:
+        arguments.remove('--without-slots')
+        sys.meta_path.insert(0, _WithoutSlotsFinder())
+    nodes = int(arguments[0]) if arguments else 500
+    retained, propositions = measure(nodes)
+    print(f'{"without" if without_slots else "with"} slots: '
+          f'{propositions} propositions, {retained / 1024 / 1024:.1f} MiB retained, '
+          f'{retained / propositions:.0f} bytes per proposition')
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ from cnl2asp.specification.aggregate_component import AggregateOperation
 
 
 class ASPAggregate(ASPElement):
+    __slots__ = ('operation', 'discriminant', 'body')
     symbols = {
         AggregateOperation.SUM: 'sum',
         AggregateOperation.COUNT: 'count',
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 
 from cnl2asp.specification.attribute_component import AttributeOrigin, is_same_origin
-from cnl2asp.utility.utility import Utility
+from cnl2asp.utility.compilation_context import CompilationContext
 from .asp_attribute import ASPAttribute
 from .asp_element import ASPElement
 
 
 class ASPAtom(ASPElement):
+    __slots__ = ('name', 'attributes', 'negated', 'is_before', 'is_after', 'is_initial', 'is_final')
+
     def __init__(self, name: str, attributes: list[ASPAttribute], negated: bool = False,
                  is_before: bool = False, is_after: bool = False, is_initial: bool = False, is_final: bool = False):
         self.name = name
@@ -72,36 +74,50 @@ class ASPAtom(ASPElement):
         string += '__' if self.is_final else ''
         string += f'{self.name}'
         string += '\'' if self.is_after else ''
-        string += '('
-        if Utility.PRINT_WITH_FUNCTIONS:
-            visited = []
-            for attribute1 in self.attributes:
-                if attribute1 in visited:
-                    continue
-                visited.append(attribute1)
-                if attribute1.origin and attribute1.origin.name != self.name:
-                    tmp_atom = ASPAtom(attribute1.origin.name, [ASPAttribute(attribute1.name, attribute1.get_value(),
-                                                                             attribute1.origin.origin)])
-                    for attribute2 in self.attributes:
-                        if attribute2 in visited:
-                            continue
-                        if attribute2.origin and attribute1.origin.name == attribute2.origin.name:
-                            visited.append(attribute2)
-                            tmp_atom.attributes.append(ASPAttribute(attribute2.name, attribute2.get_value(),
-                                                                    attribute2.origin.origin))
-                    string += str(tmp_atom) + ','
-                else:
-                    string += str(attribute1) + ','
-            if string[-1] == ',':
-                string = string[0:-1]
-            return string + ')'
-        else:
-            return string + f'{",".join([str(x) for x in self.attributes])})'
+        return string + f'({self.get_arguments()})'
+
+    def get_arguments(self) -> str:
+        """
+        Return the arguments of the atom, as printed between its parentheses.
+        """
+        return ",".join([str(argument) for argument in self.get_argument_list()])
+
+    def get_argument_list(self) -> list[ASPAttribute | ASPAtom]:
+        """
+        Return the arguments of the atom: its attributes or, printing with functions, the attributes of the atom
+        and the atoms of the attributes coming from other concepts.
+        """
+        if not CompilationContext.get_current().print_with_functions:
+            return self.attributes
+        arguments = []
+        visited = []
+        for attribute1 in self.attributes:
+            if attribute1 in visited:
+                continue
+            visited.append(attribute1)
+            if attribute1.origin and attribute1.origin.name != self.name:
+                tmp_atom = ASPAtom(attribute1.origin.name, [ASPAttribute(attribute1.name, attribute1.get_value(),
+                                                                         attribute1.origin.origin)])
+                for attribute2 in self.attributes:
+                    if attribute2 in visited:
+                        continue
+                    if attribute2.origin and attribute1.origin.name == attribute2.origin.name:
+                        visited.append(attribute2)
+                        tmp_atom.attributes.append(ASPAttribute(attribute2.name, attribute2.get_value(),
+                                                                attribute2.origin.origin))
+                arguments.append(tmp_atom)
+            else:
+                arguments.append(attribute1)
+        return arguments
 
     def __eq__(self, other):
         if not isinstance(other, ASPAtom):
             return False
         return self.name == other.name and self.attributes == other.attributes and self.is_initial == other.is_initial and self.is_after == other.is_after and self.is_before == other.is_before
 
+    def __hash__(self):
+        # the hash of the fields compared by __eq__, it changes if the atom is modified
+        return hash((self.name, tuple(self.attributes), self.is_initial, self.is_after, self.is_before))
+
     def __repr__(self):
         return str(self)
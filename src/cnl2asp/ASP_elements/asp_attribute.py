@@ -10,6 +10,8 @@ from cnl2asp.ASP_elements.asp_element import ASPElement
 
 
 class ASPValue(ASPElement, str):
+    __slots__ = ()
+
     def is_null(self):
         return self == Utility.ASP_NULL_VALUE
 
@@ -18,6 +20,8 @@ class ASPValue(ASPElement, str):
 
 
 class RangeASPValue(ASPValue):
+    __slots__ = ()
+
     def __new__(cls, content):
         return str.__new__(cls, content.replace(' ', '..'))
 
@@ -33,7 +37,33 @@ class RangeASPValue(ASPValue):
         return RangeASPValue(value)
 
 
+class PoolASPValue(ASPElement):
+    """
+    Alternative values, e.g. (1;2).
+    """
+    __slots__ = ('values',)
+
+    def __init__(self, values: list[ASPValue]):
+        self.values: tuple[ASPValue, ...] = tuple(values)
+
+    def __str__(self):
+        return f'({";".join(self.values)})'
+
+    def __eq__(self, other):
+        if not isinstance(other, PoolASPValue):
+            return False
+        return self.values == other.values
+
+    def __hash__(self):
+        return hash(self.values)
+
+    def __repr__(self):
+        return str(self)
+
+
 class ASPAttribute(ASPElement):
+    __slots__ = ('name', '_value', 'origin', 'operations')
+
     def __init__(self, name: str, value: ASPValue, origin: AttributeOrigin = None,
                  operations: list[ASPOperation] = None):
         if operations is None:
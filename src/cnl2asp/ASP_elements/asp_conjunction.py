@@ -6,6 +6,8 @@ from cnl2asp.specification.signaturemanager import SignatureManager
 
 
 class ASPConjunction(ASPElement):
+    __slots__ = ('conjunction',)
+
     def __init__(self, conjunction: list[ASPElement]):
         self.conjunction = conjunction
 
@@ -47,5 +49,8 @@ class ASPConjunction(ASPElement):
             return False
         return self.conjunction == other.conjunction
 
+    def __hash__(self):
+        return hash(tuple(self.conjunction))
+
     def __repr__(self):
         return str(self)
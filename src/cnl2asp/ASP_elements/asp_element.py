@@ -1,12 +1,15 @@
 from __future__ import annotations
+import io
 from abc import abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TextIO
 
 if TYPE_CHECKING:
     from cnl2asp.ASP_elements.asp_atom import ASPAtom
 
 
 class ASPElement:
+    __slots__ = ()
+
     def get_attributes_list(self, name):
         raise Exception("Looking for attribute in a non-ASPAtom element.")
 
@@ -18,3 +21,15 @@ class ASPElement:
 
     def is_null(self):
         return False
+
+    def write_to(self, stream: TextIO):
+        """
+        Write the element to the stream, as it is printed.
+        """
+        stream.write(str(self))
+
+    def _render(self) -> str:
+        # printing of the elements that are written to the stream a piece at a time
+        stream = io.StringIO()
+        self.write_to(stream)
+        return stream.getvalue()
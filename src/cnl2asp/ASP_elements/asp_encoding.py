@@ -1,8 +1,12 @@
+from typing import TextIO
+
 from cnl2asp.ASP_elements.asp_element import ASPElement
 from cnl2asp.ASP_elements.asp_program import ASPProgram
 
 
 class ASPEncoding(ASPElement):
+    __slots__ = ('_programs', '_constants', '_telingo_constants')
+
     def __init__(self):
         self._programs: list[ASPProgram] = []
         self._constants: list[(str, str)] = []
@@ -22,11 +26,48 @@ class ASPEncoding(ASPElement):
     def add_program(self, program: ASPProgram):
         self._programs.append(program)
 
+    def get_programs(self) -> list[ASPProgram]:
+        return self._programs
+
+    @staticmethod
+    def constant_to_string(constant: (str, str)) -> str:
+        return f'#const {constant[0]} = {constant[1]}.\n' if constant[1] else ''
+
+    def get_constants(self) -> list[(str, str)]:
+        return self._constants
+
     def __str__(self):
-        string = ''
+        return self._render()
+
+    def write_to(self, stream: TextIO):
+        # the encoding is printed without leading and trailing whitespaces, ending with a new line
+        stripped_stream = _StrippedWriter(stream)
         for constant in self._constants:
-            if constant[1]:
-                string += f'#const {constant[0]} = {constant[1]}.\n'
+            stripped_stream.write(ASPEncoding.constant_to_string(constant))
         for program in self._programs:
-            string += str(program)
-        return string.strip() + '\n'
+            program.write_to(stripped_stream)
+        stream.write('\n')
+
+
+class _StrippedWriter:
+    """
+    Writer to a stream that drops the leading whitespaces, and the trailing ones of the text written so far.
+    """
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._started = False
+        self._whitespaces = ''  # trailing whitespaces, written only if followed by other text
+
+    def write(self, text: str):
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return
+            self._started = True
+        stripped_text = text.rstrip()
+        if stripped_text:
+            self._stream.write(self._whitespaces + stripped_text)
+            self._whitespaces = text[len(stripped_text):]
+        else:
+            self._whitespaces += text
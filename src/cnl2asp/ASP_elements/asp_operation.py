@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 
 
 class ASPOperation(ASPElement):
+    __slots__ = ('operator', 'operands')
     operators = {
         Operators.SUM: '+',
         Operators.DIFFERENCE: '-',
@@ -64,6 +65,8 @@ class ASPOperation(ASPElement):
 
 
 class ASPAngleOperation(ASPOperation):
+    __slots__ = ()
+
     def __init__(self, operator: Operators, *operands: ASPElement):
         super(ASPAngleOperation, self).__init__(operator, *operands)
 
@@ -77,6 +80,7 @@ class ASPAngleOperation(ASPOperation):
 
 
 class ASPTemporalOperation(ASPOperation):
+    __slots__ = ()
     asp_temporal_operators = {
         Operators.CONJUNCTION: '&',
         Operators.DISJUNCTION: '|',
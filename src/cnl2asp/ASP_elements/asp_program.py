@@ -1,8 +1,13 @@
+from typing import TextIO
+
 from cnl2asp.ASP_elements.asp_element import ASPElement
 from cnl2asp.ASP_elements.asp_rule import ASPRule
+from cnl2asp.utility.compilation_context import CompilationContext
 
 
 class ASPProgram(ASPElement):
+    __slots__ = ('name', '_rules')
+
     def __init__(self, name: str = ''):
         self.name: str = name
 
@@ -11,8 +16,24 @@ class ASPProgram(ASPElement):
     def add_rule(self, rule: ASPRule):
         self._rules.append(rule)
 
+    def get_rules(self) -> list[ASPRule]:
+        return self._rules
+
+    def get_header(self) -> str:
+        return f'\n#program {self.name}.\n' if self.name else ''
+
     def __str__(self) -> str:
-        program = f'\n#program {self.name}.\n' if self.name else ''
+        return self._render()
+
+    def write_to(self, stream: TextIO):
+        stream.write(self.get_header())
+        if not CompilationContext.get_current().remove_duplicate_rules:
+            for rule in self._rules:
+                rule.write_to(stream)
+            return
+        printed_rules = set()
         for rule in self._rules:
-            program += str(rule)
-        return program
+            string = str(rule)
+            if string not in printed_rules:
+                printed_rules.add(string)
+                stream.write(string)
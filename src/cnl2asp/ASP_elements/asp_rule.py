@@ -1,11 +1,22 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, TextIO
+
 from cnl2asp.ASP_elements.asp_aggregate import ASPAggregate
-from cnl2asp.ASP_elements.asp_attribute import ASPAttribute
+from cnl2asp.ASP_elements.asp_attribute import ASPAttribute, ASPValue
 from cnl2asp.ASP_elements.asp_element import ASPElement
 from cnl2asp.ASP_elements.asp_atom import ASPAtom
 from cnl2asp.ASP_elements.asp_conjunction import ASPConjunction
+from cnl2asp.ASP_elements.asp_temporal_formula import ASPTemporalFormula
+
+if TYPE_CHECKING:
+    from cnl2asp.specification.entity_component import TemporalRange
 
 
 class ASPRuleHead(ASPElement):
+    __slots__ = ('choice_element', 'condition')
+
     def __init__(self, choice_element: ASPAtom, condition: ASPConjunction = None):
         if condition is None:
             condition = ASPConjunction([])
@@ -19,13 +30,21 @@ class ASPRuleHead(ASPElement):
             head += f': {condition}'
         return head
 
+    def get_atom_list(self) -> list[ASPAtom]:
+        return self.choice_element.get_atom_list() + self.condition.get_atom_list()
+
     def __eq__(self, other):
         if not isinstance(other, ASPRuleHead):
             return False
         return self.choice_element == other.choice_element and self.condition == other.condition
 
+    def __hash__(self):
+        return hash((self.choice_element, self.condition))
+
 
 class ASPRule(ASPElement):
+    __slots__ = ('head', 'body', 'cardinality')
+
     def __init__(self, body: ASPConjunction = ASPConjunction([]), head=None,
                  cardinality: (int | None, int | None) = None):
         if head is None:
@@ -41,87 +60,201 @@ class ASPRule(ASPElement):
     def _remove_duplicates(self):
         if self.body:
             to_remove = self._get_duplicates(self.body.conjunction, self.body.conjunction)
-            for elem in to_remove:
-                self.body.remove_element(elem)
+            self._remove_elements(self.body, to_remove)
         for head in self.head:
             if head.condition and self.body:
                 to_remove = self._get_duplicates(head.condition.get_atom_list(), self.body.get_atom_list())
-                for elem in to_remove:
-                    head.condition.remove_element(elem)
+                self._remove_elements(head.condition, to_remove)
 
-    def _get_duplicates(self, default_list: list[ASPAtom], comparison_list: list[ASPAtom]) -> list[ASPAtom]:
+    @staticmethod
+    def _get_duplicates(default_list: list[ASPElement], comparison_list: list[ASPElement]) -> list[ASPElement]:
+        """
+        Return the elements of default_list equal to another element of comparison_list that is not removed.
+        Of equal elements of the same list only the last one is kept, while an element repeated is never removed.
+        """
+        # equal elements -> [ids of the distinct equal elements, number of them not removed]
+        comparison: dict[ASPElement, list] = {}
+        for component in comparison_list:
+            equal_components = comparison.setdefault(component, [set(), 0])
+            if id(component) not in equal_components[0]:
+                equal_components[0].add(id(component))
+                equal_components[1] += 1
+        removed: set[int] = set()
         to_remove = []
-        for component_1 in default_list:
-            for component_2 in comparison_list:
-                if (not component_1 is component_2) and not any(component_2 is x for x in to_remove) and component_1 == component_2:
-                    to_remove.append(component_1)
-                    break
+        for component in default_list:
+            equal_components = comparison.get(component)
+            if equal_components is None:
+                continue
+            is_comparable = id(component) in equal_components[0] and id(component) not in removed
+            if equal_components[1] - is_comparable > 0:
+                to_remove.append(component)
+                equal_components[1] -= is_comparable
+                removed.add(id(component))
         return to_remove
 
+    @staticmethod
+    def _remove_elements(conjunction: ASPConjunction, elements: list[ASPElement]):
+        # same as removing the elements one at a time: the first equal element is removed for each of them
+        if not elements:
+            return
+        to_remove = Counter(elements)
+        kept = []
+        for element in conjunction.conjunction:
+            if to_remove.get(element):
+                to_remove[element] -= 1
+            else:
+                kept.append(element)
+        conjunction.conjunction[:] = kept
+
+    def get_atom_list(self) -> list[ASPAtom]:
+        atom_list = []
+        for head in self.head:
+            atom_list += head.get_atom_list()
+        return atom_list + (self.body.get_atom_list() if self.body else [])
+
     def _is_choice_rule(self):
         if self.cardinality:
             return True
         return False
 
     def __str__(self) -> str:
-        rule = ''
-        separator = ' | '
-        if self._is_choice_rule():
-            separator = " ; "
+        return self._render()
+
+    def write_to(self, stream: TextIO):
+        self._write_rule(stream, ':-')
+        stream.write('.\n')
+
+    def _write_rule(self, stream: TextIO, neck: str):
         if self.head:
-            for idx, element in enumerate(self.head):
-                if idx > 0:
-                    rule += separator
-                rule += str(element)
+            separator = ' ; ' if self._is_choice_rule() else ' | '
+            head = separator.join([str(element) for element in self.head])
             if self.cardinality:
-                rule = f'{str(self.cardinality[0]) + " <= " if self.cardinality[0] else ""}' \
-                       f'{{{rule}}}' \
+                head = f'{str(self.cardinality[0]) + " <= " if self.cardinality[0] else ""}' \
+                       f'{{{head}}}' \
                        f'{" <= " + str(self.cardinality[1]) if self.cardinality[1] else ""}'
-        rule = rule.strip()
+            stream.write(head.strip())
         if self.body.conjunction:
-            body = str(self.body)
             if self.head:
-                rule += f' '
-                for elem in body.split(','):
-                    if elem.strip().startswith('&tel'):
-                        body = body.replace(elem, f'not not {elem.strip()}')
-            rule += f':- {body}'
-        rule += '.\n'
-        return rule
+                stream.write(' ')
+            stream.write(f'{neck} ')
+            self._write_body(stream)
+
+    def _write_body(self, stream: TextIO):
+        separator = ''
+        for element in self.body.conjunction:
+            string = str(element)
+            if not string:
+                continue
+            if self.head and isinstance(element, ASPTemporalFormula) and not element.negated:
+                # the temporal formulas in the body of a rule with a head are double negated,
+                # and take the place of the space after the comma
+                stream.write(f'{separator.rstrip()}not not {string}')
+            else:
+                stream.write(f'{separator}{string}')
+            separator = ', '
 
     def __eq__(self, other):
         if not isinstance(other, ASPRule):
             return False
         return self.head == other.head and self.body == other.body and self.cardinality == other.cardinality
 
+    def __hash__(self):
+        return hash((tuple(self.head), self.body, self.cardinality))
+
+    def __repr__(self):
+        return str(self)
+
+
+class ASPFacts(ASPElement):
+    """
+    Facts of the same predicate, printed one per line or, if pooled, as a single fact with a pool of the arguments.
+    """
+    __slots__ = ('facts', 'pooled')
+
+    def __init__(self, facts: list[ASPAtom], pooled: bool = False):
+        self.facts = facts
+        self.pooled = pooled
+
+    def __str__(self) -> str:
+        return self._render()
+
+    def write_to(self, stream: TextIO):
+        if self.pooled and len(self.facts) > 1:
+            stream.write(f'{self.facts[0].name}({";".join(fact.get_arguments() for fact in self.facts)}).\n')
+            return
+        for fact in self.facts:
+            stream.write(f'{fact}.\n')
+
+    def get_atom_list(self) -> list[ASPAtom]:
+        return list(self.facts)
+
+    def __eq__(self, other):
+        if not isinstance(other, ASPFacts):
+            return False
+        return self.facts == other.facts
+
+    def __hash__(self):
+        return hash(tuple(self.facts))
+
+    def __repr__(self):
+        return str(self)
+
+
+class ASPTemporalFacts(ASPElement):
+    """
+    Facts of the values of a temporal concept, e.g. day(0,"01/01/2022"), each labelled with its position.
+    Without labels, a single fact defines the positions of the range, whose label is the UNLABELLED constant.
+    """
+    __slots__ = ('name', 'values', 'labelled')
+    UNLABELLED = 'unlabelled'  # a symbolic constant, never equal to the quoted labels
+
+    def __init__(self, name: str, values: TemporalRange, labelled: bool = True):
+        self.name = name
+        self.values = values
+        self.labelled = labelled
+
+    def __str__(self) -> str:
+        return self._render()
+
+    def write_to(self, stream: TextIO):
+        if not self.labelled:
+            stream.write(f'{self.name}(0..{len(self.values) - 1},{ASPTemporalFacts.UNLABELLED}).\n')
+            return
+        key_name = self.name.removesuffix('s')
+        for value, idx in self.values.items():
+            atom = ASPAtom(self.name, [ASPAttribute(key_name, ASPValue(idx)),
+                                       ASPAttribute('value', ASPValue(f'\"{value}\"'))])
+            stream.write(f'{atom}.\n')
+
+    def __eq__(self, other):
+        if not isinstance(other, ASPTemporalFacts):
+            return False
+        return self.name == other.name and self.values == other.values and self.labelled == other.labelled
+
+    def __hash__(self):
+        return hash((self.name, self.values, self.labelled))
+
     def __repr__(self):
         return str(self)
 
 
 class ASPWeakConstraint(ASPRule):
+    __slots__ = ('weight', 'level', 'discriminant')
+
     def __init__(self, body: ASPConjunction, weight: str, level: int, discriminant: list[ASPAttribute]):
         super().__init__(body)
         self.weight = weight
         self.level = level
         self.discriminant = discriminant
 
-    def __str__(self) -> str:
-        weak_constraint = super().__str__()
-        weak_constraint = weak_constraint.replace(':-', ':~')
-        weak_constraint = weak_constraint.replace('\n', ' ')
-        weak_constraint += f'[{self.weight}@{self.level}'
+    def write_to(self, stream: TextIO):
+        self._write_rule(stream, ':~')
+        stream.write(f'. [{self.weight}@{self.level}')
         if self.discriminant:
-            added = set()
-            attributes = []
-            for attribute in self.discriminant:
-                str_attr = str(attribute)
-                if str_attr not in added:
-                    attributes.append(str_attr)
-                    added.add(str_attr)
-            weak_constraint += f',{",".join(attributes)}]\n'
-        else:
-            weak_constraint += ']\n'
-        return weak_constraint
+            # each attribute is printed once
+            attributes = dict.fromkeys([str(attribute) for attribute in self.discriminant])
+            stream.write(f',{",".join(attributes)}')
+        stream.write(']\n')
 
     def __repr__(self):
         return str(self)
@@ -131,3 +264,6 @@ class ASPWeakConstraint(ASPRule):
         if not isinstance(other, ASPWeakConstraint):
             return False
         return self.weight == other.weight and self.level == other.level and self.discriminant == other.discriminant
+
+    def __hash__(self):
+        return hash((self.weight, self.level, tuple(self.discriminant)))
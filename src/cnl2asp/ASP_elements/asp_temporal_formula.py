@@ -2,6 +2,7 @@ from cnl2asp.ASP_elements.asp_element import ASPElement
 
 
 class ASPTemporalFormula(ASPElement):
+    __slots__ = ('operations', 'negated')
 
     def __init__(self, operations: list[ASPElement], negated=False):
         self.operations = operations
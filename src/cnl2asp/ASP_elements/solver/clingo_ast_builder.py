@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+import clingo
+from clingo import ast
+
+from cnl2asp.ASP_elements.asp_aggregate import ASPAggregate
+from cnl2asp.ASP_elements.asp_atom import ASPAtom
+from cnl2asp.ASP_elements.asp_attribute import ASPAttribute, ASPValue, PoolASPValue
+from cnl2asp.ASP_elements.asp_conjunction import ASPConjunction
+from cnl2asp.ASP_elements.asp_element import ASPElement
+from cnl2asp.ASP_elements.asp_encoding import ASPEncoding
+from cnl2asp.ASP_elements.asp_operation import ASPOperation
+from cnl2asp.ASP_elements.asp_program import ASPProgram
+from cnl2asp.ASP_elements.asp_rule import ASPRule, ASPFacts, ASPTemporalFacts, ASPWeakConstraint, ASPRuleHead
+from cnl2asp.specification.aggregate_component import AggregateOperation
+from cnl2asp.specification.operation_component import Operators
+from cnl2asp.utility.compilation_context import CompilationContext
+
+CACHE_SIZE = 4096
+
+_VARIABLE = re.compile(r"[A-Z_][A-Za-z0-9_']*")
+_LOCATION = ast.Location(ast.Position('<cnl2asp>', 1, 1), ast.Position('<cnl2asp>', 1, 1))
+
+_COMPARISON_OPERATORS = {
+    Operators.EQUALITY: ast.ComparisonOperator.Equal,
+    Operators.INEQUALITY: ast.ComparisonOperator.NotEqual,
+    Operators.GREATER_THAN: ast.ComparisonOperator.GreaterThan,
+    Operators.LESS_THAN: ast.ComparisonOperator.LessThan,
+    Operators.GREATER_THAN_OR_EQUAL_TO: ast.ComparisonOperator.GreaterEqual,
+    Operators.LESS_THAN_OR_EQUAL_TO: ast.ComparisonOperator.LessEqual,
+}
+# the operator of a comparison with its operands swapped, e.g. #count{...} < 3 is 3 > #count{...}
+_SWAPPED_OPERATORS = {
+    ast.ComparisonOperator.Equal: ast.ComparisonOperator.Equal,
+    ast.ComparisonOperator.NotEqual: ast.ComparisonOperator.NotEqual,
+    ast.ComparisonOperator.GreaterThan: ast.ComparisonOperator.LessThan,
+    ast.ComparisonOperator.LessThan: ast.ComparisonOperator.GreaterThan,
+    ast.ComparisonOperator.GreaterEqual: ast.ComparisonOperator.LessEqual,
+    ast.ComparisonOperator.LessEqual: ast.ComparisonOperator.GreaterEqual,
+}
+_ARITHMETIC_OPERATORS = {
+    Operators.SUM: ast.BinaryOperator.Plus,
+    Operators.DIFFERENCE: ast.BinaryOperator.Minus,
+    Operators.MULTIPLICATION: ast.BinaryOperator.Multiplication,
+    Operators.DIVISION: ast.BinaryOperator.Modulo,  # printed as \
+}
+_AGGREGATE_FUNCTIONS = {
+    AggregateOperation.SUM: ast.AggregateFunction.Sum,
+    AggregateOperation.COUNT: ast.AggregateFunction.Count,
+    AggregateOperation.MAX: ast.AggregateFunction.Max,
+    AggregateOperation.MIN: ast.AggregateFunction.Min,
+}
+
+
+class _Unsupported(Exception):
+    """
+    The element has no direct translation, its statement is parsed from its text.
+    """
+
+
+def _value_term(value: str) -> ast.AST:
+    if _VARIABLE.fullmatch(value):
+        return ast.Variable(_LOCATION, value)
+    if value.startswith('"'):
+        return _symbolic_term(value)
+    if value.startswith('-') and _VARIABLE.fullmatch(value[1:]):
+        return ast.UnaryOperation(_LOCATION, ast.UnaryOperator.Minus, ast.Variable(_LOCATION, value[1:]))
+    if '..' in value:
+        start, end = value.split('..', 1)
+        return ast.Interval(_LOCATION, _value_term(start), _value_term(end))
+    return _symbolic_term(value)
+
+
+def _symbolic_term(value: str) -> ast.AST:
+    symbol = _parse_symbol(value)
+    if symbol is None:
+        raise _Unsupported(value)
+    return ast.SymbolicTerm(_LOCATION, symbol)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_symbol(value: str) -> clingo.Symbol | None:
+    try:
+        return clingo.parse_term(value)
+    except RuntimeError:
+        return None
+
+
+class ClingoASTBuilder:
+    """
+    Statements of clingo's abstract syntax tree of an ASP encoding, built from its elements without printing
+    and parsing the program. The statements can be added to a clingo.ast.ProgramBuilder or given to ngo.
+    The few elements without a direct translation, e.g. the temporal formulas, are parsed from the text of
+    their rule. The options of the active compilation context apply as in the printed program.
+    """
+
+    def __init__(self):
+        # line of the last statement in the printed program, ngo names its auxiliary predicates after it
+        self._line = 0
+
+    def build(self, encoding: ASPEncoding) -> list[ast.AST]:
+        self._line = 0
+        statements = [ast.Program(_LOCATION, 'base', [])]
+        for name, value in encoding.get_constants():
+            if value:
+                statements.append(self._locate(ast.Definition(_LOCATION, name, _value_term(str(value)), True)))
+        for program in encoding.get_programs():
+            statements += self.build_program(program)
+        return statements
+
+    def build_program(self, program: ASPProgram) -> list[ast.AST]:
+        statements = []
+        if program.name:
+            if self._line:
+                self._line += 1  # the empty line before the header
+            statements.append(self._locate(ast.Program(_LOCATION, program.name, [])))
+        remove_duplicate_rules = CompilationContext.get_current().remove_duplicate_rules
+        built_rules = set()
+        for rule in program.get_rules():
+            if remove_duplicate_rules:
+                string = str(rule)
+                if string in built_rules:
+                    continue
+                built_rules.add(string)
+            statements += self.build_statements(rule)
+        return statements
+
+    def build_statements(self, element: ASPElement) -> list[ast.AST]:
+        """
+        Return the statements of a rule, of a weak constraint or of facts.
+        """
+        try:
+            if isinstance(element, ASPFacts):
+                statements = self._facts(element)
+            elif isinstance(element, ASPTemporalFacts):
+                statements = self._temporal_facts(element)
+            elif isinstance(element, ASPWeakConstraint):
+                statements = [self._weak_constraint(element)]
+            elif isinstance(element, ASPRule):
+                statements = [self._rule(element)]
+            else:
+                raise _Unsupported(element)
+        except _Unsupported:
+            statements = []
+            ast.parse_string(str(element), statements.append)
+            statements = statements[1:]  # without the #program base. statement
+        return [self._locate(statement) for statement in statements]
+
+    def _locate(self, statement: ast.AST) -> ast.AST:
+        self._line += 1
+        position = ast.Position('<string>', self._line, 1)
+        return statement.update(location=ast.Location(position, position))
+
+    def _facts(self, facts: ASPFacts) -> list[ast.AST]:
+        if facts.pooled and len(facts.facts) > 1:
+            pool = ast.Pool(_LOCATION, [self._function(fact) for fact in facts.facts])
+            return [self._fact(ast.SymbolicAtom(pool))]
+        return [self._fact(self._atom(fact)) for fact in facts.facts]
+
+    def _temporal_facts(self, temporal_facts: ASPTemporalFacts) -> list[ast.AST]:
+        if not temporal_facts.labelled:
+            interval = ast.Interval(_LOCATION, _value_term('0'), _value_term(str(len(temporal_facts.values) - 1)))
+            label = ast.SymbolicTerm(_LOCATION, clingo.Function(ASPTemporalFacts.UNLABELLED))
+            function = ast.Function(_LOCATION, str(temporal_facts.name), [interval, label], False)
+            return [self._fact(ast.SymbolicAtom(function))]
+        facts = []
+        for value, idx in temporal_facts.values.items():
+            arguments = [ast.SymbolicTerm(_LOCATION, clingo.Number(idx)),
+                         ast.SymbolicTerm(_LOCATION, clingo.String(str(value)))]
+            function = ast.Function(_LOCATION, str(temporal_facts.name), arguments, False)
+            facts.append(self._fact(ast.SymbolicAtom(function)))
+        return facts
+
+    @staticmethod
+    def _fact(atom: ast.AST) -> ast.AST:
+        return ast.Rule(_LOCATION, ast.Literal(_LOCATION, ast.Sign.NoSign, atom), [])
+
+    def _rule(self, rule: ASPRule) -> ast.AST:
+        body = self._literals(rule.body) if rule.body.conjunction else []
+        return ast.Rule(_LOCATION, self._head(rule), body)
+
+    def _weak_constraint(self, weak_constraint: ASPWeakConstraint) -> ast.AST:
+        # each attribute is printed once
+        discriminant = dict.fromkeys([str(attribute) for attribute in weak_constraint.discriminant])
+        weight = _value_term(str(weak_constraint.weight))
+        level = _value_term(str(weak_constraint.level))
+        body = self._literals(weak_constraint.body) if weak_constraint.body.conjunction else []
+        return ast.Minimize(_LOCATION, weight, level, [_value_term(attribute) for attribute in discriminant], body)
+
+    def _head(self, rule: ASPRule) -> ast.AST:
+        if not rule.head:
+            return ast.Literal(_LOCATION, ast.Sign.NoSign, ast.BooleanConstant(False))
+        elements = [self._conditional_literal(head) for head in rule.head]
+        if rule.cardinality:
+            lower_bound, upper_bound = rule.cardinality
+            left_guard = ast.Guard(ast.ComparisonOperator.LessEqual, _value_term(str(lower_bound))) \
+                if lower_bound else None
+            right_guard = ast.Guard(ast.ComparisonOperator.LessEqual, _value_term(str(upper_bound))) \
+                if upper_bound else None
+            if not left_guard and right_guard:
+                # as parsed by clingo, a single guard is on the left
+                left_guard, right_guard = ast.Guard(ast.ComparisonOperator.GreaterEqual, right_guard.term), None
+            return ast.Aggregate(_LOCATION, left_guard, elements, right_guard)
+        if len(elements) == 1 and not elements[0].condition:
+            return elements[0].literal
+        return ast.Disjunction(_LOCATION, elements)
+
+    def _conditional_literal(self, head: ASPRuleHead) -> ast.AST:
+        if not isinstance(head.choice_element, ASPAtom):
+            raise _Unsupported(head)
+        condition = self._literals(head.condition) if str(head.condition) else []
+        return ast.ConditionalLiteral(_LOCATION, self._literal(head.choice_element), condition)
+
+    def _literals(self, conjunction: ASPConjunction) -> list[ast.AST]:
+        literals = []
+        for element in conjunction.conjunction:
+            if isinstance(element, ASPAtom) and not element.name:
+                continue  # not printed
+            literals.append(self._literal(element))
+        return literals
+
+    def _literal(self, element: ASPElement) -> ast.AST:
+        if type(element) is ASPAtom:
+            sign = ast.Sign.Negation if element.negated else ast.Sign.NoSign
+            return ast.Literal(_LOCATION, sign, self._atom(element))
+        if type(element) is ASPOperation and element.operator in _COMPARISON_OPERATORS and len(element.operands) == 2:
+            operator = _COMPARISON_OPERATORS[element.operator]
+            left, right = element.operands
+            if isinstance(left, ASPAggregate) and not isinstance(right, ASPAggregate):
+                left, right, operator = right, left, _SWAPPED_OPERATORS[operator]
+            if isinstance(right, ASPAggregate) and not isinstance(left, ASPAggregate):
+                aggregate = self._aggregate(right, ast.Guard(operator, self._term(left)))
+                return ast.Literal(_LOCATION, ast.Sign.NoSign, aggregate)
+            return ast.Literal(_LOCATION, ast.Sign.NoSign,
+                               ast.Comparison(self._term(left), [ast.Guard(operator, self._term(right))]))
+        raise _Unsupported(element)
+
+    def _aggregate(self, aggregate: ASPAggregate, left_guard: ast.AST) -> ast.AST:
+        terms = [self._term(element) for element in aggregate.discriminant]
+        element = ast.BodyAggregateElement(terms, self._literals(aggregate.body))
+        return ast.BodyAggregate(_LOCATION, left_guard, _AGGREGATE_FUNCTIONS[aggregate.operation], [element], None)
+
+    def _atom(self, atom: ASPAtom) -> ast.AST:
+        if atom.is_before or atom.is_after or atom.is_initial or atom.is_final:
+            raise _Unsupported(atom)  # temporal atoms
+        return ast.SymbolicAtom(self._function(atom))
+
+    def _function(self, atom: ASPAtom) -> ast.AST:
+        return ast.Function(_LOCATION, str(atom.name), [self._term(argument) for argument in atom.get_argument_list()],
+                            False)
+
+    def _term(self, element: ASPElement) -> ast.AST:
+        if isinstance(element, ASPValue):
+            return _value_term(str(element))
+        if isinstance(element, PoolASPValue):
+            return ast.Pool(_LOCATION, [_value_term(value) for value in element.values])
+        if isinstance(element, ASPAttribute):
+            return _value_term(str(element.get_value()))
+        if isinstance(element, ASPAtom) and element.name:
+            return self._function(element)
+        if type(element) is ASPOperation and element.operator in _ARITHMETIC_OPERATORS and element.operands:
+            operator = _ARITHMETIC_OPERATORS[element.operator]
+            term = self._term(element.operands[0])
+            for operand in element.operands[1:]:
+                term = ast.BinaryOperation(_LOCATION, operator, term, self._term(operand))
+            return term
+        if type(element) is ASPOperation and element.operator == Operators.ABSOLUTE_VALUE \
+                and len(element.operands) == 1:
+            return ast.UnaryOperation(_LOCATION, ast.UnaryOperator.Absolute, self._term(element.operands[0]))
+        raise _Unsupported(element)
@@ -67,7 +67,7 @@ class ClingoResultParser:
             for attribute in atom.get_keys_and_attributes():
                 try:
                     subject_attribute = subject.get_attributes_by_name_and_origin(attribute.get_name(), attribute.origin)[0]
-                    subject.get_keys().remove(subject_attribute)
+                    (subject.keys if subject.keys else subject.attributes).remove(subject_attribute)
                     attributes_to_print.append(attribute)
                 except:
                     pass
@@ -100,21 +100,14 @@ class ClingoResultParser:
     def _attributes_intersection(self, entity_1: EntityComponent, entity_2: EntityComponent):
         matched_attributes = []
         for attribute in entity_1.get_keys():
-            try:
-                match = entity_2.get_attributes_by_name_and_origin(attribute.get_name(), attribute.origin)
-                matched_attributes += match
-            except:
-                pass
+            matched_attributes += entity_2.find_attributes_by_name_and_origin(attribute.get_name(), attribute.origin)
         return matched_attributes
 
     def _has_same_value_attribute(self, attribute: AttributeComponent, entity: EntityComponent) -> bool:
-        try:
-            match = entity.get_attributes_by_name_and_origin(attribute.get_name(), attribute.origin)
-            for value in match:
-                if attribute.value == value.value:
-                    return True
-        except:
-            return False
+        for value in entity.find_attributes_by_name_and_origin(attribute.get_name(), attribute.origin):
+            if attribute.value == value.value:
+                return True
+        return False
 
     def _check_attributes_list(self, attributes: list[AttributeComponent], entity: EntityComponent) -> bool:
         for attribute in attributes:
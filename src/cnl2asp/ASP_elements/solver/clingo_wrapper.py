@@ -2,6 +2,7 @@ import copy
 from typing import List
 
 import clingo
+from clingo.ast import AST, ProgramBuilder
 
 
 class Clingo:
@@ -11,8 +12,16 @@ class Clingo:
         self.prg.configuration.solve.opt_mode = 'optN'
         self.prg.configuration.solve.models = '1'
 
-    def load(self, encoding: str):
-        self.prg.add(encoding)
+    def load(self, encoding: str | list[AST]):
+        """
+        Load the ASP code, or its statements as returned by Cnl2asp.compile_ast without parsing them.
+        """
+        if isinstance(encoding, str):
+            self.prg.add(encoding)
+            return
+        with ProgramBuilder(self.prg) as builder:
+            for statement in encoding:
+                builder.add(statement)
 
     def solve(self) -> list[str]:
         self.prg.ground([("base", [])])
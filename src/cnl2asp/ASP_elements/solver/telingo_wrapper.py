@@ -5,12 +5,19 @@ import tempfile
 from io import StringIO
 import sys
 
+from clingo.ast import AST
+
 
 class Telingo:
     def __init__(self):
         self.encoding = ''
 
-    def load(self, encoding: str):
+    def load(self, encoding: str | list[AST]):
+        """
+        Load the ASP code, or its statements as returned by Cnl2asp.compile_ast, that are solved from a file.
+        """
+        if not isinstance(encoding, str):
+            encoding = ''.join(f'{statement}\n' for statement in encoding)
         self.encoding = encoding
 
     def solve(self, time_limit=0) -> list:
@@ -2,28 +2,39 @@ from __future__ import annotations
 
 import argparse
 import collections
+import io
 import json
 import os
 import sys
-import tempfile
 import traceback
 from enum import Enum
+from functools import cached_property
 from textwrap import indent
-from typing import TextIO
+from typing import TextIO, Iterator, TYPE_CHECKING
 
 from cnl2asp.utility.utility import Utility
-from lark import Lark, UnexpectedCharacters, Token, Tree
+from lark import UnexpectedCharacters, Token, Tree
 from lark.exceptions import VisitError
 
+from cnl2asp.ASP_elements.asp_encoding import ASPEncoding
 from cnl2asp.ASP_elements.asp_program import ASPProgram
 from cnl2asp.converter.cnl2json_converter import Cnl2jsonConverter
 from cnl2asp.exception.cnl2asp_exceptions import ParserError
 from cnl2asp.specification.attribute_component import AttributeComponent
 from cnl2asp.specification.entity_component import EntityComponent
 from cnl2asp.converter.asp_converter import ASPConverter
+from cnl2asp.parser.sentence_parser import SentenceParser, ParserProfile, ParsedSentence, PROBLEM_IDENTIFIERS, \
+    UnparsableSentence, split_sentences
 from cnl2asp.parser.parser import CNLTransformer
+from cnl2asp.parser.sentence_transformer import IncrementalTransformer, SentenceTransformer
+from cnl2asp.specification.problem import Problem
 from cnl2asp.specification.signaturemanager import SignatureManager
 from cnl2asp.specification.specification import SpecificationComponent
+from cnl2asp.utility.compilation_cache import CompilationCache, DEFAULT_MAX_SIZE, package_version
+from cnl2asp.utility.compilation_context import CompilationContext
+
+if TYPE_CHECKING:
+    from clingo.ast import AST
 
 
 class SymbolType(Enum):
@@ -71,86 +82,391 @@ class Symbol:
     def __hash__(self):
         return hash((self.predicate, tuple(self.attributes), tuple(self.keys), self.symbol_type))
 
+    def to_json(self) -> dict:
+        return {'predicate': self.predicate,
+                'keys': [key if isinstance(key, str) else key.to_json() for key in self.keys],
+                'attributes': [attribute if isinstance(attribute, str) else attribute.to_json()
+                               for attribute in self.attributes],
+                'type': self.symbol_type.name}
+
+    @staticmethod
+    def from_json(symbol: dict) -> Symbol:
+        return Symbol(symbol['predicate'],
+                      [key if isinstance(key, str) else Symbol.from_json(key) for key in symbol['keys']],
+                      [attribute if isinstance(attribute, str) else Symbol.from_json(attribute)
+                       for attribute in symbol['attributes']],
+                      SymbolType[symbol['type']])
+
 
 class Cnl2asp:
-    def __init__(self, cnl_input: TextIO | str, debug: bool = False):
+    def __init__(self, cnl_input: TextIO | str, debug: bool = False,
+                 parser_profile: ParserProfile = ParserProfile.SENTENCE, incremental: bool = False,
+                 propagate_positions: bool = True, context: CompilationContext = None, cache: CompilationCache = None):
+        """
+        :param incremental: keep the parsed sentences and the transformation state between compilations,
+            so that after update_input only the edited part of the input is processed again.
+        :param propagate_positions: keep the positions of each node of the parse tree. Without positions,
+            the input is parsed again with them only to report the line of a compilation error.
+        :param context: the context of the compilations, holding the signatures and the options.
+            By default, a new context with the options of the active one. The options later set on Utility
+            are applied to the default context at the next compilation.
+        :param cache: the cache on disk of the results of compile, optimize and get_symbols.
+        """
+        self.context = context if context else CompilationContext(Utility.PRINT_WITH_FUNCTIONS,
+                                                                  Utility.AUTO_ENTITY_LINK,
+                                                                  Utility.POOL_SUBSTITUTIONS,
+                                                                  Utility.POOL_FACTS,
+                                                                  Utility.COMPACT_TEMPORAL_FACTS,
+                                                                  Utility.REMOVE_DUPLICATE_RULES)
         self._debug = debug
-        if isinstance(cnl_input, str):
-            self.cnl_input = cnl_input
-            if os.path.isfile(cnl_input):
-                self.cnl_input = open(cnl_input).read()
+        self._parser_profile = parser_profile
+        self._propagate_positions = propagate_positions
+        self._incremental_transformer = IncrementalTransformer(propagate_positions, self.context) if incremental else None
+        self.parsed_sentences: list[ParsedSentence] = []
+        self._session: CompilationSession | None = None
+        self.cache = cache
+        self._utility_options = None if context else Cnl2asp._get_utility_options()
+        self.update_input(cnl_input)
+
+    def update_input(self, cnl_input: TextIO | str):
+        self._session = None
+        # the input is read at the first usage, compile_iter reads it one line at a time
+        self._cnl_input: str | None = None
+        self._input_file: str | None = None
+        self._input_stream: TextIO | None = None
+        if not isinstance(cnl_input, str):
+            self._input_stream = cnl_input
+        elif os.path.isfile(cnl_input):
+            self._input_file = cnl_input
         else:
-            self.cnl_input = cnl_input.read()
+            self._cnl_input = cnl_input
+
+    @property
+    def cnl_input(self) -> str:
+        if self._cnl_input is None:
+            if self._input_file:
+                with open(self._input_file) as file:
+                    self._cnl_input = file.read()
+            else:
+                self._cnl_input = self._input_stream.read()
+        return self._cnl_input
+
+    def _input_lines(self) -> Iterator[str]:
+        if self._cnl_input is not None:
+            yield from io.StringIO(self._cnl_input)
+        elif self._input_file:
+            with open(self._input_file) as file:
+                yield from file
+        else:
+            yield from self._input_stream
 
-    def parse_input(self) -> Tree[Token]:
-        with open(os.path.join(os.path.dirname(__file__), "grammar.lark"), "r") as grammar:
-            cnl_parser = Lark(grammar.read(), propagate_positions=True)
-            return cnl_parser.parse(self.cnl_input)
+    def _has_problem_identifiers(self) -> bool | None:
+        # the inputs read while compiling are not scanned in advance, so that the output starts before reading them
+        if self._cnl_input is not None:
+            return any(identifier in self._cnl_input for identifier in PROBLEM_IDENTIFIERS)
+        return None
 
+    def parse_input(self, propagate_positions: bool = None) -> Tree[Token]:
+        if propagate_positions is None:
+            propagate_positions = self._propagate_positions
+        cnl_parser = SentenceParser(propagate_positions)
+        if self._parser_profile == ParserProfile.DOCUMENT:
+            tree = cnl_parser.parse_document(self.cnl_input)
+        else:
+            tree = cnl_parser.parse(self.cnl_input)
+        self.parsed_sentences = cnl_parser.parsed_sentences
+        return tree
 
-    def __is_predicate(self, name: str):
+    def _transform_input(self) -> SpecificationComponent:
         try:
-            SignatureManager.clone_signature(name)
-            return True
-        except:
-            return False
+            if self._incremental_transformer is not None and self._parser_profile == ParserProfile.SENTENCE:
+                specification = self._incremental_transformer.transform(self.cnl_input)
+                self.parsed_sentences = self._incremental_transformer.parsed_sentences
+                return specification
+            return self._transform(self._propagate_positions)
+        except VisitError:
+            if self._propagate_positions:
+                raise
+            # the tree has no positions, transform it again with them to report the exact line
+            if self._incremental_transformer is not None:
+                self._incremental_transformer.reset()
+            return self._transform(True)
+
+    def _transform(self, propagate_positions: bool) -> SpecificationComponent:
+        self.context.signatures = []
+        if self._parser_profile == ParserProfile.SENTENCE:
+            # each sentence tree is transformed as soon as it is parsed, the document tree is never built
+            cnl_parser = SentenceParser(propagate_positions)
+            sentence_transformer = SentenceTransformer(CNLTransformer(self.context))
+            self.parsed_sentences = []
+            try:
+                for parsed_sentence in cnl_parser.parse_sentences(split_sentences(self._input_lines())):
+                    sentence_transformer.transform_sentence(parsed_sentence)
+                    if not parsed_sentence.sentence.is_problem_identifier:
+                        self.parsed_sentences.append(ParsedSentence(parsed_sentence.sentence, None,
+                                                                    parsed_sentence.parser))
+                return sentence_transformer.get_specification()
+            except UnparsableSentence:
+                self.context.signatures = []
+                tree = cnl_parser.parse_document(self.cnl_input)
+                self.parsed_sentences = cnl_parser.parsed_sentences
+                return CNLTransformer(self.context).transform(tree)
+        return CNLTransformer(self.context).transform(self.parse_input(propagate_positions))
 
     def __get_predicate(self, entity_name: str, attribute: AttributeComponent):
         split_name = attribute.get_name().split('_')
         if len(split_name) > 1:
             for name in split_name:
-                if self.__is_predicate(name):
+                if SignatureManager.has_signature(name):
                     return SignatureManager.clone_signature(name)
         signature_name = attribute.get_name()
         if attribute.origin != entity_name:
             signature_name = attribute.origin.name
-        if self.__is_predicate(signature_name):
+        if SignatureManager.has_signature(signature_name):
             return SignatureManager.clone_signature(signature_name)
         return None
 
+    def session(self, auto_link_entities: bool = True) -> CompilationSession:
+        """
+        Return the session of the current input, that computes each artifact of the compilation once.
+        The session is replaced when the input or the options of the compilation are changed.
+        """
+        options = self._options(auto_link_entities)
+        if self._session is None or self._session.options != options:
+            if self._session is not None and self._incremental_transformer is not None:
+                # the kept sentences were transformed with the previous options
+                self._incremental_transformer.reset()
+            self._session = CompilationSession(self, auto_link_entities, options)
+        return self._session
+
     def cnl_to_json(self):
-        problem = CNLTransformer().transform(self.parse_input())
-        converter = Cnl2jsonConverter()
-        json = problem.convert(converter)
-        return json
+        return self.session().json
 
     def check_syntax(self) -> bool:
-        if self.parse_input():
+        if self.session().parse_tree:
             return True
         return False
 
+    @staticmethod
+    def _get_utility_options() -> dict:
+        return dict(print_with_functions=Utility.PRINT_WITH_FUNCTIONS,
+                    pool_substitutions=Utility.POOL_SUBSTITUTIONS,
+                    pool_facts=Utility.POOL_FACTS,
+                    compact_temporal_facts=Utility.COMPACT_TEMPORAL_FACTS,
+                    remove_duplicate_rules=Utility.REMOVE_DUPLICATE_RULES)
+
+    def _apply_utility_options(self):
+        # the options set on Utility after the creation of the compiler, the ones set on the context are kept
+        if self._utility_options is None:
+            return
+        utility_options = Cnl2asp._get_utility_options()
+        for option, value in utility_options.items():
+            if value != self._utility_options[option]:
+                setattr(self.context, option, value)
+        self._utility_options = utility_options
+
+    def _options(self, auto_link_entities: bool = True) -> dict:
+        """
+        Return the options that change the result of the compilation.
+        """
+        self._apply_utility_options()
+        return dict(auto_link_entities=auto_link_entities,
+                    parser_profile=self._parser_profile.name,
+                    print_with_functions=self.context.print_with_functions,
+                    pool_substitutions=self.context.pool_substitutions,
+                    pool_facts=self.context.pool_facts,
+                    compact_temporal_facts=self.context.compact_temporal_facts,
+                    remove_duplicate_rules=self.context.remove_duplicate_rules)
+
+    def _cache_key(self, kind: str, auto_link_entities: bool = True) -> str:
+        return self.cache.get_key(kind, self.cnl_input, **self._options(auto_link_entities))
+
     def compile(self, auto_link_entities: bool = True) -> str:
-        SignatureManager.signatures = []
-        Utility.AUTO_ENTITY_LINK = auto_link_entities
-        specification: SpecificationComponent = CNLTransformer().transform(self.parse_input())
-        asp_converter: ASPConverter = ASPConverter()
-        program: ASPProgram = specification.convert(asp_converter)
-        return str(program)
-
-    def optimize(self, asp_encoding: str, input_symbols: list[Symbol] = None, output_symbols: list[Symbol] = None,
-                 print_with_functions=False):
-        from clingo.ast import parse_files
+        if self.cache is None:
+            return self.session(auto_link_entities).asp_code
+        key = self._cache_key('code', auto_link_entities)
+        asp_code = self.cache.get(key)
+        if asp_code is None:
+            asp_code = self.session(auto_link_entities).asp_code
+            self.cache.put(key, asp_code)
+        return asp_code
+
+    def compile_to(self, stream: TextIO, auto_link_entities: bool = True):
+        """
+        Compile the input and write the ASP code to the stream, e.g. the output file, one element at a time.
+        Nothing is written if the compilation fails.
+        """
+        if self.cache is not None:
+            stream.write(self.compile(auto_link_entities))
+            return
+        session = self.session(auto_link_entities)
+        encoding = session.encoding
+        with self.context.activate():
+            encoding.write_to(stream)
+
+    def compile_ast(self, auto_link_entities: bool = True) -> list[AST]:
+        """
+        Compile the input into the statements of clingo's abstract syntax tree, that can be given to ngo or
+        added to a clingo control with a ProgramBuilder without printing and parsing the ASP code.
+        """
+        return self.session(auto_link_entities).statements
+
+    def compile_iter(self, auto_link_entities: bool = True) -> Iterator[str]:
+        """
+        Compile the input one sentence at a time, yielding the ASP code of each proposition as soon as
+        the proposition is converted. The input is read lazily, so the output of large inputs starts before
+        the whole input is read, and each proposition is released once converted.
+        The rules of the definitions preceding the first problem identifier belong to its program. If the input is
+        a string, they are kept until the identifier; otherwise they are yielded at once, and yielded again after
+        the header of the program if an identifier follows them, that is equivalent for telingo.
+        Differently from compile, constants are printed where they are defined and must be defined before
+        their usage; the concatenation of the yielded strings is otherwise the output of compile.
+        """
+        self._apply_utility_options()
+        self.context.auto_entity_link = auto_link_entities
+        chunks = self._compile_chunks()
+        while True:
+            # the context is active only while compiling, not while the caller consumes the chunks
+            with self.context.activate():
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+
+    def _compile_chunks(self) -> Iterator[str]:
+        self.context.signatures = []
+        cnl_parser = SentenceParser(self._propagate_positions)
+        sentence_transformer = SentenceTransformer(CNLTransformer(self.context))
+        asp_converter = ASPConverter(self.context)
+        has_problem_identifiers = self._has_problem_identifiers()
+        buffer_definitions = has_problem_identifiers is True
+        buffer: list[str] = []
+        # the rules of the definitions already yielded, yielded again in the program of a following identifier
+        definitions: list[str] | None = [] if has_problem_identifiers is None else None
+        converted_constants = 0
+        problem: Problem | None = None
+        printed_header = False
+        printed_rules: set[str] = set()  # with remove_duplicate_rules, the rules of the problem already printed
+        is_empty = True
+        sentences = cnl_parser.parse_sentences(split_sentences(self._input_lines()))
+        while True:
+            try:
+                parsed_sentence = next(sentences, None)
+            except UnparsableSentence as unparsable_sentence:
+                raise cnl_parser.get_error(unparsable_sentence)
+            if parsed_sentence is None:
+                sentence_transformer.get_specification()
+            else:
+                sentence_transformer.transform_sentence(parsed_sentence)
+            chunks: list[str] = []
+            constants = sentence_transformer.transformer.get_specification().get_constants()
+            for constant in constants[converted_constants:]:
+                constant.convert(asp_converter)
+                chunks.append(ASPEncoding.constant_to_string(asp_converter.get_encoding().get_constants()[-1]))
+            converted_constants = len(constants)
+            if problem is not sentence_transformer.transformer.get_problem():
+                if problem is not None and not printed_header:
+                    chunks.append(ASPProgram(problem.name).get_header())
+                problem = sentence_transformer.transformer.get_problem()
+                printed_header = False
+                printed_rules = set()
+            if definitions is not None and not sentence_transformer.in_definitions:
+                if definitions and parsed_sentence.sentence.is_problem_identifier:
+                    # the identifier names the program of the definitions, that are printed again in it
+                    chunks.append(ASPProgram(problem.name).get_header())
+                    printed_rules = set()
+                    for rule in definitions:
+                        if self.context.remove_duplicate_rules:
+                            if rule in printed_rules:
+                                continue
+                            printed_rules.add(rule)
+                        chunks.append(rule)
+                definitions = None
+            propositions = problem.get_propositions()
+            rules = []
+            for proposition in propositions:
+                rules += asp_converter.convert_proposition_rules(proposition)
+            propositions.clear()  # the memory is bounded by the propositions of a sentence
+            if buffer_definitions and sentence_transformer.in_definitions and parsed_sentence is not None:
+                buffer += [str(rule) for rule in rules]
+            elif rules or buffer or parsed_sentence is None:
+                if not printed_header:
+                    chunks.append(ASPProgram(problem.name).get_header())
+                    printed_header = True
+                for rule in buffer + [str(rule) for rule in rules]:
+                    if self.context.remove_duplicate_rules:
+                        if rule in printed_rules:
+                            continue
+                        printed_rules.add(rule)
+                    chunks.append(rule)
+                if definitions is not None and parsed_sentence is not None:
+                    definitions += [str(rule) for rule in rules]
+                buffer = []
+            for chunk in chunks:
+                if is_empty:
+                    chunk = chunk.lstrip()
+                if chunk:
+                    is_empty = False
+                    yield chunk
+            if parsed_sentence is None:
+                break
+        if is_empty:
+            yield '\n'
+
+    def optimize(self, asp_encoding: str | list[AST], input_symbols: list[Symbol] = None,
+                 output_symbols: list[Symbol] = None, print_with_functions=False,
+                 as_statements: bool = False) -> str | list[AST]:
+        """
+        Optimize the encoding with ngo. The encoding is either the ASP code or its statements, as returned by
+        compile_ast, that are optimized without parsing the code. The optimized encoding is returned as code,
+        or as statements if as_statements is set, e.g. to load them in the solver.
+        """
+        from clingo.ast import parse_string
         from ngo import optimize, auto_detect_input, auto_detect_output, Predicate
-        prg = []
-        with tempfile.NamedTemporaryFile(mode="w") as file:
-            file.write(asp_encoding)
-            file.seek(0)
-            parse_files([file.name], prg.append)
-            input_predicates = auto_detect_input(prg)
-            if input_symbols is not None:
-                input_predicates = []
-                for symbol in input_symbols:
-                    input_predicates.append(Predicate(symbol.predicate, symbol.get_arity(print_with_functions)))
-            output_predicates = auto_detect_output(prg)
-            if output_symbols is not None:
-                output_predicates = []
-                for symbol in output_symbols:
-                    output_predicates.append(Predicate(symbol.predicate, symbol.get_arity(print_with_functions)))
-            prg = optimize(prg, input_predicates, output_predicates)
-            optimized_encoding = ''
-            for stm in prg:
-                optimized_encoding += str(stm) + '\n'
-        return optimized_encoding
+        key = None
+        if self.cache is not None:
+            asp_code = asp_encoding if isinstance(asp_encoding, str) \
+                else ''.join(f'{statement}\n' for statement in asp_encoding)
+            key = self.cache.get_key('optimized code', asp_code,
+                                     input_symbols=Cnl2asp._symbols_key(input_symbols),
+                                     output_symbols=Cnl2asp._symbols_key(output_symbols),
+                                     print_with_functions=print_with_functions, ngo=package_version('ngo'))
+            optimized_encoding = self.cache.get(key)
+            if optimized_encoding is not None:
+                if as_statements:
+                    prg = []
+                    parse_string(optimized_encoding, prg.append)
+                    return prg[1:]  # without the implicit #program base, the code starts with its own
+                return optimized_encoding
+        if isinstance(asp_encoding, str):
+            prg = []
+            parse_string(asp_encoding, prg.append)
+        else:
+            prg = list(asp_encoding)
+        input_predicates = auto_detect_input(prg)
+        if input_symbols is not None:
+            input_predicates = []
+            for symbol in input_symbols:
+                input_predicates.append(Predicate(symbol.predicate, symbol.get_arity(print_with_functions)))
+        output_predicates = auto_detect_output(prg)
+        if output_symbols is not None:
+            output_predicates = []
+            for symbol in output_symbols:
+                output_predicates.append(Predicate(symbol.predicate, symbol.get_arity(print_with_functions)))
+        prg = optimize(prg, input_predicates, output_predicates)
+        if as_statements and key is None:
+            return prg
+        optimized_encoding = ''
+        for stm in prg:
+            optimized_encoding += str(stm) + '\n'
+        if key is not None:
+            self.cache.put(key, optimized_encoding)
+        return prg if as_statements else optimized_encoding
+
+    @staticmethod
+    def _symbols_key(symbols: list[Symbol] | None) -> str | None:
+        # the repr of a Symbol omits its keys
+        return json.dumps([symbol.to_json() for symbol in symbols]) if symbols is not None else None
 
     def __get_type(self, name: str):
         if SignatureManager.is_temporal_entity(name):
@@ -184,12 +500,116 @@ class Cnl2asp:
         return Symbol(entity.get_name(), keys, keys + attributes, entity_type)
 
     def get_symbols(self) -> list[Symbol]:
-        self.compile()
-        signatures: list[Symbol] = []
-        for signature in SignatureManager.signatures:
-            signatures.append(self.__convert_signature(signature))
-        SignatureManager.signatures = []
-        return signatures
+        if self.cache is None:
+            return self.session().symbols
+        key = self._cache_key('symbols')
+        symbols = self.cache.get(key)
+        if symbols is not None:
+            return [Symbol.from_json(symbol) for symbol in json.loads(symbols)]
+        symbols = self.session().symbols
+        self.cache.put(key, json.dumps([symbol.to_json() for symbol in symbols]))
+        return symbols
+
+    def _convert_signatures(self, signatures: list[EntityComponent]) -> list[Symbol]:
+        symbols: list[Symbol] = []
+        for signature in signatures:
+            symbols.append(self.__convert_signature(signature))
+        return symbols
+
+
+class CompilationSession:
+    """
+    Artifacts of the compilation of an input: the parse tree, the specification, the signatures, the ASP encoding,
+    its code and its clingo statements, the symbols and the JSON. Each artifact is computed at its first usage
+    from the previous ones and kept, so that the input is parsed and transformed once however many of them
+    are used, e.g. by the solver and by the result parser that explains its models.
+    The artifacts are computed in the context of the compiler.
+    """
+
+    def __init__(self, cnl2asp: Cnl2asp, auto_link_entities: bool = True, options: dict = None):
+        self.cnl2asp = cnl2asp
+        self.auto_link_entities = auto_link_entities
+        self.options = options if options is not None else cnl2asp._options(auto_link_entities)
+        self._signatures: list[EntityComponent] = []
+
+    @property
+    def context(self) -> CompilationContext:
+        return self.cnl2asp.context
+
+    @cached_property
+    def parse_tree(self) -> Tree[Token]:
+        return self.cnl2asp.parse_input()
+
+    @cached_property
+    def specification(self) -> SpecificationComponent:
+        self.context.auto_entity_link = self.auto_link_entities
+        with self.context.activate():
+            if 'parse_tree' in self.__dict__ and self.cnl2asp._incremental_transformer is None:
+                # the input has already been parsed, e.g. to check its syntax
+                self.context.signatures = []
+                return CNLTransformer(self.context).transform(self.parse_tree)
+            return self.cnl2asp._transform_input()
+
+    @cached_property
+    def encoding(self) -> ASPEncoding:
+        specification = self.specification
+        self.context.auto_entity_link = self.auto_link_entities
+        with self.context.activate():
+            encoding = specification.convert(ASPConverter(self.context))
+        self._signatures = self.context.signatures
+        return encoding
+
+    @property
+    def signatures(self) -> list[EntityComponent]:
+        """
+        Signatures of the entities of the specification, including the ones declared by the conversion.
+        """
+        _ = self.encoding
+        return self._signatures
+
+    @cached_property
+    def asp_code(self) -> str:
+        encoding = self.encoding
+        stream = io.StringIO()
+        with self.context.activate():
+            encoding.write_to(stream)
+        return stream.getvalue()
+
+    @cached_property
+    def statements(self) -> list[AST]:
+        from cnl2asp.ASP_elements.solver.clingo_ast_builder import ClingoASTBuilder
+        encoding = self.encoding
+        with self.context.activate():
+            return ClingoASTBuilder().build(encoding)
+
+    @cached_property
+    def symbols(self) -> list[Symbol]:
+        signatures = self.signatures
+        with self.context.activate():
+            # another compilation with the same context may have replaced the signatures
+            self.context.signatures = signatures
+            return self.cnl2asp._convert_signatures(signatures)
+
+    @cached_property
+    def json(self) -> dict:
+        specification = self.specification
+        with self.context.activate():
+            return specification.convert(Cnl2jsonConverter())
+
+
+def print_compilation_error(e: Exception, in_file: TextIO, debug: bool = False):
+    if isinstance(e, UnexpectedCharacters):
+        in_file.seek(0)
+        cnl_input = in_file.read()
+        print(ParserError(e.char, e.line, e.column, e.get_context(cnl_input), cnl_input.splitlines()[e.line - 1],
+                          list(e.allowed)))
+        return
+    if isinstance(e, VisitError):
+        print(e.args[0])
+    else:
+        print("Error in asp conversion:", str(e))
+    if debug:
+        traceback.print_exception(e)
 
 
 def main():
@@ -200,21 +620,40 @@ def main():
                         help='Return the list of symbols generated for the compilation')
     parser.add_argument('-p', '--print-with-functions', action='store_true',
                         help='Print atoms with functions. ')
+    parser.add_argument('--pool-substitutions', action='store_true',
+                        help='Compile "where X is one of" in a single rule with a pool of the values')
+    parser.add_argument('--pool-facts', action='store_true',
+                        help='Compile "is one of" definitions in a single fact with a pool of the values')
+    parser.add_argument('--compact-temporal-facts', action='store_true',
+                        help='Define the values of temporal concepts on an interval, without their labels '
+                             'if the program does not use them (ignored with --solve)')
+    parser.add_argument('--remove-duplicate-rules', action='store_true',
+                        help='Print only once the rules produced by more propositions')
     parser.add_argument('--debug', action='store_true', help=argparse.SUPPRESS)
     parser.add_argument('--solve', type=str, choices=["clingo", "telingo"],
                         help='Call the corresponding solver and print a cnl-translated output')
     parser.add_argument('-o', '--optimize', action='store_true', help='Optimize the output using ngo')
     parser.add_argument('--explain', action='store_true', help='Returns a cnl version of the best model')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write the rules as soon as each sentence is compiled (ignored with --optimize and --solve)')
+    parser.add_argument('--cache-dir', type=str,
+                        help='Reuse the results of previous compilations of the same input stored in the directory')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_SIZE // (1024 * 1024),
+                        help='Maximum size in MB of the cache directory, least recently used results are removed')
     parser.add_argument('input_file')
     parser.add_argument('output_file', type=str, nargs='?', default='')
     args = parser.parse_args()
 
-    Utility.PRINT_WITH_FUNCTIONS = args.print_with_functions
-
     input_file = args.input_file
 
     in_file = open(input_file, 'r')
-    cnl2asp = Cnl2asp(in_file, args.debug)
+    cnl2asp = Cnl2asp(in_file, args.debug, context=CompilationContext(args.print_with_functions,
+                                                                     pool_substitutions=args.pool_substitutions,
+                                                                     pool_facts=args.pool_facts,
+                                                                     compact_temporal_facts=args.compact_temporal_facts
+                                                                     and not args.solve,
+                                                                     remove_duplicate_rules=args.remove_duplicate_rules),
+                      cache=CompilationCache(args.cache_dir, args.cache_size * 1024 * 1024) if args.cache_dir else None)
     if args.check_syntax:
         if cnl2asp.check_syntax():
             print("Input file fits the grammar.")
@@ -222,28 +661,58 @@ def main():
         print(json.dumps(cnl2asp.cnl_to_json()))
     elif args.symbols:
         print(cnl2asp.get_symbols())
-    else:
+    elif args.stream and not args.optimize and not args.solve:
+        out = open(args.output_file, "w") if args.output_file else sys.stdout
         try:
-            asp_encoding = cnl2asp.compile()
-        except UnexpectedCharacters as e:
-            in_file.seek(0)
-            cnl_input = in_file.read()
-            print(ParserError(e.char, e.line, e.column, e.get_context(cnl_input), cnl_input.splitlines()[e.line - 1],
-                              list(e.allowed)))
+            for rules in cnl2asp.compile_iter():
+                out.write(rules)
+                out.flush()
+        except Exception as e:
+            print_compilation_error(e, in_file, args.debug)
+            return ''
+        finally:
+            if args.output_file:
+                out.close()
+        if args.output_file:
+            print("Compilation completed.")
+    elif not args.optimize and not args.solve:
+        try:
+            # the encoding is built before the output file is opened, so that the file is not truncated on errors
+            asp_code = cnl2asp.compile() if cnl2asp.cache is not None else None
+            if asp_code is None:
+                cnl2asp.session().encoding
+        except Exception as e:
+            print_compilation_error(e, in_file, args.debug)
             return ''
-        except VisitError as e:
-            print(e.args[0])
-            if args.debug:
-                traceback.print_exception(e)
+        out = open(args.output_file, "w") if args.output_file else sys.stdout
+        try:
+            if asp_code is None:
+                cnl2asp.compile_to(out)
+            else:
+                out.write(asp_code)
+        except Exception as e:
+            print_compilation_error(e, in_file, args.debug)
             return ''
+        finally:
+            if args.output_file:
+                out.close()
+        if args.output_file:
+            print("Compilation completed.")
+    else:
+        session = cnl2asp.session()
+        try:
+            # the optimized encoding is built from the statements, without parsing the compiled one,
+            # unless the code and its optimization can be found in the cache
+            asp_encoding = session.statements if args.optimize and not cnl2asp.cache else cnl2asp.compile()
         except Exception as e:
-            print("Error in asp conversion:", str(e))
-            if args.debug:
-                traceback.print_exception(e)
+            print_compilation_error(e, in_file, args.debug)
             return ''
 
+        # the solver loads the statements, without parsing the code
+        statements = None
         if args.optimize:
-            asp_encoding = cnl2asp.optimize(asp_encoding)
+            statements = cnl2asp.optimize(asp_encoding, as_statements=True)
+            asp_encoding = ''.join(f'{statement}\n' for statement in statements)
         try:
             out = sys.stdout
             if args.output_file:
@@ -256,17 +725,17 @@ def main():
                     from cnl2asp.ASP_elements.solver.clingo_wrapper import Clingo
                     from cnl2asp.ASP_elements.solver.clingo_result_parser import ClingoResultParser
                     solver = Clingo()
-                    res_parser = ClingoResultParser(CNLTransformer().transform(cnl2asp.parse_input()))
+                    res_parser = ClingoResultParser(session.specification)
                 elif args.solve == "telingo":
                     from cnl2asp.ASP_elements.solver.telingo_result_parser import TelingoResultParser
                     from cnl2asp.ASP_elements.solver.telingo_wrapper import Telingo
                     solver = Telingo()
-                    res_parser = TelingoResultParser(CNLTransformer().transform(cnl2asp.parse_input()))
+                    res_parser = TelingoResultParser(session.specification)
                 else:
                     raise Exception(f"{args.solve} not recognised")
                 print("\n*********")
                 print(f"Running {args.solve}...\n")
-                solver.load(str(asp_encoding))
+                solver.load(statements if statements is not None else session.statements)
                 res = solver.solve()
                 if args.explain:
                     model = res_parser.parse_model(res)
@@ -1,46 +1,86 @@
 from __future__ import annotations
 
-import re
-
-import inflect
-
 from cnl2asp.parser.parser import CNLTransformer
 
 from cnl2asp.ASP_elements.asp_aggregate import ASPAggregate
 from cnl2asp.ASP_elements.asp_atom import ASPAtom
-from cnl2asp.ASP_elements.asp_attribute import ASPAttribute, RangeASPValue
+from cnl2asp.ASP_elements.asp_attribute import ASPAttribute, RangeASPValue, PoolASPValue
 from cnl2asp.ASP_elements.asp_conjunction import ASPConjunction
 from cnl2asp.ASP_elements.asp_encoding import ASPEncoding
 from cnl2asp.ASP_elements.asp_operation import ASPOperation, ASPAngleOperation, ASPTemporalOperation
 from cnl2asp.ASP_elements.asp_program import ASPProgram
-from cnl2asp.ASP_elements.asp_rule import ASPRule, ASPRuleHead, ASPWeakConstraint
+from cnl2asp.ASP_elements.asp_rule import ASPRule, ASPRuleHead, ASPWeakConstraint, ASPFacts, \
+    ASPTemporalFacts
 from cnl2asp.ASP_elements.asp_attribute import ASPValue
 from cnl2asp.ASP_elements.asp_temporal_formula import ASPTemporalFormula
 
 from cnl2asp.converter.converter_interface import Converter
-from cnl2asp.exception.cnl2asp_exceptions import AttributeNotFound, EntityNotFound, CompilationError
+from cnl2asp.exception.cnl2asp_exceptions import EntityNotFound, CompilationError
 
 from cnl2asp.specification.constant_component import ConstantComponent
 from cnl2asp.specification.entity_component import EntityComponent, TemporalEntityComponent
-from cnl2asp.specification.attribute_component import AttributeComponent, RangeValueComponent, is_same_origin
+from cnl2asp.specification.attribute_component import AttributeComponent, RangeValueComponent, PoolValueComponent, \
+    is_same_origin
 from cnl2asp.specification.component import Component
 from cnl2asp.specification.problem import Problem
 from cnl2asp.specification.proposition import Proposition, NewKnowledgeComponent, ConditionComponent, \
     RequisiteComponent, \
-    PreferenceProposition, CardinalityComponent, PREFERENCE_PROPOSITION_TYPE
+    PreferenceProposition, CardinalityComponent, PREFERENCE_PROPOSITION_TYPE, FactsProposition
 from cnl2asp.specification.aggregate_component import AggregateComponent
 from cnl2asp.specification.operation_component import OperationComponent, Operators
 from cnl2asp.specification.relation_component import RelationComponent
 from cnl2asp.specification.attribute_component import ValueComponent
 from cnl2asp.specification.signaturemanager import SignatureManager
 from cnl2asp.specification.specification import SpecificationComponent
+from cnl2asp.utility.compilation_context import CompilationContext
+from cnl2asp.utility.inflection import Inflection
 from cnl2asp.utility.utility import Utility
+from cnl2asp.utility.variable_allocator import VariableAllocator
+
+
+def _structural_key(entity: EntityComponent) -> tuple:
+    """
+    Key of the fields compared by EntityComponent.__eq__ that are cheap to hash: equal entities have the same key.
+    """
+    return entity.get_name_key(), entity.label, entity.negated, entity.entity_type, \
+        len(entity.get_keys()), len(entity.get_attributes())
 
 
 class EntityToAtom:
-    def __init__(self, entity: EntityComponent, atom: ASPAtom):
-        self.entity = entity
-        self.atom = atom
+    """
+    Atoms converted in the current rule, indexed by the identity and by the structure of their entities.
+    When an entity is converted more than once, the last atom is the one returned.
+    Entities modified after their conversion are indexed by their previous structure, and are compared
+    by their current structure only if no indexed entity is equal.
+    """
+
+    def __init__(self):
+        self._entries: list[tuple[EntityComponent, ASPAtom, tuple]] = []
+        self._by_identity: dict[int, tuple[EntityComponent, ASPAtom, tuple]] = {}
+        self._by_structure: dict[tuple, list[tuple[EntityComponent, ASPAtom, tuple]]] = {}
+
+    def add(self, entity: EntityComponent, atom: ASPAtom):
+        key = _structural_key(entity)
+        # the entity is kept in the entry, so that its id is not reused while registered
+        entry = (entity, atom, key)
+        self._entries.append(entry)
+        self._by_identity[id(entity)] = entry
+        self._by_structure.setdefault(key, []).append(entry)
+
+    def get_atom(self, entity: EntityComponent) -> ASPAtom | None:
+        """
+        Return the atom of the entity, or of the last converted copy of the entity if it was not converted itself.
+        """
+        entry = self._by_identity.get(id(entity))
+        if entry:
+            return entry[1]
+        for candidate, atom, _ in reversed(self._by_structure.get(_structural_key(entity), [])):
+            if candidate == entity:
+                return atom
+        for candidate, atom, key in reversed(self._entries):
+            if key != _structural_key(candidate) and candidate == entity:
+                return atom
+        return None
 
 
 def is_arithmetic_operator(operator):
@@ -76,6 +116,28 @@ class ForbiddenLink:
         return False
 
 
+class ForbiddenLinks:
+    """
+    Forbidden links of the current rule, indexed by the structure of their entities.
+    """
+
+    def __init__(self):
+        self._by_entity: dict[tuple, list[ForbiddenLink]] = {}
+
+    def add(self, forbidden_link: ForbiddenLink):
+        key_1 = _structural_key(forbidden_link.entity_1)
+        key_2 = _structural_key(forbidden_link.entity_2)
+        self._by_entity.setdefault(key_1, []).append(forbidden_link)
+        if key_2 != key_1:
+            self._by_entity.setdefault(key_2, []).append(forbidden_link)
+
+    def get_links(self, entity: EntityComponent) -> list[ForbiddenLink]:
+        """
+        Return the forbidden links that could involve the entity, in the order they were added.
+        """
+        return self._by_entity.get(_structural_key(entity), [])
+
+
 class ASPConverter(Converter[ASPProgram,
 ASPRule, ASPWeakConstraint,
 ASPRuleHead, (int, int),
@@ -84,48 +146,54 @@ ASPAtom, ASPAggregate,
 ASPOperation, ASPAttribute,
 None, ASPValue, None]):
 
-    def __init__(self):
+    def __init__(self, context: CompilationContext = None):
+        """
+        :param context: the context of the compilation, the active one if not given.
+        """
+        self._context = context if context else CompilationContext.get_current()
         self._asp_encoding: ASPEncoding = ASPEncoding()
         self._program: ASPProgram = ASPProgram()
-        self._atoms_in_current_rule: list[EntityToAtom] = []  # variable used to track the conversion entity -> atom
-        self._created_fields: list[str] = []
+        self._atoms_in_current_rule = EntityToAtom()  # variable used to track the conversion entity -> atom
+        self._variables = VariableAllocator()
         self._aggregates: list[ASPAggregate] = []
         self._operations: list[ASPOperation] = []
-        self._forbidden_links: list[ForbiddenLink] = []
+        self._forbidden_links = ForbiddenLinks()
         self._converted_complex_entities: list[
             str] = []  # name of complex entities already converted, used to track if their values have been already converted.
-
-    def get_trailing_number(self, s: str):
-        m = re.search(r'\d+$', s)
-        return int(m.group()) if m else None
+        self._temporal_facts: list[ASPTemporalFacts] = []
 
     def _get_initialized_attributes(self, proposition: Proposition):
         for entity in proposition.get_entities():
             for attribute in entity.get_keys_and_attributes():
                 if attribute.value != Utility.NULL_VALUE:
-                    self._created_fields.append(attribute.value)
-
-    def create_new_field_value(self, name: str) -> ASPValue:
-        result = re.sub(r'[AEIOU]', '', name, flags=re.IGNORECASE).upper()
-        if result in self._created_fields:
-            trailing_number = self.get_trailing_number(result)
-            if trailing_number:
-                new_value = int(trailing_number) + 1
-                result = result.replace(str(trailing_number), str(new_value))
-            else:
-                result += '1'
-            result = self.create_new_field_value(result)
-        self._created_fields.append(result)
-        return result
+                    self._variables.add(attribute.value)
+
+    def create_new_field_value(self, name: str) -> str:
+        return self._variables.new_variable(name)
 
     def convert_specification(self, specification: SpecificationComponent):
-        for constant in specification.get_constants():
-            constant.convert(self)
-        for problem in specification.get_problems():
-            self._asp_encoding.add_program(problem.convert(self))
-            self._program = ASPProgram()
+        with self._context.activate():
+            for constant in specification.get_constants():
+                constant.convert(self)
+            programs = []
+            for problem in specification.get_problems():
+                programs.append(problem.convert(self))
+                self._asp_encoding.add_program(programs[-1])
+                self._program = ASPProgram()
+            if self._context.compact_temporal_facts:
+                self._remove_unused_temporal_labels(programs)
         return self._asp_encoding
 
+    def _remove_unused_temporal_labels(self, programs: list[ASPProgram]):
+        referenced_labels = set()
+        for program in programs:
+            for rule in program.get_rules():
+                for atom in rule.get_atom_list():
+                    if any(not attribute.is_null() for attribute in atom.get_attributes_list_by_name('value')):
+                        referenced_labels.add(atom.name)
+        for temporal_facts in self._temporal_facts:
+            temporal_facts.labelled = temporal_facts.name in referenced_labels
+
     def convert_problem(self, problem: Problem) -> ASPProgram:
         self._program.name = problem.name
         for proposition in problem.get_propositions():
@@ -133,23 +201,38 @@ None, ASPValue, None]):
             self.clear_support_variables()
         return self._program
 
+    def get_encoding(self) -> ASPEncoding:
+        return self._asp_encoding
+
+    def convert_proposition_rules(self, proposition: Proposition) -> list[ASPRule]:
+        """
+        Convert a single proposition without keeping it in the program.
+        Returns the rule of the proposition, preceded by the facts created during its conversion.
+        """
+        self._program = ASPProgram(self._program.name)
+        with self._context.activate():
+            self._program.add_rule(proposition.convert(self))
+        self.clear_support_variables()
+        return self._program.get_rules()
+
     def clear_support_variables(self):
-        self._atoms_in_current_rule = []
-        self._created_fields = []
-        self._forbidden_links = []
+        self._atoms_in_current_rule = EntityToAtom()
+        self._variables = VariableAllocator()
+        self._forbidden_links = ForbiddenLinks()
         self._aggregates = []
         self._operations = []
 
     def convert_proposition(self, proposition: Proposition) -> ASPRule:
         # Create a new signature for each new entity
+        self._variables = VariableAllocator(proposition.defined_attributes)
         self._get_initialized_attributes(proposition)
         head = []
         cardinality = None
         body = None
-        self._created_fields = proposition.defined_attributes
         if proposition.new_knowledge:
             for new_knowledge in proposition.new_knowledge:
-                self._forbidden_links += self.forbidden_links(new_knowledge, proposition.requisite)
+                for forbidden_link in self.forbidden_links(new_knowledge, proposition.requisite):
+                    self._forbidden_links.add(forbidden_link)
                 new_knowledge = new_knowledge.convert(self)
                 self.add_atoms_operations(new_knowledge.condition)
                 head.append(new_knowledge)
@@ -192,6 +275,16 @@ None, ASPValue, None]):
                                             preference.level, discriminant)
         return weak_constraint
 
+    def convert_facts_proposition(self, facts: FactsProposition) -> ASPFacts | ASPTemporalFacts:
+        if len(facts.get_facts()) == 1 and isinstance(facts.get_facts()[0], TemporalEntityComponent):
+            return self._convert_temporal_definition(facts.get_facts()[0])
+        # constant facts have no body, relations or variables to resolve
+        atoms = []
+        for fact in facts.get_facts():
+            atoms.append(fact.convert(self))
+            self._atoms_in_current_rule = EntityToAtom()
+        return ASPFacts(atoms, self._context.pool_facts)
+
     def convert_new_knowledge(self, head: NewKnowledgeComponent) -> ASPRuleHead:
         new_knowledge = head.new_entity.convert(self)
         condition = head.condition.convert(self) if head.condition.components else None
@@ -215,25 +308,18 @@ None, ASPValue, None]):
     def convert_entity(self, entity: EntityComponent) -> ASPAtom:
         atom = ASPAtom(entity.get_name(), [attribute.convert(self) for attribute in entity.keys + entity.attributes],
                        entity.negated, entity.is_before, entity.is_after, entity.is_initial, entity.is_final)
-        self._atoms_in_current_rule.append(EntityToAtom(entity, atom))
+        self._atoms_in_current_rule.add(entity, atom)
         return atom
 
+    def _convert_temporal_definition(self, temporal_entity: TemporalEntityComponent) -> ASPFacts | ASPTemporalFacts:
+        if temporal_entity.get_name() in self._converted_complex_entities:
+            return ASPFacts([])
+        self._converted_complex_entities.append(temporal_entity.get_name())
+        temporal_facts = ASPTemporalFacts(temporal_entity.get_name(), temporal_entity.values)
+        self._temporal_facts.append(temporal_facts)
+        return temporal_facts
+
     def convert_temporal_entity(self, temporal_entity: TemporalEntityComponent):
-        if temporal_entity.get_name() not in self._converted_complex_entities:
-            temporal_values = list(temporal_entity.values.items())
-            for value, idx in temporal_values[:-1]:
-                self._program.add_rule(ASPRule(head=[ASPRuleHead(ASPAtom(temporal_entity.get_name(),
-                                                                         [ASPAttribute(
-                                                                             temporal_entity.get_name().removesuffix(
-                                                                                 's'), ASPValue(idx)),
-                                                                             ASPAttribute('value',
-                                                                                          ASPValue(
-                                                                                              f'\"{value}\"'))]))]))
-            self._converted_complex_entities.append(temporal_entity.get_name())
-            return ASPAtom(temporal_entity.get_name(),
-                           [ASPAttribute(temporal_entity.get_name().removesuffix('s'),
-                                         ASPValue(temporal_values[-1][1])),
-                            ASPAttribute('value', ASPValue(f'\"{temporal_values[-1][0]}\"'))])
         return self.convert_entity(temporal_entity)
 
     def __has_single_key(self, entity: EntityComponent) -> bool:
@@ -267,7 +353,7 @@ None, ASPValue, None]):
                 unmatched_discriminant_attributes.append(attribute)
                 try:
                     discriminant += [attribute.convert(self) for attribute in
-                                     SignatureManager.clone_signature(attribute.name).get_keys()]
+                                     SignatureManager.get_signature_view(attribute.name).get_keys()]
                 except EntityNotFound:
                     raise Exception(f"Impossible to use attribute \"{attribute.origin} {attribute}\" in aggregate.")
             discriminant = [attribute for attribute in discriminant if
@@ -347,8 +433,7 @@ None, ASPValue, None]):
         return operation
 
     def convert_attribute(self, attribute: AttributeComponent) -> ASPAttribute:
-        attribute_name = inflect.engine().singular_noun(attribute.get_name()) if inflect.engine().singular_noun(
-            attribute.get_name()) else attribute.get_name()
+        attribute_name = Inflection.get_singular(attribute.get_name())
         operations = [operation.convert(self) for operation in attribute.operations]
         return ASPAttribute(attribute_name, attribute.value.convert(self), attribute.origin, operations)
 
@@ -370,31 +455,26 @@ None, ASPValue, None]):
     def convert_range_value(self, value: RangeValueComponent) -> ASPValue:
         return RangeASPValue(value)
 
+    def convert_pool_value(self, value: PoolValueComponent) -> PoolASPValue:
+        return PoolASPValue([self.convert_value(pool_value) for pool_value in value.values])
+
     def forbidden_links(self, new_knowledge: NewKnowledgeComponent, requisite: RequisiteComponent) -> list[
         ForbiddenLink]:
         new_knowledge_links: list[AttributeComponent] = []
         for new_entity in new_knowledge.new_entity.get_entities():
             for condition in new_knowledge.condition.get_entities():
                 for condition_key in condition.get_keys():
-                    try:
-                        attributes = new_entity.get_attributes_by_name(condition_key.get_name())
-                        for attribute in attributes:
-                            if is_same_origin(attribute.origin, condition_key.origin):
-                                new_knowledge_links.append(attribute)
-                    except AttributeNotFound:
-                        pass
+                    for attribute in new_entity.find_attributes_by_name(condition_key.get_name()):
+                        if is_same_origin(attribute.origin, condition_key.origin):
+                            new_knowledge_links.append(attribute)
         forbidden_links: list[ForbiddenLink] = []
         for attribute in new_knowledge_links:
             for requisite_entity in requisite.get_entities():
-                try:
-                    requisite_entity_attributes = requisite_entity.get_attributes_by_name(attribute.get_name())
-                    for requisite_entity_attribute in requisite_entity_attributes:
-                        if is_same_origin(attribute.origin, requisite_entity_attribute.origin):
-                            forbidden_links.append(
-                                ForbiddenLink(new_knowledge.new_entity, requisite_entity,
-                                              attribute.convert(self), requisite_entity_attribute.convert(self)))
-                except AttributeNotFound:
-                    pass
+                for requisite_entity_attribute in requisite_entity.find_attributes_by_name(attribute.get_name()):
+                    if is_same_origin(attribute.origin, requisite_entity_attribute.origin):
+                        forbidden_links.append(
+                            ForbiddenLink(new_knowledge.new_entity, requisite_entity,
+                                          attribute.convert(self), requisite_entity_attribute.convert(self)))
         return forbidden_links
 
     def convert_relation(self, relation_component_1: Component, relation_component_2: Component,
@@ -414,23 +494,9 @@ None, ASPValue, None]):
 
     def entity_to_atoms_and_link(self, entity_1: EntityComponent, entity_2: EntityComponent,
                                  new_knowledge: NewKnowledgeComponent = None):
-        atom_1 = None
-        atom_2 = None
-        for pair in self._atoms_in_current_rule:
-            # look for the exactly same entity
-            if pair.entity is entity_1:
-                atom_1 = pair.atom
-            if pair.entity is entity_2:
-                atom_2 = pair.atom
-        # if entity not found, search for a copy
-        if not atom_1:
-            for pair in self._atoms_in_current_rule:
-                if pair.entity == entity_1:
-                    atom_1 = pair.atom
-        if not atom_2:
-            for pair in self._atoms_in_current_rule:
-                if pair.entity == entity_2:
-                    atom_2 = pair.atom
+        # look for the exactly same entity, or for a copy if not found
+        atom_1 = self._atoms_in_current_rule.get_atom(entity_1)
+        atom_2 = self._atoms_in_current_rule.get_atom(entity_2)
         if not atom_1 or not atom_2:
             raise Exception(f'Relation between {entity_1.get_name()} and {entity_2.get_name()} not found.')
         forbidden_links = self.get_forbidden_link(entity_1, entity_2)
@@ -438,7 +504,7 @@ None, ASPValue, None]):
 
     def get_forbidden_link(self, entity_1, entity_2) -> list[ASPAttribute]:
         forbidden_attributes = []
-        for forbidden_link in self._forbidden_links:
+        for forbidden_link in self._forbidden_links.get_links(entity_1):
             if (entity_1 == forbidden_link.entity_1 or entity_1 == forbidden_link.entity_2) and \
                     (entity_2 == forbidden_link.entity_1 or entity_2 == forbidden_link.entity_2):
                 forbidden_attributes += [forbidden_link.attribute_1, forbidden_link.attribute_2]
@@ -5,10 +5,11 @@ import collections
 from cnl2asp.converter.converter_interface import Converter, ProblemConverter
 from cnl2asp.specification.constant_component import ConstantComponent
 from cnl2asp.specification.entity_component import EntityComponent, TemporalEntityComponent
-from cnl2asp.specification.attribute_component import AttributeComponent, RangeValueComponent, is_same_origin
+from cnl2asp.specification.attribute_component import AttributeComponent, RangeValueComponent, PoolValueComponent, \
+    is_same_origin
 from cnl2asp.specification.problem import Problem
 from cnl2asp.specification.proposition import Proposition, NewKnowledgeComponent, ConditionComponent, RequisiteComponent, \
-    PreferenceProposition, CardinalityComponent, PREFERENCE_PROPOSITION_TYPE
+    PreferenceProposition, CardinalityComponent, PREFERENCE_PROPOSITION_TYPE, FactsProposition
 from cnl2asp.specification.aggregate_component import AggregateComponent
 from cnl2asp.specification.operation_component import OperationComponent, Operators
 from cnl2asp.specification.relation_component import RelationComponent
@@ -89,6 +90,11 @@ class Cnl2jsonConverter(Converter):
     def convert_preference_proposition(self, preference: PreferenceProposition):
         self.convert_proposition(preference)
 
+    def convert_facts_proposition(self, facts: FactsProposition):
+        for new_knowledge in facts.new_knowledge:
+            self.convert_proposition(Proposition([new_knowledge]))
+            self._clear_support_variables()
+
     def convert_new_knowledge(self, head: NewKnowledgeComponent):
         head.new_entity.convert(self)
         for component in head.condition.components:
@@ -105,24 +111,16 @@ class Cnl2jsonConverter(Converter):
         for component in requisite.components:
             component.convert(self)
 
-    def _is_predicate(self, name: str):
-        try:
-            SignatureManager.clone_signature(name)
-            return True
-        except:
-            return False
-
-
     def _get_predicate(self, entity_name: str, attribute: AttributeComponent):
         split_name = attribute.get_name().split('_')
         if len(split_name) > 1:
             for name in split_name:
-                if self._is_predicate(name):
+                if SignatureManager.has_signature(name):
                     return SignatureManager.clone_signature(name)
         signature_name = attribute.get_name()
         if attribute.origin != entity_name:
             signature_name = attribute.origin.name
-        if self._is_predicate(signature_name):
+        if SignatureManager.has_signature(signature_name):
             return SignatureManager.clone_signature(signature_name)
         return None
 
@@ -172,5 +170,8 @@ class Cnl2jsonConverter(Converter):
     def convert_range_value(self, value: RangeValueComponent):
         pass
 
+    def convert_pool_value(self, value: PoolValueComponent):
+        return str(value)
+
     def convert_relation(self, relation: RelationComponent, new_knowledge: NewKnowledgeComponent = None) -> None:
         pass
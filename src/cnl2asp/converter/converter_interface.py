@@ -8,10 +8,11 @@ from cnl2asp.specification.component import Component
 if TYPE_CHECKING:
     from cnl2asp.specification.entity_component import TemporalEntityComponent
     from cnl2asp.specification.specification import SpecificationComponent
-    from cnl2asp.specification.attribute_component import ValueComponent, RangeValueComponent
+    from cnl2asp.specification.attribute_component import ValueComponent, RangeValueComponent, PoolValueComponent
     from cnl2asp.specification.constant_component import ConstantComponent
     from cnl2asp.specification.problem import Problem
-    from cnl2asp.specification.proposition import Proposition, PreferenceProposition, CardinalityComponent
+    from cnl2asp.specification.proposition import Proposition, PreferenceProposition, CardinalityComponent, \
+        FactsProposition
     from cnl2asp.specification.aggregate_component import AggregateComponent
     from cnl2asp.specification.entity_component import EntityComponent
     from cnl2asp.specification.operation_component import OperationComponent
@@ -55,6 +56,10 @@ class Converter(ABC, Generic[ProblemConverter,
     def convert_preference_proposition(self, preference: PreferenceProposition) -> PreferencePropositionConverter:
         """Converter preference proposition"""
 
+    @abstractmethod
+    def convert_facts_proposition(self, facts: FactsProposition) -> PropositionConverter:
+        """Convert facts proposition"""
+
     @abstractmethod
     def convert_new_knowledge(self, new_knowledge: NewKnowledgeConverter) -> NewKnowledgeConverter:
         """Convert new knowledge"""
@@ -104,6 +109,10 @@ class Converter(ABC, Generic[ProblemConverter,
     def convert_range_value(self, value: RangeValueComponent) -> ValueConverter:
         """Convert range value"""
 
+    @abstractmethod
+    def convert_pool_value(self, value: PoolValueComponent) -> ValueConverter:
+        """Convert pool value"""
+
     @abstractmethod
     def convert_relation(self, relation_component_1: Component, relation_component_2: Component) -> RelationConverter:
         """Convert relation"""
@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from typing import Callable
+
 from cnl2asp.utility.utility import Utility
 
 
@@ -18,8 +22,18 @@ class DuplicatedTypedEntity(Exception):
 
 
 class AttributeNotFound(Exception):
-    def __init__(self, msg: str):
+    def __init__(self, msg: str | Callable[[], str]):
+        """
+        :param msg: the error message, or a function formatting it when the error is printed.
+        """
         super(AttributeNotFound, self).__init__(msg)
+        self._msg = msg
+
+    def __str__(self):
+        if callable(self._msg):
+            self._msg = self._msg()
+            self.args = (self._msg,)
+        return self._msg
 
 
 class AttributeGenericError(Exception):
@@ -1,9 +1,11 @@
 from cnl2asp.parser.proposition_builder import PropositionBuilder
-from cnl2asp.specification.attribute_component import ValueComponent, AttributeComponent
+from cnl2asp.specification.aggregate_component import AggregateComponent
+from cnl2asp.specification.attribute_component import ValueComponent, AttributeComponent, PoolValueComponent
+from cnl2asp.specification.component import Component
 from cnl2asp.specification.entity_component import EntityComponent
 from cnl2asp.specification.operation_component import OperationComponent, Operators
 from cnl2asp.specification.problem import Problem
-from cnl2asp.specification.proposition import NewKnowledgeComponent
+from cnl2asp.specification.proposition import NewKnowledgeComponent, Proposition, AggregateOfComponents
 from cnl2asp.specification.signaturemanager import SignatureManager
 
 
@@ -12,13 +14,42 @@ class Command:
         return
 
 
+def _contains_aggregate(component: Component) -> bool:
+    if isinstance(component, AggregateComponent):
+        return True
+    if isinstance(component, OperationComponent):
+        return any(_contains_aggregate(operand) for operand in component.operands)
+    if isinstance(component, AggregateOfComponents):
+        return any(_contains_aggregate(element) for element in component.components)
+    if isinstance(component, EntityComponent):
+        return any(_contains_aggregate(operation) for attribute in component.get_keys_and_attributes()
+                   for operation in attribute.operations)
+    return False
+
+
 class SubstituteVariable(Command):
-    def __init__(self, proposition: PropositionBuilder, variable: str, values: list[ValueComponent]):
+    def __init__(self, proposition: PropositionBuilder, variable: str, values: list[ValueComponent],
+                 pooled: bool = False):
+        """
+        :param pooled: add a single equality with the pool of the values instead of a copy of the proposition
+            for each value. The copies are still made if the proposition contains an aggregate, where the
+            equality could be moved inside the aggregate element and the pool would join the copies.
+        """
         self.proposition = proposition
         self.variable = variable
         self.values = values
+        self.pooled = pooled
+
+    def _can_pool(self, proposition: Proposition) -> bool:
+        return len(self.values) > 1 and not _contains_aggregate(proposition.requisite) \
+            and not any(_contains_aggregate(entity) for entity in proposition.get_entities())
 
     def execute(self):
+        if self.pooled and all(self._can_pool(proposition) for proposition in self.proposition.get_propositions()):
+            for proposition in self.proposition.get_propositions():
+                proposition.add_requisite([OperationComponent(Operators.EQUALITY, ValueComponent(self.variable),
+                                                              PoolValueComponent(self.values))])
+            return
         new_propositions = []
         for proposition in self.proposition.get_propositions():
             for value in self.values:
@@ -46,14 +77,16 @@ class RespectivelySubstituteVariable(Command):
 
 class DurationClause(Command):
     def __init__(self, proposition: PropositionBuilder, new_knowledge: NewKnowledgeComponent,
-                 duration_value: ValueComponent, attribute_name: str):
+                 duration_value: ValueComponent, attribute_name: str, identifier: str):
         self.proposition = proposition
         self.new_knowledge = new_knowledge
         self.duration_value = duration_value
         self.attribute_name = attribute_name
+        self.identifier = identifier
 
     def execute(self):
-        self.proposition.duration_clause(self.new_knowledge, self.duration_value, self.attribute_name)
+        self.proposition.duration_clause(self.new_knowledge, self.duration_value, self.attribute_name,
+                                         self.identifier)
 
 
 class CreateSignature(Command):
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import os
+import pickle
+import stat
+import sys
+import tempfile
+import threading
+import types
+
+import lark
+from lark import Lark
+
+GRAMMAR_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'grammar.lark')
+
+
+class _LarkPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        # the lexer keeps a reference to the regex module, store it by name
+        if isinstance(obj, types.ModuleType):
+            return importlib.import_module, (obj.__name__,)
+        return NotImplemented
+
+
+def _default_cache_directory() -> str:
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'cnl2asp')
+
+
+def is_private(path: str) -> bool:
+    """
+    Return True if the path is owned by the current user and cannot be written by other users,
+    so that the pickles it contains have been written by the current user.
+    """
+    try:
+        path_stat = os.stat(path)
+    except OSError:
+        return False
+    if not hasattr(os, 'getuid'):
+        return True  # no owners, the cache is in the profile of the user
+    return path_stat.st_uid == os.getuid() and not path_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+class GrammarCache:
+    """
+    Process-wide cache of the compiled cnl grammar.
+
+    Parsers are built lazily, once per grammar content and parser options, and shared by all the
+    Cnl2asp instances of the process. Built parsers are also serialized in CACHE_DIRECTORY, by default in the
+    cache directory of the user, so that a new process can skip the grammar analysis. Since loading a pickle can
+    execute code, parsers are loaded only if the directory and the file belong to the current user and
+    cannot be written by other users. Set CACHE_DIRECTORY to None to disable the disk cache.
+    """
+    CACHE_DIRECTORY: str | None = _default_cache_directory()
+    _parsers: dict[str, Lark] = {}
+    _grammars: dict[str, str] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_grammar(grammar_path: str = GRAMMAR_PATH) -> str:
+        grammar = GrammarCache._grammars.get(grammar_path)
+        if grammar is None:
+            with open(grammar_path, 'r') as grammar_file:
+                grammar = grammar_file.read()
+            GrammarCache._grammars[grammar_path] = grammar
+        return grammar
+
+    @staticmethod
+    def get_parser(grammar: str = None, **options) -> Lark:
+        """
+        Return the parser for the given grammar and options, building it at the first request.
+        :param grammar: the grammar text, the cnl grammar if not provided.
+        :param options: the options forwarded to Lark.
+        """
+        if grammar is None:
+            grammar = GrammarCache.get_grammar()
+        key = GrammarCache.get_key(grammar, **options)
+        parser = GrammarCache._parsers.get(key)
+        if parser is None:
+            with GrammarCache._lock:
+                parser = GrammarCache._parsers.get(key)
+                if parser is None:
+                    parser = GrammarCache._load(key)
+                    if parser is None:
+                        parser = Lark(grammar, **options)
+                        GrammarCache._store(key, parser)
+                    GrammarCache._parsers[key] = parser
+        return parser
+
+    @staticmethod
+    def get_key(grammar: str, **options) -> str:
+        options_string = ','.join(f'{name}={options[name]!r}' for name in sorted(options))
+        key = '\n'.join([grammar, options_string, lark.__version__, str(sys.version_info[:2])])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def clear(disk: bool = False):
+        with GrammarCache._lock:
+            GrammarCache._parsers.clear()
+            GrammarCache._grammars.clear()
+            if disk and GrammarCache.CACHE_DIRECTORY and os.path.isdir(GrammarCache.CACHE_DIRECTORY):
+                for file_name in os.listdir(GrammarCache.CACHE_DIRECTORY):
+                    if file_name.startswith('grammar_') and file_name.endswith('.pickle'):
+                        os.remove(os.path.join(GrammarCache.CACHE_DIRECTORY, file_name))
+
+    @staticmethod
+    def _cache_file(key: str) -> str | None:
+        if not GrammarCache.CACHE_DIRECTORY:
+            return None
+        return os.path.join(GrammarCache.CACHE_DIRECTORY, f'grammar_{key}.pickle')
+
+    @staticmethod
+    def _load(key: str) -> Lark | None:
+        cache_file = GrammarCache._cache_file(key)
+        if not cache_file or not is_private(GrammarCache.CACHE_DIRECTORY) or not is_private(cache_file):
+            return None
+        try:
+            with open(cache_file, 'rb') as file:
+                parser = pickle.load(file)
+            if isinstance(parser, Lark):
+                return parser
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # corrupted or incompatible cache file, the parser is rebuilt and the file replaced
+            pass
+        return None
+
+    @staticmethod
+    def _store(key: str, parser: Lark):
+        cache_file = GrammarCache._cache_file(key)
+        if not cache_file:
+            return
+        try:
+            os.makedirs(GrammarCache.CACHE_DIRECTORY, mode=0o700, exist_ok=True)
+            if not is_private(GrammarCache.CACHE_DIRECTORY):
+                return
+            file_descriptor, tmp_file = tempfile.mkstemp(dir=GrammarCache.CACHE_DIRECTORY, suffix='.tmp')
+            try:
+                with os.fdopen(file_descriptor, 'wb') as file:
+                    _LarkPickler(file, protocol=pickle.HIGHEST_PROTOCOL).dump(parser)
+                os.replace(tmp_file, cache_file)
+            except Exception:
+                os.remove(tmp_file)
+                raise
+        except Exception:
+            # the disk cache is an optimization, failing to write it is not an error
+            pass
@@ -1,7 +1,6 @@
 from __future__ import annotations
-import re
-import string
 
+from collections import Counter, deque
 from enum import Enum
 
 import lark
@@ -20,13 +19,15 @@ from cnl2asp.specification.entity_component import EntityComponent, EntityType,
     SetEntityComponent, ListEntityComponent, ComplexEntityComponent
 from cnl2asp.specification.problem import Problem
 from cnl2asp.specification.proposition import Proposition, NewKnowledgeComponent, ConditionComponent, \
-    CardinalityComponent, PREFERENCE_PROPOSITION_TYPE, PROPOSITION_TYPE
+    CardinalityComponent, PREFERENCE_PROPOSITION_TYPE, PROPOSITION_TYPE, FactsProposition
 from cnl2asp.specification.relation_component import RelationComponent
 from cnl2asp.specification.aggregate_component import AggregateComponent, AggregateOperation
 from cnl2asp.specification.operation_component import Operators, OperationComponent
 from cnl2asp.specification.signaturemanager import SignatureManager
 from cnl2asp.specification.specification import SpecificationComponent
+from cnl2asp.utility.compilation_context import CompilationContext
 from cnl2asp.utility.utility import Utility
+from cnl2asp.utility.variable_allocator import VariableAllocator
 from cnl2asp.exception.cnl2asp_exceptions import TypeNotFound
 
 
@@ -45,28 +46,65 @@ def is_verb_to_have(word: str):
 
 
 class CNLTransformer(Transformer):
-    def __init__(self):
+    def __init__(self, context: CompilationContext = None):
+        """
+        :param context: the context of the compilation, the active one if not given.
+        """
         super().__init__()
+        self._context = context if context else CompilationContext.get_current()
         self._specification: SpecificationComponent = SpecificationComponent()
         self._problem: Problem = Problem()
         self._proposition: PropositionBuilder = PropositionBuilder()
         self._delayed_operations: list[Command] = []
-        self._defined_variables: list[str] = []
+        self._defined_variables = VariableAllocator()
+        self._default_line: int | None = None
+        self._sentences: deque[str] = deque()  # content of the standard propositions to transform, in order
+        self._sentence_occurrences: Counter[str] = Counter()
+
+    def transform(self, tree):
+        with self._context.activate():
+            self._sentences = deque(' '.join(proposition.scan_values(lambda value: isinstance(value, lark.Token)))
+                                    for proposition in tree.iter_subtrees_topdown()
+                                    if proposition.data == 'standard_proposition')
+            return super().transform(tree)
+
+    def set_default_line(self, line: int | None):
+        """
+        Line used in the errors when the tree has no positions, e.g. the line of the sentence being transformed.
+        """
+        self._default_line = line
+
+    def _get_line(self, meta) -> int | None:
+        return self._default_line if meta.empty else meta.line
+
+    def get_specification(self) -> SpecificationComponent:
+        return self._specification
+
+    def get_problem(self) -> Problem:
+        return self._problem
+
+    def set_specification(self, specification: SpecificationComponent, problem: Problem):
+        """
+        Replace the transformed specification and the problem being transformed, e.g. to resume a transformation.
+        """
+        self._specification = specification
+        self._problem = problem
+
+    def _new_identifier(self) -> str:
+        # derived from the content of the sentence being transformed, the identifiers do not change when other
+        # sentences are added or removed. Equal sentences are numbered, so that each has its own support entities
+        sentence = self._sentences[0] if self._sentences else ''
+        occurrence = self._sentence_occurrences[sentence] + 1
+        index = sum(isinstance(command, DurationClause) for command in self._delayed_operations)
+        return Utility.create_unique_identifier(f'{sentence}\n{occurrence}\n{index}')
+
+    def _next_sentence(self):
+        sentence = self._sentences.popleft() if self._sentences else ''
+        self._sentence_occurrences[sentence] += 1
 
     def _new_field_value(self, name: str = '') -> ValueComponent:
         if name:
-            result = re.sub(r'[AEIOU]', '', name, flags=re.IGNORECASE).upper()
-            if result in self._defined_variables:
-                match = re.findall(r'\d+', name)
-                if match:
-                    last_num = int(match[-1])
-                    name = name.rstrip(string.digits)
-                    last_num += 1
-                else:
-                    last_num = 1
-                return self._new_field_value(f'{name}{last_num}')
-            self._defined_variables.append(result)
-            return ValueComponent(result)
+            return ValueComponent(self._defined_variables.new_variable(name))
 
     def start(self, elem) -> SpecificationComponent:
         self._specification.add_problem(self._problem)
@@ -89,7 +127,7 @@ class CNLTransformer(Transformer):
     def _clear(self):
         self._proposition = PropositionBuilder()
         self._delayed_operations = []
-        self._defined_variables = []
+        self._defined_variables = VariableAllocator()
 
     def explicit_definition_proposition(self, elem):
         if elem[0]:
@@ -125,7 +163,7 @@ class CNLTransformer(Transformer):
         name = parameter[:]
         origin = self._parse_parameter_origin(name)
         if origin and not name:
-            keys = SignatureManager.clone_signature(parameter[-1]).get_keys()
+            keys = SignatureManager.get_signature_view(parameter[-1]).get_keys()
             res = []
             for key in keys:
                 key_origin = AttributeOrigin(origin.name, key.origin)
@@ -137,8 +175,7 @@ class CNLTransformer(Transformer):
 
     def temporal_concept_definition(self, elem):
         temporal = TemporalEntityComponent(elem[0], '', elem[2], elem[3], elem[4], elem[1])
-        self._proposition.add_new_knowledge(NewKnowledgeComponent(temporal))
-        self._problem.add_propositions(self._proposition.get_propositions())
+        self._problem.add_propositions([FactsProposition([temporal])])
         return temporal
 
     def temporal_value(self, elem):
@@ -158,7 +195,7 @@ class CNLTransformer(Transformer):
             complex_concept.entity_identifier = ValueComponent(elem[0].lower())
             return complex_concept
         except DuplicatedTypedEntity as e:
-            raise CompilationError(str(e), meta.line)
+            raise CompilationError(str(e), self._get_line(meta))
 
     def COMPLEX_CONCEPT_TYPE(self, elem):
         if elem.value == "a set":
@@ -173,14 +210,22 @@ class CNLTransformer(Transformer):
             entity = SignatureManager.get_signature(elem[0])
             entity.values = elem[1]
         except EntityNotFound as e:
-            CompilationError(str(e), line=meta.line)
+            CompilationError(str(e), line=self._get_line(meta))
 
-    def implicit_definition_proposition(self, elem) -> None:
+    def _execute_delayed_operations(self):
+        # respectively substitutions and durations rely on a proposition for each substituted value
+        pool_substitutions = self._context.pool_substitutions and not any(
+            isinstance(command, (RespectivelySubstituteVariable, DurationClause)) for command in self._delayed_operations)
         for command in self._delayed_operations:
+            if isinstance(command, SubstituteVariable):
+                command.pooled = pool_substitutions
             command.execute()
+
+    def implicit_definition_proposition(self, elem) -> None:
+        self._execute_delayed_operations()
         if elem[0]:
             SignatureManager.add_signature(elem[0])
-        self._proposition.add_defined_attributes(self._defined_variables)
+        self._proposition.add_defined_attributes(list(self._defined_variables))
         self._problem.add_propositions(self._proposition.get_propositions())
         self._clear()
 
@@ -197,7 +242,7 @@ class CNLTransformer(Transformer):
             entity_keys = entity.get_keys()
             if len(entity.get_keys()) > 1:
                 raise CompilationError(
-                    f"Impossible to use compound range clause for an entity (\"{name}\" with multiple keys", meta.line)
+                    f"Impossible to use compound range clause for an entity (\"{name}\" with multiple keys", self._get_line(meta))
             entity.set_attribute_value(entity_keys[0].get_name(), value, entity_keys[0].origin)
         except:
             entity = EntityComponent(name, '', [],
@@ -209,7 +254,7 @@ class CNLTransformer(Transformer):
         name: str = elem[2].lower()
         attribute_name = Utility.DEFAULT_ATTRIBUTE
         try:
-            signature = SignatureManager.clone_signature(name)
+            signature = SignatureManager.get_signature_view(name)
             attributes = signature.get_keys_and_attributes()
             if len(attributes) == 1:
                 attribute_name = attributes[0].get_name()
@@ -231,14 +276,12 @@ class CNLTransformer(Transformer):
                                                                                       value, AttributeOrigin(name))]))
         for name, values in tail_attributes:
             if len(values) != len(defined_entities):
-                raise CompilationError("Compounded tail has size different from values declared", meta.line)
+                raise CompilationError("Compounded tail has size different from values declared", self._get_line(meta))
             for i in range(len(values)):
                 attribute = AttributeComponent(name, values[i])
                 defined_entities[i].attributes.append(attribute)
-        for entity in defined_entities[1:]:
-            new_proposition = self._proposition.copy_proposition()
-            new_proposition.new_knowledge.append(NewKnowledgeComponent(entity))
-        self._proposition._original_rule.new_knowledge.append(NewKnowledgeComponent(defined_entities[0]))
+        # the clause is a whole sentence: the values are facts, that do not need a proposition each
+        self._proposition._original_rule = FactsProposition(defined_entities)
         return defined_entities[0]
 
     def compounded_match_tail(self, elem) -> list[(str, ValueComponent)]:
@@ -250,7 +293,7 @@ class CNLTransformer(Transformer):
     def enumerative_definition_clause(self, elem):
         subject = elem[0]
         try:
-            signature = SignatureManager.clone_signature(subject.get_name())
+            signature = SignatureManager.get_signature_view(subject.get_name())
         except:
             signature = self._proposition.create_new_signature(subject)
             SignatureManager.add_signature(signature)
@@ -288,16 +331,16 @@ class CNLTransformer(Transformer):
     @v_args(meta=True)
     def standard_proposition(self, meta, elem):
         try:
-            for command in self._delayed_operations:
-                command.execute()
-            self._proposition.add_defined_attributes(self._defined_variables)
+            self._next_sentence()
+            self._execute_delayed_operations()
+            self._proposition.add_defined_attributes(list(self._defined_variables))
             self._problem.add_propositions(self._proposition.get_propositions())
             self._clear()
         except Exception as e:
-            raise CompilationError(str(e), meta.line)
+            raise CompilationError(str(e), self._get_line(meta))
 
     def _make_new_knowledge_relations(self, proposition: Proposition, components: list[Component] = None):
-        if Utility.AUTO_ENTITY_LINK:
+        if self._context.auto_entity_link:
             if components:
                 for component in components:
                     for entity in component.get_entities_to_link_with_new_knowledge():
@@ -508,13 +551,13 @@ class CNLTransformer(Transformer):
         try:
             temporal_entity = SignatureManager.get_entity_from_value(elem[2])
         except EntityNotFound as e:
-            raise CompilationError(str(e), meta.line)
+            raise CompilationError(str(e), self._get_line(meta))
         if elem[2].isnumeric():
             elem[2] = int(elem[2])
         try:
             temporal_value = temporal_entity.get_temporal_value_id(elem[2])
         except KeyError as e:
-            raise CompilationError(str(e), meta.line)
+            raise CompilationError(str(e), self._get_line(meta))
         subject: EntityComponent = elem[0]
         new_var = subject.get_attributes_by_name_and_origin(temporal_entity.get_name(),
                                                             AttributeOrigin(temporal_entity.get_name()))[0]
@@ -524,7 +567,7 @@ class CNLTransformer(Transformer):
                 subject.set_attributes_value([AttributeComponent(temporal_entity.get_name(), ValueComponent(new_var),
                                                                  AttributeOrigin(temporal_entity.get_name()))])
             except:
-                raise CompilationError(f'Compilation error in line {meta.line}')
+                raise CompilationError(f'Compilation error in line {self._get_line(meta)}')
         operator = elem[1]
         self._proposition.add_requisite(subject)
         operation = OperationComponent(operator, new_var, ValueComponent(temporal_value))
@@ -597,7 +640,7 @@ class CNLTransformer(Transformer):
             try:
                 elem[2].set_attributes_value(elem[1][1])
             except AttributeNotFound as e:
-                raise CompilationError(str(e), meta.line)
+                raise CompilationError(str(e), self._get_line(meta))
         return AggregateComponent(elem[0], elem[1][0], body)
 
     @v_args(meta=True)
@@ -607,7 +650,7 @@ class CNLTransformer(Transformer):
             try:
                 elem[2].set_attributes_value(elem[1][1])
             except AttributeNotFound as e:
-                raise CompilationError(str(e), meta.line)
+                raise CompilationError(str(e), self._get_line(meta))
         if elem[3]:
             body += elem[3]
             for entity in elem[3]:
@@ -621,7 +664,7 @@ class CNLTransformer(Transformer):
             try:
                 verb.set_attributes_value(elem[1][1])
             except AttributeNotFound as e:
-                raise CompilationError(str(e), meta.line)
+                raise CompilationError(str(e), self._get_line(meta))
         body = [verb]
         subject = elem[2]
         self._proposition.add_requisite(subject)
@@ -662,7 +705,7 @@ class CNLTransformer(Transformer):
         elif elem[0] == QUANTITY_OPERATOR.AT_LEAST:
             cardinality = CardinalityComponent(elem[1], None)
         if self._proposition.get_cardinality() and self._proposition.get_cardinality() != cardinality:
-            raise CompilationError('Error multiple cardinality provided in the same proposition', meta.line)
+            raise CompilationError('Error multiple cardinality provided in the same proposition', self._get_line(meta))
         else:
             self._proposition.add_cardinality(cardinality)
 
@@ -670,7 +713,7 @@ class CNLTransformer(Transformer):
     def range_quantity_cardinality(self, meta, elem):
         cardinality = CardinalityComponent(elem[0], elem[1])
         if self._proposition.get_cardinality() and self._proposition.get_cardinality() != cardinality:
-            raise CompilationError('Error multiple cardinality provided in the same proposition', meta.line)
+            raise CompilationError('Error multiple cardinality provided in the same proposition', self._get_line(meta))
         else:
             self._proposition.add_cardinality(cardinality)
 
@@ -683,7 +726,8 @@ class CNLTransformer(Transformer):
         new_knowledge = NewKnowledgeComponent(verb, ConditionComponent(objects), None, verb.auxiliary_verb, objects)
         new_knowledge.objects = objects
         if elem[-1]:
-            self._delayed_operations.append(DurationClause(self._proposition, new_knowledge, elem[-2], elem[-1]))
+            self._delayed_operations.append(DurationClause(self._proposition, new_knowledge, elem[-2], elem[-1],
+                                                           self._new_identifier()))
         self._proposition.add_new_knowledge(new_knowledge)
 
     def predicate_with_simple_clause(self, elem):
@@ -701,11 +745,9 @@ class CNLTransformer(Transformer):
         return list(res)
 
     def _parse_parameter_origin(self, name: list[str]):
-        try:
-            SignatureManager.clone_signature(name[0])
+        if name and SignatureManager.has_signature(name[0]):
             return AttributeOrigin(name.pop(0), self._parse_parameter_origin(name))
-        except:
-            return None
+        return None
 
     def _parse_entity_parameter(self, name, label):
         try:
@@ -724,7 +766,7 @@ class CNLTransformer(Transformer):
             result = operand_value
         elif operator:
             result = self._new_field_value(parameter_name)
-        self._defined_variables.append(result)
+        self._defined_variables.add(result)
         return ValueComponent(result)
 
     def _parse_parameter_operation(self, attribute, operator, operand):
@@ -740,7 +782,7 @@ class CNLTransformer(Transformer):
             return self._parse_entity_parameter(name, parameter[-4])
         origin = self._parse_parameter_origin(name)
         if origin and not name:
-            name = SignatureManager.clone_signature(parameter[-5]).get_keys()[0].get_name()
+            name = SignatureManager.get_signature_view(parameter[-5]).get_keys()[0].get_name()
         else:
             name = '_'.join(name)
         if not origin and SignatureManager.is_temporal_entity(name.strip()):
@@ -756,8 +798,9 @@ class CNLTransformer(Transformer):
         name = parameter[:-1]
         origin = self._parse_parameter_origin(name)
         if origin and not name:
-            name = SignatureManager.clone_signature(parameter[-2]).get_keys()[0].get_name()
-            origin = SignatureManager.clone_signature(parameter[-2]).get_keys()[0].origin
+            key = SignatureManager.get_signature_view(parameter[-2]).get_keys()[0]
+            name = key.get_name()
+            origin = key.origin
         else:
             name = '_'.join(name)
         if not origin and SignatureManager.is_temporal_entity(name.strip()):
@@ -815,7 +858,7 @@ class CNLTransformer(Transformer):
             try:
                 return self._proposition.get_entity_by_label(name)
             except LabelNotFound as e:
-                raise CompilationError(str(e), meta.line)
+                raise CompilationError(str(e), self._get_line(meta))
         name = name.lower()
         parameter_list = parameter_list if parameter_list else []
         if self._is_pronouns(name):
@@ -836,21 +879,21 @@ class CNLTransformer(Transformer):
                                              [attribute for attribute in parameter_list if
                                               isinstance(attribute, AttributeComponent)])
                 else:
-                    raise CompilationError(str(e), meta.line)
+                    raise CompilationError(str(e), self._get_line(meta))
         try:
             entity.set_attributes_value(parameter_list, self._proposition)
         except AttributeNotFound as e:
-            raise CompilationError(str(e), meta.line)
+            raise CompilationError(str(e), self._get_line(meta))
         if entity.label_is_key_value():
             entity.set_label_as_key_value()
-            self._defined_variables.append(ValueComponent(entity.label))
+            self._defined_variables.add(ValueComponent(entity.label))
         if entity_temporal_order_constraint:
             self.temporal_constraint(meta, [entity] + entity_temporal_order_constraint)
         if define_subsequent_event:
             try:
                 self.__substitute_subsequent_event(entity, define_subsequent_event[0], define_subsequent_event[1])
             except TypeNotFound as e:
-                raise CompilationError(str(e), meta.line)
+                raise CompilationError(str(e), self._get_line(meta))
         return entity
 
     @v_args(meta=True)
@@ -866,16 +909,16 @@ class CNLTransformer(Transformer):
             entity.set_attributes_value([elem[0]])
             return entity
         except EntityNotFound as e:
-            raise CompilationError(str(e), meta.line)
+            raise CompilationError(str(e), self._get_line(meta))
 
     @v_args(meta=True)
     def list_element_order(self, meta, elem):
         try:
             entity: ListEntityComponent = SignatureManager.clone_signature(elem[0])
         except EntityNotFound as e:
-            raise CompilationError(str(e), meta.line)
+            raise CompilationError(str(e), self._get_line(meta))
         if entity.entity_type != EntityType.LIST:
-            raise CompilationError(f"Entity {entity.get_name()} is not a list.", meta.line)
+            raise CompilationError(f"Entity {entity.get_name()} is not a list.", self._get_line(meta))
         try:
             element_variable: ValueComponent = elem[1] if elem[1] else self._new_field_value('element')
             if elem[2] == Operators.GREATER_THAN:  # ordering_operator == 'after'
@@ -883,7 +926,7 @@ class CNLTransformer(Transformer):
             else:
                 entity.set_shifted_value(-1, elem[3], element_variable)
         except AttributeGenericError as e:
-            raise CompilationError(str(e), meta.line)
+            raise CompilationError(str(e), self._get_line(meta))
         return entity
 
     @v_args(meta=True)
@@ -891,9 +934,9 @@ class CNLTransformer(Transformer):
         try:
             entity: ListEntityComponent = SignatureManager.clone_signature(elem[2])
         except EntityNotFound as e:
-            raise CompilationError(str(e), meta.line)
+            raise CompilationError(str(e), self._get_line(meta))
         if entity.entity_type != EntityType.LIST:
-            raise CompilationError(f"Entity {entity.get_name()} is not a list.", meta.line)
+            raise CompilationError(f"Entity {entity.get_name()} is not a list.", self._get_line(meta))
         element_variable = elem[1] if elem[1] else self._new_field_value('element')
         entity.set_index_value(int(elem[0]) - 1, element_variable)
         return entity
@@ -905,21 +948,20 @@ class CNLTransformer(Transformer):
         attribute_name = ''
         for attribute in entity.get_keys_and_attributes():
             if SignatureManager.is_temporal_entity(attribute.get_name()) and \
-                    SignatureManager.clone_signature(attribute.get_name()).entity_type == entity_type:
+                    SignatureManager.get_signature_view(attribute.get_name()).entity_type == entity_type:
                 attribute_name = attribute.get_name()
         for declared_entity in self._proposition.get_entities():
             if not declared_entity is entity:
-                try:
-                    attribute_value = \
-                        declared_entity.get_attributes_by_name_and_origin(attribute_name,
-                                                                          AttributeOrigin(attribute_name))[
-                            0].value
-                    entity.set_attributes_value([AttributeComponent(attribute_name,
-                                                                    ValueComponent(f'{attribute_value}{operator}1'),
-                                                                    AttributeOrigin(attribute_name))])
-                    return
-                except AttributeNotFound:
-                    pass
+                attributes = declared_entity.find_attributes_by_name_and_origin(attribute_name,
+                                                                                AttributeOrigin(attribute_name))
+                if attributes:
+                    value = ValueComponent(f'{attributes[0].value}{operator}1')
+                    try:
+                        entity.set_attributes_value([AttributeComponent(attribute_name, value,
+                                                                        AttributeOrigin(attribute_name))])
+                        return
+                    except AttributeNotFound:
+                        pass
         raise TypeNotFound(f'Entity "{entity.get_name()}" do not have type {entity_type}')
 
     def define_subsequent_event(self, elem):
@@ -68,9 +68,9 @@ class PropositionBuilder:
             proposition.relations += relations
 
     def duration_clause(self, new_knowledge: NewKnowledgeComponent,
-                        duration_value: ValueComponent, attribute_name: str):
+                        duration_value: ValueComponent, attribute_name: str, identifier: str):
         copy: Proposition = self._original_rule.copy()  # create the new proposition to express the duration
-        new_knowledge.new_entity.set_name(Utility.create_unique_identifier())  # support entity
+        new_knowledge.new_entity.set_name(identifier)  # support entity
         copy.add_requisite([new_knowledge.new_entity])  # add the support entity to the new proposition requisite
         copy.new_knowledge[0].condition = ConditionComponent()
         copy.cardinality = None
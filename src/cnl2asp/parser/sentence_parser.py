@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterator, Iterable
+
+from lark import Tree, Token, UnexpectedInput
+from lark.tree import Meta
+
+from cnl2asp.parser.grammar_cache import GrammarCache
+
+PROBLEM_IDENTIFIERS = ["The following propositions apply in the initial state:",
+                       "The following propositions always apply except in the initial state:",
+                       "The following propositions always apply:",
+                       "The following propositions apply in the final state:"]
+
+DEFINITION_SENTENCE = 'definition_sentence'
+SPECIFICATION_SENTENCE = 'specification_sentence'
+
+
+class ParserProfile(Enum):
+    SENTENCE = 0  # each sentence is parsed on its own, falling back to the document parser
+    DOCUMENT = 1  # the whole input is parsed at once
+
+
+class SentenceParserType(Enum):
+    EARLEY = 0  # Earley parser with the dynamic lexer, the default for each sentence
+    EARLEY_COMPLETE = 1  # Earley parser trying every tokenization of the sentence
+    DOCUMENT = 2  # the sentence has been parsed together with the whole input
+
+
+@dataclass
+class Sentence:
+    text: str
+    line: int
+    column: int
+    is_problem_identifier: bool = False
+    position: int = 0
+
+
+@dataclass
+class ParsedSentence:
+    sentence: Sentence
+    tree: Tree | Token | None
+    parser: SentenceParserType | None
+    key: str = ''
+
+    def get_proposition(self) -> Tree:
+        return self.tree.children[0]
+
+
+class UnparsableSentence(Exception):
+    def __init__(self, sentence: Sentence, start: str):
+        self.sentence = sentence
+        self.start = start
+        super(UnparsableSentence, self).__init__(f'Sentence at line {sentence.line} cannot be parsed on its own.')
+
+
+def get_sentence_key(text: str, start: str) -> str:
+    return hashlib.sha256(f'{start}\n{text}'.encode('utf-8')).hexdigest()
+
+
+def split_sentences(cnl_input: str | Iterable[str]) -> Iterator[Sentence]:
+    """
+    Split the input on the END_OF_LINE terminal ('.' not followed by a digit).
+    Comments and quoted strings are skipped, problem identifiers are returned as sentences on their own.
+    :param cnl_input: the input text, or its lines (e.g. a file), that are read lazily.
+    """
+    lines = io.StringIO(cnl_input) if isinstance(cnl_input, str) else cnl_input
+    sentence_parts: list[str] = []
+    sentence_line = sentence_column = sentence_position = 0
+    in_sentence = in_quotes = in_comment = False
+    line_position = 0
+    for line, text in enumerate(lines, start=1):
+        length = len(text)
+        part_start = 0
+        i = 0
+        while i < length:
+            char = text[i]
+            if in_comment:
+                end = text.find('*/', i)
+                i = length if end == -1 else end + 2
+                in_comment = end == -1
+                continue
+            if in_quotes:
+                in_quotes = char != '"'
+                i += 1
+                continue
+            if char.isspace():
+                i += 1
+                continue
+            if text.startswith('//', i):
+                i = length
+                continue
+            if text.startswith('/*', i):
+                in_comment = True
+                i += 2
+                continue
+            if not in_sentence:
+                in_sentence = True
+                part_start = i
+                sentence_line = line
+                sentence_column = i + 1
+                sentence_position = line_position + i
+                identifier = next((x for x in PROBLEM_IDENTIFIERS if text.startswith(x, i)), None)
+                if identifier:
+                    yield Sentence(identifier, sentence_line, sentence_column, True, sentence_position)
+                    in_sentence = False
+                    i += len(identifier)
+                    continue
+            if char == '"':
+                in_quotes = True
+            elif char == '.' and not (i + 1 < length and text[i + 1].isdigit()):
+                sentence_parts.append(text[part_start:i + 1])
+                yield Sentence(''.join(sentence_parts), sentence_line, sentence_column, position=sentence_position)
+                sentence_parts = []
+                in_sentence = False
+            i += 1
+        if in_sentence:
+            sentence_parts.append(text[part_start:])
+        line_position += length
+    if in_sentence:
+        # missing final END_OF_LINE, the parser will report the error
+        yield Sentence(''.join(sentence_parts), sentence_line, sentence_column, position=sentence_position)
+
+
+class SentenceParser:
+    """
+    Parse the input one sentence at a time and assemble the sentence trees in the same tree
+    produced by the document parser.
+
+    Each sentence is parsed with the Earley parser, and in case of failure with an Earley parser
+    trying every tokenization of the sentence. If a sentence cannot be parsed on its own the whole
+    input is parsed again with the document parser, that reports the error.
+    The parser used for each sentence is available in parsed_sentences.
+
+    If a cache is given, the parse tree of each sentence is stored in it with the hash of the sentence text,
+    and sentences already in the cache are not parsed again.
+    """
+    PARSERS_OPTIONS = {
+        SentenceParserType.EARLEY: {},
+        SentenceParserType.EARLEY_COMPLETE: {'lexer': 'dynamic_complete'},
+    }
+
+    def __init__(self, propagate_positions: bool = True, cache: dict[str, ParsedSentence] = None):
+        self._propagate_positions = propagate_positions
+        self._cache = cache
+        self.parsed_sentences: list[ParsedSentence] = []
+
+    def _get_parser(self, parser_type: SentenceParserType):
+        return GrammarCache.get_parser(start=[DEFINITION_SENTENCE, SPECIFICATION_SENTENCE],
+                                       propagate_positions=self._propagate_positions,
+                                       **SentenceParser.PARSERS_OPTIONS[parser_type])
+
+    def parse_document(self, cnl_input: str) -> Tree[Token]:
+        tree = GrammarCache.get_parser(propagate_positions=self._propagate_positions).parse(cnl_input)
+        self.parsed_sentences = [ParsedSentence(sentence, None, SentenceParserType.DOCUMENT)
+                                 for sentence in split_sentences(cnl_input) if not sentence.is_problem_identifier]
+        return tree
+
+    def parse_sentence(self, sentence: Sentence, start: str) -> ParsedSentence | None:
+        key = get_sentence_key(sentence.text, start)
+        parsed_sentence = self._cache.get(key) if self._cache is not None else None
+        if parsed_sentence is None:
+            for parser_type in SentenceParser.PARSERS_OPTIONS:
+                try:
+                    tree = self._get_parser(parser_type).parse(sentence.text, start=start)
+                except UnexpectedInput:
+                    continue
+                parsed_sentence = ParsedSentence(Sentence(sentence.text, 1, 1), tree, parser_type, key)
+                if self._cache is not None:
+                    self._cache[key] = parsed_sentence
+                break
+            else:
+                return None
+        tree = parsed_sentence.tree
+        if self._propagate_positions and (sentence.line, sentence.column) != (1, 1):
+            tree = self._relocate(tree, sentence.line, sentence.column)
+        return ParsedSentence(sentence, tree, parsed_sentence.parser, key)
+
+    def get_error(self, unparsable_sentence: UnparsableSentence) -> UnexpectedInput:
+        """
+        Return the parsing error of a sentence that cannot be parsed, with the position relative to the whole input.
+        """
+        sentence = unparsable_sentence.sentence
+        try:
+            self._get_parser(SentenceParserType.EARLEY).parse(sentence.text, start=unparsable_sentence.start)
+        except UnexpectedInput as error:
+            if error.line == 1:
+                error.column += sentence.column - 1
+            error.line += sentence.line - 1
+            error.pos_in_stream += sentence.position
+            return error
+        raise unparsable_sentence
+
+    def parse_sentences(self, sentences: Iterable[Sentence]) -> Iterator[ParsedSentence]:
+        """
+        Parse the sentences one at a time, problem identifiers are returned as PROBLEM_IDENTIFIER tokens.
+        :raise UnparsableSentence: if a sentence cannot be parsed on its own, or a problem identifier
+            is not followed by any proposition.
+        """
+        start = DEFINITION_SENTENCE
+        empty_specification: Sentence | None = None
+        for sentence in sentences:
+            if sentence.is_problem_identifier:
+                if empty_specification:
+                    raise UnparsableSentence(sentence, SPECIFICATION_SENTENCE)
+                start = SPECIFICATION_SENTENCE
+                empty_specification = sentence
+                yield ParsedSentence(sentence, Token('PROBLEM_IDENTIFIER', sentence.text), None,
+                                     get_sentence_key(sentence.text, 'PROBLEM_IDENTIFIER'))
+                continue
+            parsed_sentence = self.parse_sentence(sentence, start)
+            if parsed_sentence is None:
+                raise UnparsableSentence(sentence, start)
+            empty_specification = None
+            if start == DEFINITION_SENTENCE and parsed_sentence.get_proposition().data == 'standard_proposition':
+                start = SPECIFICATION_SENTENCE
+            yield parsed_sentence
+        if empty_specification:
+            raise UnparsableSentence(empty_specification, SPECIFICATION_SENTENCE)
+
+    def parse(self, cnl_input: str) -> Tree[Token]:
+        self.parsed_sentences = []
+        children = []
+        specification: Tree | None = None
+        in_definitions = True
+        try:
+            for parsed_sentence in self.parse_sentences(split_sentences(cnl_input)):
+                if parsed_sentence.sentence.is_problem_identifier:
+                    specification = Tree('specification', [parsed_sentence.tree])
+                    children.append(specification)
+                    in_definitions = False
+                    continue
+                self.parsed_sentences.append(parsed_sentence)
+                proposition, end_of_line = parsed_sentence.tree.children
+                if in_definitions and proposition.data == 'standard_proposition':
+                    in_definitions = False
+                if in_definitions:
+                    children += [proposition, end_of_line]
+                else:
+                    if specification is None:
+                        specification = Tree('specification', [])
+                        children.append(specification)
+                    specification.children += [proposition, end_of_line]
+        except UnparsableSentence:
+            return self.parse_document(cnl_input)
+        return Tree('start', children)
+
+    def _relocate(self, tree: Tree, line: int, column: int) -> Tree:
+        # sentences are parsed on their own, move the positions to the sentence position in the input
+        children = [self._relocate(child, line, column) if isinstance(child, Tree) else child
+                    for child in tree.children]
+        meta = tree.meta
+        if meta.empty:
+            return Tree(tree.data, children)
+        relocated_meta = Meta()
+        relocated_meta.__dict__.update(meta.__dict__)
+        relocated_meta.line = meta.line + line - 1
+        relocated_meta.end_line = meta.end_line + line - 1
+        relocated_meta.column = meta.column + column - 1 if meta.line == 1 else meta.column
+        relocated_meta.end_column = meta.end_column + column - 1 if meta.end_line == 1 else meta.end_column
+        return Tree(tree.data, children, relocated_meta)
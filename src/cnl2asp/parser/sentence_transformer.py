@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import copy
+from typing import Iterable, TypeVar
+
+from lark import Tree
+
+from cnl2asp.parser.parser import CNLTransformer, DUMMY_ENTITY
+from cnl2asp.parser.sentence_parser import SentenceParser, ParsedSentence, UnparsableSentence, split_sentences
+from cnl2asp.specification.constant_component import ConstantComponent
+from cnl2asp.specification.problem import Problem
+from cnl2asp.specification.proposition import Proposition
+from cnl2asp.specification.specification import SpecificationComponent
+from cnl2asp.utility.compilation_context import CompilationContext
+
+T = TypeVar('T')
+
+
+class SentenceTransformer:
+    """
+    Transform the parsed sentences one at a time, in the same order of the transformation of the document tree.
+    The tree of each sentence can be released once transformed, and sentences parsed without positions
+    report the errors at the line where the sentence starts.
+    """
+
+    def __init__(self, transformer: CNLTransformer = None):
+        self.transformer = transformer if transformer else CNLTransformer()
+        self._in_definitions = True
+        self._in_specification = False
+
+    @property
+    def in_definitions(self) -> bool:
+        return self._in_definitions
+
+    def transform_sentence(self, parsed_sentence: ParsedSentence):
+        if parsed_sentence.sentence.is_problem_identifier:
+            self._close_specification()
+            self.transformer.PROBLEM_IDENTIFIER(parsed_sentence.tree)
+            self._in_definitions = False
+            self._in_specification = True
+            return
+        proposition: Tree = parsed_sentence.get_proposition()
+        if self._in_definitions and proposition.data == 'standard_proposition':
+            self._in_definitions = False
+            self._in_specification = True
+        self.transformer.set_default_line(parsed_sentence.sentence.line)
+        self.transformer.transform(proposition)
+
+    def transform(self, parsed_sentences: Iterable[ParsedSentence]) -> SpecificationComponent:
+        for parsed_sentence in parsed_sentences:
+            self.transform_sentence(parsed_sentence)
+        return self.get_specification()
+
+    def get_specification(self) -> SpecificationComponent:
+        self._close_specification()
+        return self.transformer.start([])
+
+    def _close_specification(self):
+        if self._in_specification:
+            self.transformer.specification([])
+            self._in_specification = False
+
+
+class IncrementalTransformer:
+    """
+    Transform successive versions of the same input reusing the work done for the previous versions.
+
+    The parse tree of each sentence is cached with the hash of the sentence text, so that only new or edited
+    sentences are parsed. The state of the transformation (transformer and signatures) is saved before
+    the first edited sentence, at the end of the input and every CHECKPOINT_INTERVAL sentences;
+    the next transformation restarts from the last checkpoint before the first sentence
+    that differs from the previous version.
+    The propositions and constants, that are most of the state, are not part of the checkpoints: a copy of each
+    one is kept once, before the conversion modifies it, and a checkpoint records how many of them were
+    transformed. Saving the checkpoints of an input therefore takes linear time.
+    If a sentence cannot be parsed on its own, the whole input is parsed and transformed again.
+    """
+    CHECKPOINT_INTERVAL = 8
+
+    def __init__(self, propagate_positions: bool = True, context: CompilationContext = None):
+        self._context = context if context else CompilationContext.get_current()
+        self._parser = SentenceParser(propagate_positions, cache={})
+        self._keys: list[str] = []
+        self._checkpoints: dict[int, tuple] = {}
+        # copies of the transformed propositions of each problem and of the constants
+        self._propositions: list[list[Proposition]] = []
+        self._constants: list[ConstantComponent] = []
+        self._options = None
+        self.parsed_sentences: list[ParsedSentence] = []
+        self.transformed_sentences = 0
+
+    def transform(self, cnl_input: str) -> SpecificationComponent:
+        try:
+            parsed_sentences = list(self._parser.parse_sentences(split_sentences(cnl_input)))
+        except UnparsableSentence:
+            self.reset()
+            self._context.signatures = []
+            specification = CNLTransformer(self._context).transform(self._parser.parse_document(cnl_input))
+            self.parsed_sentences = self._parser.parsed_sentences
+            self.transformed_sentences = len(self.parsed_sentences)
+            return specification
+        self.parsed_sentences = [x for x in parsed_sentences if not x.sentence.is_problem_identifier]
+        keys = [x.key for x in parsed_sentences]
+        first_change = self._get_first_change(keys)
+        self._keys = keys
+        self._checkpoints = {index: state for index, state in self._checkpoints.items() if index <= first_change}
+        if self._checkpoints:
+            start = max(self._checkpoints)
+            sentence_transformer = self._restore(start)
+        else:
+            start = 0
+            self._context.signatures = []
+            self._propositions = []
+            self._constants = []
+            sentence_transformer = SentenceTransformer(CNLTransformer(self._context))
+        self.transformed_sentences = 0
+        for index in range(start, len(parsed_sentences) + 1):
+            if index not in self._checkpoints and (index == first_change or index == len(parsed_sentences)
+                                                   or index % self.CHECKPOINT_INTERVAL == 0):
+                self._save(index, sentence_transformer)
+            if index < len(parsed_sentences):
+                sentence_transformer.transform_sentence(parsed_sentences[index])
+                self.transformed_sentences += 1
+        return sentence_transformer.get_specification()
+
+    def reset(self):
+        self._keys = []
+        self._checkpoints = {}
+        self._propositions = []
+        self._constants = []
+
+    def _get_first_change(self, keys: list[str]) -> int:
+        options = self._context.auto_entity_link
+        if options != self._options:
+            # the transformation depends on the options, the checkpoints are not valid anymore
+            self._options = options
+            self._checkpoints = {}
+            return 0
+        first_change = 0
+        for previous_key, key in zip(self._keys, keys):
+            if previous_key != key:
+                break
+            first_change += 1
+        return first_change
+
+    def _save(self, index: int, sentence_transformer: SentenceTransformer):
+        transformer = sentence_transformer.transformer
+        specification, problem = transformer.get_specification(), transformer.get_problem()
+        problems = specification.get_problems() + [problem]
+        for position, transformed_problem in enumerate(problems):
+            if position == len(self._propositions):
+                self._propositions.append([])
+            propositions = self._propositions[position]
+            propositions += self._copy_state(transformed_problem.get_propositions()[len(propositions):])
+        self._constants += self._copy_state(specification.get_constants()[len(self._constants):])
+        layout = ([(transformed_problem.name, len(transformed_problem.get_propositions()))
+                   for transformed_problem in problems], len(specification.get_constants()))
+        # the rest of the state is copied without the propositions and the constants
+        transformer.set_specification(SpecificationComponent(), Problem())
+        try:
+            self._checkpoints[index] = (self._copy_state((sentence_transformer, self._context.signatures)), layout)
+        finally:
+            transformer.set_specification(specification, problem)
+
+    def _restore(self, index: int) -> SentenceTransformer:
+        state, (problems_layout, constants_count) = self._checkpoints[index]
+        sentence_transformer, signatures = self._copy_state(state)
+        # the propositions and constants transformed after the checkpoint are transformed again
+        del self._propositions[len(problems_layout):]
+        problems = []
+        for propositions, (name, propositions_count) in zip(self._propositions, problems_layout):
+            del propositions[propositions_count:]
+            problems.append(Problem(name, self._copy_state(propositions)))
+        del self._constants[constants_count:]
+        specification = SpecificationComponent(problems[:-1], self._copy_state(self._constants))
+        sentence_transformer.transformer.set_specification(specification, problems[-1])
+        self._context.signatures = signatures
+        return sentence_transformer
+
+    @staticmethod
+    def _copy_state(state: T) -> T:
+        # the dummy entity is compared by identity in the transformer
+        return copy.deepcopy(state, memo={id(DUMMY_ENTITY): DUMMY_ENTITY})
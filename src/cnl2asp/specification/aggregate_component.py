@@ -16,6 +16,8 @@ class AggregateOperation(Enum):
 
 
 class AggregateComponent(Component):
+    __slots__ = ('operation', 'discriminant', 'body')
+
     def __init__(self, operation: AggregateOperation, discriminant: list[AttributeComponent], body: list[Component]):
         self.operation = operation
         self.discriminant = discriminant
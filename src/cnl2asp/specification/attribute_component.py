@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+import weakref
 from typing import Any, TYPE_CHECKING
 
 import inflect
@@ -13,26 +15,32 @@ if TYPE_CHECKING:
 
 
 class ValueComponent(Component, str):
+    __slots__ = ()
+
     def convert(self, converter: Converter):
         return converter.convert_value(self)
 
     def copy(self) -> Any:
-        return ValueComponent(self)
+        # values are immutable strings, copies can share them
+        return self
 
     def is_angle(self) -> bool:
         return False
 
 
 class AngleValueComponent(ValueComponent):
+    __slots__ = ()
 
     def copy(self) -> Any:
-        return AngleValueComponent(self)
+        return self
 
     def is_angle(self) -> bool:
         return True
 
 
 class RangeValueComponent(ValueComponent):
+    __slots__ = ()
+
     def __new__(cls, *content):
         value = content[0]
         if len(content) > 1:
@@ -43,23 +51,91 @@ class RangeValueComponent(ValueComponent):
         return converter.convert_range_value(self)
 
     def copy(self) -> Any:
-        return RangeValueComponent(self)
+        return self
+
+
+class PoolValueComponent(Component):
+    """
+    Immutable alternative values of a variable, separated by semicolons only when printed.
+    """
+    __slots__ = ('values',)
+
+    def __init__(self, values: list[ValueComponent]):
+        self.values: tuple[ValueComponent, ...] = tuple(values)
+
+    def get_values(self) -> list[ValueComponent]:
+        return list(self.values)
+
+    def convert(self, converter: Converter):
+        return converter.convert_pool_value(self)
+
+    def copy(self) -> Any:
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, PoolValueComponent):
+            return False
+        return self.values == other.values
+
+    def __hash__(self):
+        return hash(self.values)
+
+    def __str__(self):
+        return ';'.join(self.values)
 
 
 class AttributeOrigin:
-    def __init__(self, name: str, origin: AttributeOrigin = None):
-        self.name = NameComponent(str(name))
-        self.origin = origin
-        if origin and self.name == origin.name:
+    """
+    Immutable chain of the entities from which an attribute has been taken, e.g. "shift id" of "nurse works".
+
+    Origins are interned, so that each chain of names is represented by a single instance, and chains whose names
+    have the same singular forms share a canonical instance, that makes equality an identity check.
+    """
+    __slots__ = ('name', 'origin', '_canonical', '_hash', '_is_angle', '__weakref__')
+    _pool: weakref.WeakValueDictionary[tuple, AttributeOrigin] = weakref.WeakValueDictionary()
+    _canonical_pool: weakref.WeakValueDictionary[tuple, AttributeOrigin] = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    def __new__(cls, name: str, origin: AttributeOrigin = None):
+        name = NameComponent(str(name))
+        if origin and name == origin.name:
             # avoid nesting same origin
-            self.origin = origin.origin
+            origin = origin.origin
+        # the origin is kept alive by the interned instance, so its id is not reused while the entry exists
+        key = (name.name, id(origin))
+        attribute_origin = AttributeOrigin._pool.get(key)
+        if attribute_origin is None:
+            with AttributeOrigin._lock:
+                attribute_origin = AttributeOrigin._pool.get(key)
+                if attribute_origin is None:
+                    attribute_origin = super().__new__(cls)
+                    canonical_key = (name.get_key(), id(origin._canonical) if origin else None)
+                    canonical = AttributeOrigin._canonical_pool.get(canonical_key, attribute_origin)
+                    object.__setattr__(attribute_origin, 'name', name)
+                    object.__setattr__(attribute_origin, 'origin', origin)
+                    object.__setattr__(attribute_origin, '_canonical', canonical)
+                    object.__setattr__(attribute_origin, '_hash',
+                                       hash((name.get_key(), origin._hash if origin else None)))
+                    object.__setattr__(attribute_origin, '_is_angle',
+                                       'angle' in name or (origin._is_angle if origin else False))
+                    AttributeOrigin._canonical_pool.setdefault(canonical_key, canonical)
+                    AttributeOrigin._pool[key] = attribute_origin
+        return attribute_origin
+
+    def __setattr__(self, key, value):
+        raise AttributeError('AttributeOrigin is immutable')
+
+    def __reduce__(self):
+        return AttributeOrigin, (self.name.name, self.origin)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def is_angle(self):
-        if 'angle' in self.name:
-            return True
-        if self.origin:
-            return self.origin.is_angle()
-        return False
+        return self._is_angle
 
     def __str__(self):
         if self.origin:
@@ -69,30 +145,30 @@ class AttributeOrigin:
     def __eq__(self, other):
         if not isinstance(other, AttributeOrigin):
             return False
-        if self.name == other.name:
-            if self.origin:
-                return self.origin == other.origin
-            elif not self.origin and not other.origin:
-                return True
-        return False
+        return self._canonical is other._canonical
+
+    def __hash__(self):
+        return self._hash
 
 
 def is_same_origin(origin_1: AttributeOrigin, origin_2: AttributeOrigin) -> bool:
-    if origin_1 and not origin_2:
-        return False
-    if origin_2 and not origin_1:
-        return False
+    if origin_1 is None or origin_2 is None:
+        return origin_1 is origin_2
     # one can be the subset of the other
-    if origin_1 == origin_2:
+    canonical_1 = origin_1._canonical
+    canonical_2 = origin_2._canonical
+    if canonical_1 is canonical_2:
         return True
-    if origin_1.origin == origin_2:
+    if origin_1.origin is not None and origin_1.origin._canonical is canonical_2:
         return True
-    if origin_2.origin == origin_1:
+    if origin_2.origin is not None and origin_2.origin._canonical is canonical_1:
         return True
     return False
 
 
 class AttributeComponent(Component):
+    __slots__ = ('_name', 'origin', 'value', 'operations')
+
     def __init__(self, name: str, value: ValueComponent,
                  attribute_origin: AttributeOrigin = None,
                  operations: list[OperationComponent] = None):
@@ -116,7 +192,10 @@ class AttributeComponent(Component):
         return str(self._name)
 
     def removesuffix(self, suffix: str):
-        self._name.removesuffix(suffix)
+        self._name = self._name.removesuffix(suffix)
+
+    def get_name_key(self) -> str:
+        return self._name.get_key()
 
     def convert(self, converter: Converter):
         return converter.convert_attribute(self)
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 
 
 class Component(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def convert(self, converter: Converter) -> Any:
         """Convert self"""
@@ -6,6 +6,8 @@ from cnl2asp.specification.component import Component
 
 
 class ConstantComponent(Component):
+    __slots__ = ('name', 'value')
+
     def __init__(self, name: str, value: ValueComponent):
         self.name = name
         self.value = value
@@ -3,7 +3,7 @@ from __future__ import annotations
 import abc
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, TYPE_CHECKING
+from typing import Any, TYPE_CHECKING, Iterator
 
 from cnl2asp.exception.cnl2asp_exceptions import AttributeNotFound
 from cnl2asp.converter.converter_interface import Converter, EntityConverter
@@ -12,6 +12,7 @@ from cnl2asp.specification.attribute_component import AttributeComponent, ValueC
 from cnl2asp.specification.component import Component
 from cnl2asp.specification.name_component import NameComponent
 from cnl2asp.specification.relation_component import RelationComponent
+from cnl2asp.utility.inflection import Inflection
 from cnl2asp.utility.utility import Utility
 
 if TYPE_CHECKING:
@@ -29,17 +30,20 @@ class EntityType(Enum):
 
 
 class EntityComponent(Component):
+    __slots__ = ('_shared', '_name', 'label', '_keys', '_attributes', 'negated', 'entity_type', 'auxiliary_verb',
+                 'is_before', 'is_after', 'is_initial', 'is_final', '_attribute_index')
+
     def __init__(self, name: str, label: str, keys: list[AttributeComponent], attributes: list[AttributeComponent],
                  negated: bool = False, entity_type: EntityType = EntityType.GENERIC,
                  is_before: bool = False, is_after: bool = False, is_initial: bool = False,
                  is_final: bool = False, auxiliary_verb: str = ""):
+        self._shared = False  # keys and attributes of a copy on write, not copied yet
+        self._attribute_index: dict[str, list[AttributeComponent]] | None = None  # singular name -> attributes
         self._name = NameComponent(name)
         self.label = label
         self.keys = keys if keys else []
         self.attributes = attributes if attributes else []
-        for attribute in self.attributes:
-            if attribute.origin is None:
-                attribute.origin = AttributeOrigin(self.get_name())
+        self._set_attributes_origin()
         self.negated = negated
         self.entity_type = entity_type
         self.auxiliary_verb = auxiliary_verb
@@ -48,6 +52,52 @@ class EntityComponent(Component):
         self.is_initial = is_initial
         self.is_final = is_final
 
+    @property
+    def keys(self) -> list[AttributeComponent]:
+        """
+        The keys of the entity, that can be modified: a copy on write copies them first.
+        """
+        if self._shared:
+            self._copy_shared_attributes()
+        self._attribute_index = None
+        return self._keys
+
+    @keys.setter
+    def keys(self, keys: list[AttributeComponent]):
+        if self._shared:
+            self._copy_shared_attributes()
+        self._attribute_index = None
+        self._keys = keys
+
+    @property
+    def attributes(self) -> list[AttributeComponent]:
+        """
+        The attributes of the entity, that can be modified: a copy on write copies them first.
+        """
+        if self._shared:
+            self._copy_shared_attributes()
+        self._attribute_index = None
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes: list[AttributeComponent]):
+        if self._shared:
+            self._copy_shared_attributes()
+        self._attribute_index = None
+        self._attributes = attributes
+
+    def _set_attributes_origin(self):
+        for attribute in self._attributes:
+            if attribute.origin is None:
+                attribute.origin = AttributeOrigin(self.get_name())
+
+    def _copy_shared_attributes(self):
+        self._shared = False
+        self._attribute_index = None
+        self._keys = [key.copy() for key in self._keys]
+        self._attributes = [attribute.copy() for attribute in self._attributes]
+        self._set_attributes_origin()
+
     def label_is_key_value(self):
         if self.label and len(self.get_keys()) == 1 and self.get_keys()[0].value == Utility.NULL_VALUE:
             return True
@@ -63,6 +113,9 @@ class EntityComponent(Component):
     def get_name(self):
         return str(self._name)
 
+    def get_name_key(self) -> str:
+        return self._name.get_key()
+
     def is_initialized(self) -> bool:
         if self.get_keys_and_attributes():
             return True
@@ -76,7 +129,7 @@ class EntityComponent(Component):
         return res
 
     def has_attribute_value(self, value: ValueComponent) -> bool:
-        for attribute in self.attributes:
+        for attribute in self._attributes:
             if attribute.value == value:
                 return True
         return False
@@ -90,16 +143,26 @@ class EntityComponent(Component):
     def get_entity_identifier(self):
         return self._name
 
-    def get_keys(self) -> list[AttributeComponent]:
-        return self.keys if self.keys else self.attributes
+    # the getters do not copy the attributes of a copy on write, that have to be modified through
+    # the keys and attributes properties or set_attributes_value
 
-    def get_attributes(self) -> list[AttributeComponent]:
-        if self.keys:
-            return self.attributes
-        return []
+    def get_keys(self) -> tuple[AttributeComponent, ...]:
+        """
+        The keys of the entity, read-only as they may be shared with its copies: they are modified through keys.
+        """
+        return tuple(self._keys if self._keys else self._attributes)
+
+    def get_attributes(self) -> tuple[AttributeComponent, ...]:
+        """
+        The attributes of the entity, read-only as they may be shared with its copies: they are modified through
+        attributes.
+        """
+        if self._keys:
+            return tuple(self._attributes)
+        return ()
 
     def get_keys_and_attributes(self) -> list[AttributeComponent]:
-        return self.keys + self.attributes
+        return self._keys + self._attributes
 
     def set_attributes_value(self, attributes: list[AttributeComponent], proposition: PropositionBuilder = None):
         def update_attribute(attribute, value, operations):
@@ -112,6 +175,8 @@ class EntityComponent(Component):
                     return attribute
             return None
 
+        if self._shared:
+            self._copy_shared_attributes()
         for attribute in attributes:
             if isinstance(attribute, EntityComponent):
                 if not proposition:
@@ -121,7 +186,9 @@ class EntityComponent(Component):
                 origin = attribute.origin
                 if not origin:
                     origin = AttributeOrigin(str(self.get_name()))
-                matching_attributes = self.get_attributes_by_name_and_origin(attribute.get_name(), origin)
+                matching_attributes = self.find_attributes_by_name_and_origin(attribute.get_name(), origin)
+                if not matching_attributes:
+                    raise self._attribute_not_found(attribute.get_name(), origin)
                 if get_first_null_attribute(matching_attributes):
                     update_attribute(get_first_null_attribute(matching_attributes), attribute.value,
                                      attribute.operations)
@@ -134,40 +201,70 @@ class EntityComponent(Component):
             origin = self.get_attributes_by_name(attribute_name)[0].origin
         self.set_attributes_value([AttributeComponent(attribute_name, value, origin)])
 
-    def get_attributes_by_name_and_origin(self, name: str, origin: AttributeOrigin = None) -> list[AttributeComponent]:
-        attributes = []
+    def _get_attribute_index(self) -> dict[str, list[AttributeComponent]]:
+        # the index is dropped whenever the lists are handed out to be modified, through the keys and attributes
+        # properties, or replaced. Attributes are renamed before they are added to an entity
+        if self._attribute_index is None:
+            self._attribute_index = {}
+            for attribute in self._keys + self._attributes:
+                self._attribute_index.setdefault(attribute.get_name_key(), []).append(attribute)
+        return self._attribute_index
+
+    def find_attributes_by_name(self, name: str) -> list[AttributeComponent]:
+        """
+        Return the attributes with the given name, or an empty list if the entity has no such attribute.
+        """
+        return list(self._get_attribute_index().get(Inflection.get_singular(str(name)), ()))
+
+    def find_attributes_by_name_and_origin(self, name: str, origin: AttributeOrigin = None) -> list[AttributeComponent]:
         origin = AttributeOrigin(self.get_name()) if not origin else origin
-        for attribute in self.get_keys_and_attributes():
-            if attribute.name_match(name) and is_same_origin(attribute.origin, origin):
-                attributes.append(attribute)
+        return [attribute for attribute in self._get_attribute_index().get(Inflection.get_singular(str(name)), ())
+                if is_same_origin(attribute.origin, origin)]
+
+    def get_attributes_by_name_and_origin(self, name: str, origin: AttributeOrigin = None) -> list[AttributeComponent]:
+        attributes = self.find_attributes_by_name_and_origin(name, origin)
         if attributes:
             return attributes
-        else:
-            error_msg = f'Entity \"{self.get_name()}\" do not contain attribute \"{origin} {name}\".'
-            try:
-                hint = self.get_attributes_by_name(name)
-                error_msg += f'\nDid you mean \"{hint[0]}\"?'
-            except AttributeNotFound:
-                pass
-            raise AttributeNotFound(error_msg)
+        raise self._attribute_not_found(name, AttributeOrigin(self.get_name()) if not origin else origin)
 
     def get_attributes_by_name(self, name: str) -> list[AttributeComponent]:
-        attributes = []
-        for attribute in self.get_keys_and_attributes():
-            if attribute.name_match(name):
-                attributes.append(attribute)
+        attributes = self.find_attributes_by_name(name)
         if attributes:
             return attributes
-        raise AttributeNotFound(f'Entity \"{self.get_name()}\" do not contain attribute \"{name}\".')
+        raise AttributeNotFound(lambda: f'Entity \"{self.get_name()}\" do not contain attribute \"{name}\".')
+
+    def _attribute_not_found(self, name: str, origin: AttributeOrigin) -> AttributeNotFound:
+        def error_message():
+            error_msg = f'Entity \"{self.get_name()}\" do not contain attribute \"{origin} {name}\".'
+            hint = self.find_attributes_by_name(name)
+            if hint:
+                error_msg += f'\nDid you mean \"{hint[0]}\"?'
+            return error_msg
+        return AttributeNotFound(error_message)
 
     def copy(self) -> EntityComponent:
-        keys = [key.copy() for key in self.keys]
-        attributes = [attribute.copy() for attribute in self.attributes]
+        keys = [key.copy() for key in self._keys]
+        attributes = [attribute.copy() for attribute in self._attributes]
         return EntityComponent(self.get_name(), self.label, keys,
                                attributes, self.negated, self.entity_type,
                                self.is_before, self.is_after, self.is_initial, self.is_final,
                                self.auxiliary_verb)
 
+    def copy_on_write(self) -> EntityComponent:
+        """
+        Return the same entity of copy, sharing the keys and the attributes of this entity until they are
+        first modified. This entity must not be modified in place while the copy is in use.
+        """
+        if type(self).copy is not EntityComponent.copy:
+            return self.copy()
+        copy = EntityComponent(self.get_name(), self.label, [], [], self.negated, self.entity_type,
+                               self.is_before, self.is_after, self.is_initial, self.is_final,
+                               self.auxiliary_verb)
+        copy._keys = self._keys
+        copy._attributes = self._attributes
+        copy._shared = True
+        return copy
+
     def get_entities(self) -> list[EntityComponent]:
         return [self]
 
@@ -182,74 +279,137 @@ class EntityComponent(Component):
             return False
         return self._name == other._name \
                and self.label == other.label \
-               and self.keys == other.keys \
-               and self.attributes == other.attributes \
+               and self._keys == other._keys \
+               and self._attributes == other._attributes \
                and self.negated == other.negated \
                and self.entity_type == other.entity_type
 
 
+class TemporalRange:
+    """
+    Values of a temporal entity, from a start value with a fixed step, each labelled with its position from 0.
+    The values are formatted only when iterated, and the label of a value is computed from its distance from the start.
+    """
+    __slots__ = ('entity_type', 'start', 'step', 'length')
+    _FORMATS = {EntityType.TIME: '%I:%M %p', EntityType.DATE: '%d/%m/%Y'}
+
+    def __init__(self, entity_type: EntityType, start: datetime | int, step: timedelta | int, length: int):
+        self.entity_type = entity_type
+        self.start = start
+        self.step = step
+        self.length = length
+
+    @staticmethod
+    def from_bounds(entity_type: EntityType, lhs_value: ValueComponent, rhs_value: ValueComponent,
+                    step: ValueComponent) -> TemporalRange:
+        """
+        :param lhs_value: left hand side value of the range
+        :param rhs_value: right hand side value of the range
+        :param step: step of increment from lhs to rhs, in minutes or days. Steps always increment by 1.
+        """
+        if entity_type == EntityType.TIME:
+            start = datetime.strptime(lhs_value, TemporalRange._FORMATS[entity_type])
+            end = datetime.strptime(rhs_value, TemporalRange._FORMATS[entity_type])
+            step = timedelta(minutes=int(step))
+        elif entity_type == EntityType.DATE:
+            start = datetime.strptime(lhs_value, TemporalRange._FORMATS[entity_type])
+            end = datetime.strptime(rhs_value, TemporalRange._FORMATS[entity_type])
+            step = timedelta(days=int(step))
+        elif entity_type == EntityType.STEP:
+            start = int(lhs_value)
+            end = int(rhs_value)
+            step = 1
+        else:
+            return TemporalRange(entity_type, None, None, 0)
+        # the start value is always in the range
+        return TemporalRange(entity_type, start, step, max(0, (end - start) // step) + 1)
+
+    def get_label(self, value: str | int) -> int | None:
+        """
+        Return the label of the value, or None if the value is not in the range.
+        """
+        if self.entity_type == EntityType.STEP:
+            if not isinstance(value, int):
+                return None
+            label = value - self.start
+        else:
+            if not isinstance(value, str):
+                return None
+            value_format = TemporalRange._FORMATS[self.entity_type]
+            try:
+                parsed_value = datetime.strptime(value, value_format)
+            except ValueError:
+                return None
+            if parsed_value.strftime(value_format) != value:
+                return None
+            label, remainder = divmod(parsed_value - self.start, self.step)
+            if remainder:
+                return None
+        return label if 0 <= label < self.length else None
+
+    def get_value(self, label: int) -> str | int:
+        if self.entity_type == EntityType.STEP:
+            return self.start + label
+        return (self.start + label * self.step).strftime(TemporalRange._FORMATS[self.entity_type])
+
+    def items(self) -> Iterator[tuple[str | int, int]]:
+        for label in range(self.length):
+            yield self.get_value(label), label
+
+    def __len__(self):
+        return self.length
+
+    def __eq__(self, other):
+        if not isinstance(other, TemporalRange):
+            return False
+        return self.entity_type == other.entity_type and self.start == other.start and self.step == other.step \
+            and self.length == other.length
+
+    def __hash__(self):
+        return hash((self.entity_type, self.start, self.step, self.length))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # ranges are never modified
+        return self
+
+
 class TemporalEntityComponent(EntityComponent):
+    __slots__ = ('values',)
+
     def __init__(self, name: str, label: str,
                  lhs_range_value: ValueComponent,
                  rhs_range_value: ValueComponent, step: ValueComponent,
-                 entity_type: EntityType, values: dict = None):
+                 entity_type: EntityType, values: TemporalRange = None):
         super().__init__(name, label,
                          [AttributeComponent(name, ValueComponent('_'), AttributeOrigin(name))],
                          [AttributeComponent('value', ValueComponent('_'), AttributeOrigin(name))],
                          entity_type=entity_type)
         step = 1 if not step else step
-        self.values: dict = self._compute_values(lhs_range_value, rhs_range_value, step) if not values else values
+        self.values: TemporalRange = self._compute_values(lhs_range_value, rhs_range_value, step) \
+            if values is None else values
 
     def get_temporal_value_id(self, value: ValueComponent):
-        temporal_value_id = self.values.get(value)
+        temporal_value_id = self.values.get_label(value)
         if temporal_value_id is not None:
             return temporal_value_id
         raise KeyError(f'Value "{value}" out of "{self.get_name()}" range')
 
     def _compute_values(self, lhs_value: ValueComponent, rhs_value: ValueComponent,
-                        step: ValueComponent) -> dict:
+                        step: ValueComponent) -> TemporalRange:
         """
-        Compute all the values in the range and assign a label starting from 0
+        Compute the range of the values, where each value is assigned a label starting from 0
         :param lhs_value: left hand side value of the range
         :param rhs_value: right hand side value of the range
         :param step: step of increment from lhs to rhs
-        :return: a dict with each value associated to a number
+        :return: the range of the values
         """
-        elements = dict()
-        counter = 1
         try:
-            if self.entity_type == EntityType.TIME:
-                start = datetime.strptime(lhs_value, '%I:%M %p')
-                end = datetime.strptime(rhs_value, '%I:%M %p')
-                elements[start.strftime('%I:%M %p')] = 0
-                start = start + timedelta(minutes=int(step))
-                while start <= end:
-                    if start > end:
-                        start = end
-                    elements[start.strftime('%I:%M %p')] = counter
-                    counter += 1
-                    start = start + timedelta(minutes=int(step))
-            elif self.entity_type == EntityType.DATE:
-                start = datetime.strptime(lhs_value, '%d/%m/%Y')
-                end = datetime.strptime(rhs_value, '%d/%m/%Y')
-                elements[start.strftime('%d/%m/%Y')] = 0
-                start = start + timedelta(days=int(step))
-                while start <= end:
-                    if start > end:
-                        start = end
-                    elements[start.strftime('%d/%m/%Y')] = counter
-                    counter += 1
-                    start = start + timedelta(days=int(step))
-            elif self.entity_type == EntityType.STEP:
-                start = lhs_value
-                end = rhs_value
-                elements[int(start)] = 0
-                for i in range(int(start) + 1, int(end) + 1):
-                    elements[i] = counter
-                    counter += 1
+            return TemporalRange.from_bounds(self.entity_type, lhs_value, rhs_value, step)
         except:
             raise Exception(f"Entity {self.get_name()}, entity type do not match {lhs_value} and {rhs_value}")
-        return elements
 
     def is_temporal_entity(self) -> bool:
         return True
@@ -260,8 +420,9 @@ class TemporalEntityComponent(EntityComponent):
     def copy(self) -> Any:
         copy = TemporalEntityComponent(self.get_name(), self.label, None,
                                        None, None, self.entity_type, self.values)
-        copy.set_attributes_value(super(TemporalEntityComponent, self).copy().attributes)
-        copy.set_attributes_value(super(TemporalEntityComponent, self).copy().keys)
+        entity_copy = super(TemporalEntityComponent, self).copy()
+        copy.set_attributes_value(entity_copy.attributes)
+        copy.set_attributes_value(entity_copy.keys)
         return copy
 
     def convert(self, converter: Converter):
@@ -269,6 +430,8 @@ class TemporalEntityComponent(EntityComponent):
 
 
 class ComplexEntityComponent(EntityComponent):
+    __slots__ = ('values', 'entity_identifier')
+
     def __init__(self, name: str, complex_entity_id: ValueComponent, keys: list[AttributeComponent],
                  attributes: list[AttributeComponent], entity_type: EntityType, values: list[ValueComponent] = None):
         if values is None:
@@ -286,6 +449,8 @@ class ComplexEntityComponent(EntityComponent):
 
 
 class SetEntityComponent(ComplexEntityComponent):
+    __slots__ = ()
+
     def __init__(self, set_id: ValueComponent = None, values: list[ValueComponent] = None):
         super().__init__('set', set_id, [AttributeComponent('set_id', set_id, AttributeOrigin('set')),
                                          AttributeComponent('element', ValueComponent(Utility.NULL_VALUE),
@@ -308,6 +473,8 @@ class SetEntityComponent(ComplexEntityComponent):
 
 
 class ListEntityComponent(ComplexEntityComponent):
+    __slots__ = ()
+
     def __init__(self, list_id: ValueComponent = None, values: list[ValueComponent] = None):
         super().__init__('list', list_id, [AttributeComponent('list_id', list_id, AttributeOrigin('list')),
                                            AttributeComponent('index', ValueComponent(Utility.NULL_VALUE),
@@ -1,39 +1,65 @@
-from typing import Any
+from __future__ import annotations
 
-import inflect
+import threading
+import weakref
+from typing import Any
 
 from cnl2asp.converter.converter_interface import Converter
 from cnl2asp.specification.component import Component
-
+from cnl2asp.utility.inflection import Inflection
 
 
 class NameComponent(Component):
-    def convert(self, converter: Converter) -> Any:
-        return self.name
+    """
+    Immutable name, interned so that each distinct name is represented by a single instance.
+    Names are equal if they have the same singular form, that is used as key for equality and hashing.
+    A string is equal to a name if it is the name, its singular or its plural. Strings are hashed on their own
+    value, so names and strings must not be mixed as keys of the same dictionary or set.
+    """
+    __slots__ = ('name', 'singular_and_plural_name', '_key', '_hash', '__weakref__')
+    _pool: weakref.WeakValueDictionary[str, NameComponent] = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
 
-    def copy(self) -> Any:
-        return NameComponent(self.name)
+    def __new__(cls, name: str):
+        name_component = NameComponent._pool.get(name)
+        if name_component is None:
+            with NameComponent._lock:
+                name_component = NameComponent._pool.get(name)
+                if name_component is None:
+                    name_component = super().__new__(cls)
+                    singular = Inflection.get_singular(name)
+                    plural = Inflection.get_plural(name)
+                    object.__setattr__(name_component, 'name', name)
+                    object.__setattr__(name_component, 'singular_and_plural_name',
+                                       (singular, plural if plural != singular else name, name))
+                    object.__setattr__(name_component, '_key', singular)
+                    object.__setattr__(name_component, '_hash', hash(singular))
+                    NameComponent._pool[name] = name_component
+        return name_component
 
-    def __init__(self, name: str):
-        self.name = name
-        self.singular_and_plural_name = [self.__singular(name), self.__plural(name), name]
+    def __setattr__(self, key, value):
+        raise AttributeError('NameComponent is immutable')
 
-    def removesuffix(self, suffix):
-        self.name = self.name.removesuffix(suffix)
-        for value in self.singular_and_plural_name:
-            value = value.removesuffix(suffix)
+    def __reduce__(self):
+        return NameComponent, (self.name,)
 
-    def __singular(self, string: str):
-        if not string:
-            return string
-        singular = inflect.engine().singular_noun(string)
-        return singular if singular else string
+    def __copy__(self):
+        return self
 
-    def __plural(self, string: str):
-        if not string:
-            return string
-        plural = inflect.engine().plural(string)
-        return plural if plural != self.__singular(string) else string
+    def __deepcopy__(self, memo):
+        return self
+
+    def convert(self, converter: Converter) -> Any:
+        return self.name
+
+    def get_key(self) -> str:
+        return self._key
+
+    def copy(self) -> Any:
+        return self
+
+    def removesuffix(self, suffix) -> NameComponent:
+        return NameComponent(self.name.removesuffix(suffix))
 
     def strip(self):
         return self.name.strip()
@@ -42,11 +68,16 @@ class NameComponent(Component):
         return self.name
 
     def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, NameComponent):
+            return self._key == other._key
         if isinstance(other, str):
             return other in self.singular_and_plural_name
-        if not isinstance(other, NameComponent):
-            return False
-        return self.name in other.singular_and_plural_name or other.name in self.singular_and_plural_name
+        return False
+
+    def __hash__(self):
+        return self._hash
 
     def __contains__(self, item):
         return item in self.name
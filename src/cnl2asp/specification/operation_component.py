@@ -55,6 +55,8 @@ class Operators(Enum):
         return NotImplemented
 
 class OperationComponent(Component):
+    __slots__ = ('operation', 'operands', 'negated', 'auxiliary_verb')
+
     def __init__(self, operator: Operators, *operands: Component, negated = False):
         self.operation = operator
         self.operands = []
@@ -8,6 +8,8 @@ from cnl2asp.specification.proposition import Proposition
 
 
 class Problem(Component):
+    __slots__ = ('name', '_propositions')
+
     def __init__(self, name: str = None, propositions: list[Proposition] = None):
         self.name = name
         if propositions is None:
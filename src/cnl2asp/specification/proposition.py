@@ -1,6 +1,6 @@
 from enum import Enum
 
-from cnl2asp.exception.cnl2asp_exceptions import EntityNotFound, AttributeNotFound
+from cnl2asp.exception.cnl2asp_exceptions import EntityNotFound
 from cnl2asp.converter.converter_interface import Converter, NewKnowledgeConverter, ConditionConverter, \
     RequisiteConverter, \
     CardinalityConverter, PropositionConverter
@@ -18,6 +18,8 @@ class PROPOSITION_TYPE(Enum):
 
 
 class AggregateOfComponents(Component):
+    __slots__ = ('components',)
+
     def __init__(self, components: list[Component]):
         self.components = components if components else []
 
@@ -44,6 +46,8 @@ class AggregateOfComponents(Component):
 
 
 class ConditionComponent(AggregateOfComponents):
+    __slots__ = ()
+
     def __init__(self, condition: list[Component] = []):
         super().__init__(condition)
 
@@ -55,6 +59,8 @@ class ConditionComponent(AggregateOfComponents):
 
 
 class NewKnowledgeComponent(Component):
+    __slots__ = ('new_entity', 'condition', 'subject', 'auxiliary_verb', 'objects')
+
     def __init__(self, new_knowledge: EntityComponent, condition: ConditionComponent = None,
                  subject=None, auxiliary_verb=None, objects=None):
         self.new_entity = new_knowledge
@@ -82,6 +88,8 @@ class NewKnowledgeComponent(Component):
         return entities
 
 class RequisiteComponent(AggregateOfComponents):
+    __slots__ = ()
+
     def __init__(self, requisite: list[Component]):
         super().__init__(requisite)
 
@@ -93,6 +101,8 @@ class RequisiteComponent(AggregateOfComponents):
 
 
 class CardinalityComponent(Component):
+    __slots__ = ('lower_bound', 'upper_bound')
+
     def __init__(self, lower_bound: int | None, upper_bound: int | None):
         self.lower_bound = lower_bound
         self.upper_bound = upper_bound
@@ -105,6 +115,7 @@ class CardinalityComponent(Component):
 
 
 class Proposition(Component):
+    __slots__ = ('new_knowledge', 'cardinality', 'requisite', 'relations', 'defined_attributes')
     # Data structure for representing the sentences
     def __init__(self, new_knowledge: list[NewKnowledgeComponent] = None,
                  cardinality: CardinalityComponent = None, requisite: RequisiteComponent = None,
@@ -146,25 +157,22 @@ class Proposition(Component):
                     linked_entities.append(to_be_related_with.label)
                 for key in to_be_related_with.get_keys():
                     if key.value != Utility.NULL_VALUE and signature.has_attribute_value(key.value):
-                        try:
-                            new_entity.get_attributes_by_name_and_origin(key.get_name(), AttributeOrigin(signature.get_name()))[
-                                0].origin = key.origin
-                            signature.get_attributes_by_name_and_origin(key.get_name(), AttributeOrigin(signature.get_name()))[
-                                0].origin = key.origin
-                        except:
-                            pass
-                    try:
-                        signature.get_attributes_by_name_and_origin(key.get_name(), key.origin)
-                    except AttributeNotFound:
-                        try:
-                            attribute = signature.get_attributes_by_name(key.get_name())[0]
-                            if attribute.value == key.value and attribute.origin.name == signature.get_name() \
-                                    and not attribute.origin.origin:
-                                new_entity.get_attributes_by_name(key.get_name())[0].origin = key.origin
-                                attribute.origin = key.origin
-                            else:
-                                raise AttributeNotFound('')
-                        except AttributeNotFound:
+                        origin = AttributeOrigin(signature.get_name())
+                        new_entity_attributes = new_entity.find_attributes_by_name_and_origin(key.get_name(), origin)
+                        if new_entity_attributes:
+                            new_entity_attributes[0].origin = key.origin
+                            signature_attributes = signature.find_attributes_by_name_and_origin(key.get_name(), origin)
+                            if signature_attributes:
+                                signature_attributes[0].origin = key.origin
+                    if not signature.find_attributes_by_name_and_origin(key.get_name(), key.origin):
+                        signature_attributes = signature.find_attributes_by_name(key.get_name())
+                        new_entity_attributes = new_entity.find_attributes_by_name(key.get_name())
+                        attribute = signature_attributes[0] if signature_attributes else None
+                        if attribute and attribute.value == key.value and attribute.origin.name == signature.get_name() \
+                                and not attribute.origin.origin and new_entity_attributes:
+                            new_entity_attributes[0].origin = key.origin
+                            attribute.origin = key.origin
+                        else:
                             signature.attributes.append(AttributeComponent(key.get_name(), ValueComponent(Utility.NULL_VALUE),
                                                                            AttributeOrigin(to_be_related_with.get_name(),
                                                                                            key.origin)))
@@ -214,12 +222,34 @@ class Proposition(Component):
             return Proposition(new_knowledge, cardinality, requisite, relations, defined_attributes)
 
 
+class FactsProposition(Proposition):
+    """
+    Facts about entities with constant values, defined together as in "A color is one of red, green, blue".
+    Each entity is a new knowledge of the proposition, and it is converted into a fact on its own.
+    """
+    __slots__ = ()
+
+    def __init__(self, facts: list[EntityComponent]):
+        super().__init__([NewKnowledgeComponent(fact) for fact in facts])
+
+    def convert(self, converter: Converter) -> PropositionConverter:
+        return converter.convert_facts_proposition(self)
+
+    def get_facts(self) -> list[EntityComponent]:
+        return [new_knowledge.new_entity for new_knowledge in self.new_knowledge]
+
+    def copy(self):
+        return FactsProposition([fact.copy() for fact in self.get_facts()])
+
+
 class PREFERENCE_PROPOSITION_TYPE(Enum):
     MINIMIZATION = 0
     MAXIMIZATION = 1
 
 
 class PreferenceProposition(Proposition):
+    __slots__ = ('weight', 'level', 'discriminant', 'type')
+
     def __init__(self, requisite: RequisiteComponent = None, relations: list[RelationComponent] = None,
                  weight: str = '1', level: int = 1,
                  discriminant: list[AttributeComponent] = None):
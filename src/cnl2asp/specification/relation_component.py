@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 
 
 class RelationComponent(Component):
+    __slots__ = ('relation_component_1', 'relation_component_2')
+
     def __init__(self, entity_1: EntityComponent, entity_2: EntityComponent):
         self.relation_component_1 = entity_1
         self.relation_component_2 = entity_2
@@ -7,14 +7,97 @@ from cnl2asp.utility.utility import Utility
 from cnl2asp.exception.cnl2asp_exceptions import EntityNotFound, DuplicatedTypedEntity
 from cnl2asp.specification.attribute_component import ValueComponent
 from cnl2asp.specification.entity_component import EntityType
-from cnl2asp.utility.utility import Utility
+from cnl2asp.specification.name_component import NameComponent
+from cnl2asp.utility.compilation_context import CompilationContext
+from cnl2asp.utility.inflection import Inflection
 
 if TYPE_CHECKING:
+    from cnl2asp.specification.attribute_component import AttributeComponent
     from cnl2asp.specification.entity_component import EntityComponent
 
 
-class SignatureManager:
-    signatures: list[EntityComponent] = []
+class _SignatureIndex:
+    def __init__(self, signatures: list[EntityComponent]):
+        self.signatures = signatures
+        self.indexed_count = 0
+        self.names: dict[str, tuple[int, EntityComponent]] = {}
+        self.complex_identifiers: dict[str, tuple[int, EntityComponent]] = {}
+        self.complex_keys: dict[str, tuple[int, EntityComponent]] = {}
+        self.types: dict[EntityType, EntityComponent] = {}
+        self.attributes: dict[str, list[EntityComponent]] = {}  # attribute name -> signatures with that attribute
+
+    def update(self):
+        for position in range(self.indexed_count, len(self.signatures)):
+            signature = self.signatures[position]
+            identifier = signature.get_entity_identifier()
+            if isinstance(identifier, NameComponent):
+                self.names.setdefault(identifier.get_key(), (position, signature))
+            elif identifier is not None:
+                self.complex_identifiers.setdefault(str(identifier), (position, signature))
+                self.complex_keys.setdefault(Inflection.get_singular(str(identifier)), (position, signature))
+            self.types.setdefault(signature.entity_type, signature)
+            self.index_attributes(signature, signature.get_keys_and_attributes())
+        self.indexed_count = len(self.signatures)
+
+    def index_attributes(self, signature: EntityComponent, attributes: list[AttributeComponent]):
+        for attribute in attributes:
+            signatures = self.attributes.setdefault(Inflection.get_singular(attribute.get_name()), [])
+            if not signatures or signatures[-1] is not signature:
+                signatures.append(signature)
+
+
+class SignatureView:
+    """
+    Read-only view of a declared signature, to read its attributes without copying them.
+    """
+    __slots__ = ('_signature',)
+
+    def __init__(self, signature: EntityComponent):
+        self._signature = signature
+
+    @property
+    def entity_type(self) -> EntityType:
+        return self._signature.entity_type
+
+    def get_name(self) -> str:
+        return self._signature.get_name()
+
+    def get_entity_identifier(self):
+        return self._signature.get_entity_identifier()
+
+    def get_keys(self) -> tuple[AttributeComponent, ...]:
+        return tuple(self._signature.get_keys())
+
+    def get_attributes(self) -> tuple[AttributeComponent, ...]:
+        return tuple(self._signature.get_attributes())
+
+    def get_keys_and_attributes(self) -> tuple[AttributeComponent, ...]:
+        return tuple(self._signature.get_keys_and_attributes())
+
+    def copy(self) -> EntityComponent:
+        return self._signature.copy_on_write()
+
+
+class _SignatureManagerType(type):
+    # the signatures belong to the active compilation context
+
+    @property
+    def signatures(cls) -> list[EntityComponent]:
+        return CompilationContext.get_current().signatures
+
+    @signatures.setter
+    def signatures(cls, signatures: list[EntityComponent]):
+        CompilationContext.get_current().signatures = signatures
+
+
+class SignatureManager(metaclass=_SignatureManagerType):
+    """
+    Signatures of the declared entities in the active compilation context.
+
+    Signatures are indexed by the singular form of their name, by entity type and by the names of their
+    attributes, so that lookups do not scan the signatures. The indexes follow the signatures list,
+    and are rebuilt when the list is replaced.
+    """
 
     def __init__(self):
         pass
@@ -28,44 +111,84 @@ class SignatureManager:
         entity.is_after = False
         entity.is_before = False
 
+    @staticmethod
+    def _get_index() -> _SignatureIndex:
+        context = CompilationContext.get_current()
+        index: _SignatureIndex = context.signature_index
+        if index is None or index.signatures is not context.signatures or index.indexed_count > len(index.signatures):
+            index = _SignatureIndex(context.signatures)
+            context.signature_index = index
+        index.update()
+        return index
+
     @staticmethod
     def add_signature(entity: EntityComponent):
-        try:
-            SignatureManager.clone_signature(entity.get_name())
-        except:
-            entity = entity.copy()
-            # Update previous declared signatures
-            for signature in SignatureManager.signatures:
-                try:
-                    attributes = signature.get_attributes_by_name(entity.get_name())
-                    for attribute in attributes:
-                        signature.attributes.remove(attribute)
-                    signature.attributes += entity.get_keys()
-                except:
-                    pass
-            SignatureManager.set_entity_to_null(entity)
-            SignatureManager.signatures.append(entity)
+        if SignatureManager.has_signature(entity.get_name()):
+            return
+        index = SignatureManager._get_index()
+        entity = entity.copy()
+        # Update previous declared signatures
+        for signature in list(index.attributes.get(Inflection.get_singular(entity.get_name()), [])):
+            attributes = signature.find_attributes_by_name(entity.get_name())
+            if not attributes or any(key is attribute for key in signature.keys for attribute in attributes):
+                continue  # keys are not replaced
+            # the attributes are replaced and not modified in place, as they are shared by the copies on write
+            signature_attributes = list(signature.attributes)
+            for attribute in attributes:
+                signature_attributes.remove(attribute)
+            signature.attributes = signature_attributes + list(entity.get_keys())
+            index.index_attributes(signature, entity.get_keys())
+        SignatureManager.set_entity_to_null(entity)
+        index.signatures.append(entity)
+
+    @staticmethod
+    def find_signature(signature_identifier: str | NameComponent) -> EntityComponent | None:
+        """
+        Return the signature with the given identifier, or None if it has not been declared.
+        The signature is returned without copying it, it must not be modified.
+        """
+        index = SignatureManager._get_index()
+        if isinstance(signature_identifier, NameComponent):
+            found = index.names.get(signature_identifier.get_key())
+            complex_entity = index.complex_keys.get(signature_identifier.get_key())
+        else:
+            found = index.names.get(Inflection.get_singular(str(signature_identifier)))
+            complex_entity = index.complex_identifiers.get(str(signature_identifier))
+        if complex_entity and (not found or complex_entity[0] < found[0]):
+            found = complex_entity
+        return found[1] if found else None
+
+    @staticmethod
+    def has_signature(signature_identifier: str | NameComponent) -> bool:
+        return SignatureManager.find_signature(signature_identifier) is not None
 
     @staticmethod
     def clone_signature(signature_identifier: str) -> EntityComponent:
-        return SignatureManager.get_signature(signature_identifier).copy()
+        """
+        Return a copy of the signature. The attributes are copied when first accessed,
+        so a copy that is only read does not copy them.
+        """
+        return SignatureManager.get_signature(signature_identifier).copy_on_write()
+
+    @staticmethod
+    def get_signature_view(signature_identifier: str) -> SignatureView:
+        return SignatureView(SignatureManager.get_signature(signature_identifier))
 
     @staticmethod
     def get_signature(signature_identifier: str):
-        for signature in SignatureManager.signatures:
-            if signature.get_entity_identifier() == signature_identifier:
-                return signature
-        raise EntityNotFound(f'Entity "{signature_identifier}" not declared before its usage.')
+        signature = SignatureManager.find_signature(signature_identifier)
+        if signature is None:
+            raise EntityNotFound(f'Entity "{signature_identifier}" not declared before its usage.')
+        return signature
 
     @staticmethod
     def is_temporal_entity(name: str) -> bool:
-        try:
-            entity = SignatureManager.clone_signature(name)
-            if entity.entity_type == EntityType.DATE or entity.entity_type == EntityType.TIME or entity.entity_type == EntityType.STEP:
-                return True
-        except EntityNotFound:
-            pass
-        return False
+        entity = SignatureManager.find_signature(name)
+        return entity is not None and entity.entity_type in (EntityType.DATE, EntityType.TIME, EntityType.STEP)
+
+    @staticmethod
+    def find_signature_from_type(entity_type: EntityType) -> EntityComponent | None:
+        return SignatureManager._get_index().types.get(entity_type)
 
     @staticmethod
     def get_signature_from_type(entity_type: str) -> EntityComponent:
@@ -74,10 +197,10 @@ class SignatureManager:
         :param entity_type:
         :return:
         """
-        for entity in SignatureManager.signatures:
-            if entity.entity_type == entity_type:
-                return entity.copy()
-        raise EntityNotFound(f"Typed entity with type {entity_type} not defined.")
+        entity = SignatureManager.find_signature_from_type(entity_type)
+        if entity is None:
+            raise EntityNotFound(f"Typed entity with type {entity_type} not defined.")
+        return entity.copy()
 
     @staticmethod
     def get_entity_from_value(value: ValueComponent):
@@ -97,7 +220,7 @@ class SignatureManager:
             entity_type = EntityType.DATE
         except:
             pass
-        for entity in SignatureManager.signatures:
-            if entity.entity_type == entity_type:
-                return entity
-        raise EntityNotFound(f"No entity found with same type of {value}")
+        entity = SignatureManager.find_signature_from_type(entity_type)
+        if entity is None:
+            raise EntityNotFound(f"No entity found with same type of {value}")
+        return entity
@@ -8,6 +8,8 @@ from cnl2asp.specification.problem import Problem
 
 
 class SpecificationComponent(Component):
+    __slots__ = ('_problems', '_constants')
+
     def __init__(self, problems: list[Problem] = None, constants: list[ConstantComponent] = None):
         if problems is None:
             problems = []
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import os
+import tempfile
+
+from cnl2asp.parser.grammar_cache import GrammarCache
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+def package_version(package: str) -> str:
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+class CompilationCache:
+    """
+    Content-addressed cache of the compilation results in a directory, that can be shared by more processes.
+
+    Results are stored with the hash of the input, of the grammar, of the version of cnl2asp and of the options
+    of the compilation, so that changing any of them never returns a stale result. Results are text, e.g. the code
+    or the JSON of the symbols, preceded by their hash: reading a file never runs code, and corrupted files are
+    ignored. Anyone who can write the directory can still change the results, so it must be trusted.
+    Files are written to a temporary file and renamed, so that readers never see a partial file. When the size of
+    the cached files exceeds max_size, the least recently used ones are removed. The size is estimated from the
+    files written by this instance, and the directory is scanned only when the estimate exceeds max_size.
+    """
+    _PREFIX = 'compilation_'
+    _SUFFIX = '.txt'
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self._size: int | None = None  # estimated size of the cached files, None if not computed yet
+
+    @staticmethod
+    def get_key(kind: str, text: str, **options) -> str:
+        """
+        :param kind: the kind of result, e.g. the code or the symbols of the input.
+        :param text: the input of the computation.
+        :param options: the options that change the result, with a deterministic repr.
+        """
+        options_string = ','.join(f'{name}={options[name]!r}' for name in sorted(options))
+        key = '\n'.join([kind, options_string, GrammarCache.get_grammar(), package_version('cnl2asp'), text])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        cache_file = self._cache_file(key)
+        try:
+            with open(cache_file, 'rb') as file:
+                digest, _, value = file.read().partition(b'\n')
+            if digest.decode('ascii') == hashlib.sha256(value).hexdigest():
+                os.utime(cache_file)  # most recently used
+                return value.decode('utf-8')
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # unreadable cache file, the result is computed again and the file replaced
+            pass
+        return None
+
+    def put(self, key: str, value: str):
+        try:
+            content = value.encode('utf-8')
+            content = hashlib.sha256(content).hexdigest().encode('ascii') + b'\n' + content
+            os.makedirs(self.directory, exist_ok=True)
+            file_descriptor, tmp_file = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(file_descriptor, 'wb') as file:
+                    file.write(content)
+                os.replace(tmp_file, self._cache_file(key))
+            except Exception:
+                os.remove(tmp_file)
+                raise
+            if self._size is None:
+                self._size = sum(entry_size for _, _, entry_size in self._entries())
+            else:
+                self._size += len(content)
+            if self._size > self.max_size:
+                self._evict()
+        except Exception:
+            # the cache is an optimization, failing to write it is not an error
+            pass
+
+    def clear(self):
+        for cache_file, _, _ in self._entries():
+            try:
+                os.remove(cache_file)
+            except FileNotFoundError:
+                pass
+        self._size = None
+
+    def _cache_file(self, key: str) -> str:
+        return os.path.join(self.directory, f'{CompilationCache._PREFIX}{key}{CompilationCache._SUFFIX}')
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        """
+        Return the path, the time of the last usage and the size of each cached file.
+        """
+        entries = []
+        try:
+            with os.scandir(self.directory) as directory:
+                for entry in directory:
+                    if entry.name.startswith(CompilationCache._PREFIX) \
+                            and entry.name.endswith(CompilationCache._SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue  # removed by another process
+                        entries.append((entry.path, stat.st_mtime, stat.st_size))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        size = sum(entry_size for _, _, entry_size in entries)
+        if size > self.max_size:
+            for cache_file, _, entry_size in sorted(entries, key=lambda entry: entry[1]):
+                try:
+                    os.remove(cache_file)
+                except FileNotFoundError:
+                    pass  # already removed by another process
+                size -= entry_size
+                if size <= self.max_size:
+                    break
+        self._size = size
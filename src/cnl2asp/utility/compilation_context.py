@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from cnl2asp.specification.entity_component import EntityComponent
+
+
+class CompilationContext:
+    """
+    State of a compilation: the signatures of the declared entities and the compilation options.
+
+    The context is activated while compiling, and SignatureManager and the options of Utility refer to
+    the active context. Compilations with different contexts can run at the same time in different threads.
+    When no context is active, a default context shared by the process is used.
+
+    With pool_substitutions, "where X is one of a, b, c" is compiled in a single rule with the
+    pool X = (a;b;c) instead of a copy of the rule for each value, whenever the two are equivalent.
+    With pool_facts, "A color is one of red, green, blue" is compiled in the single fact color("red";"green";"blue").
+    With compact_temporal_facts, the values of a temporal concept whose labels, e.g. "07:30 AM", are not used
+    by the program are defined by a single rule over the interval of their positions.
+    With remove_duplicate_rules, a rule is printed only once in each program, even if more propositions produce it.
+    """
+
+    def __init__(self, print_with_functions: bool = False, auto_entity_link: bool = True,
+                 pool_substitutions: bool = False, pool_facts: bool = False, compact_temporal_facts: bool = False,
+                 remove_duplicate_rules: bool = False):
+        self.signatures: list[EntityComponent] = []
+        self.signature_index: Any = None  # maintained by SignatureManager
+        self.print_with_functions = print_with_functions
+        self.auto_entity_link = auto_entity_link
+        self.pool_substitutions = pool_substitutions
+        self.pool_facts = pool_facts
+        self.compact_temporal_facts = compact_temporal_facts
+        self.remove_duplicate_rules = remove_duplicate_rules
+
+    @staticmethod
+    def get_current() -> CompilationContext:
+        return _current_context.get(_default_context)
+
+    @contextmanager
+    def activate(self) -> Iterator[CompilationContext]:
+        token = _current_context.set(self)
+        try:
+            yield self
+        finally:
+            _current_context.reset(token)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # copies of the transformation state keep referring to the same compilation
+        return self
+
+
+_default_context = CompilationContext()
+_current_context: ContextVar[CompilationContext] = ContextVar('compilation_context')
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import inflect
+
+CACHE_SIZE = 4096
+
+_engine = inflect.engine()
+_lexicon_plurals: dict[str, str] = {}  # singular -> plural
+_lexicon_singulars: dict[str, str] = {}  # plural -> singular
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _singular(word: str) -> str:
+    if word in _lexicon_singulars:
+        return _lexicon_singulars[word]
+    if word in _lexicon_plurals:
+        return word
+    singular = _engine.singular_noun(word)
+    return singular if singular else word
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _plural(word: str) -> str:
+    if word in _lexicon_plurals:
+        return _lexicon_plurals[word]
+    return _engine.plural(word)
+
+
+class Inflection:
+    """
+    Singular and plural forms of the nouns, computed with a single inflect engine and memoized
+    in a bounded LRU cache. The words of the lexicon, if loaded, are not inflected by the engine.
+    """
+
+    @staticmethod
+    def get_singular(word: str) -> str:
+        """
+        Return the singular form of the word, or the word itself if it is already singular.
+        """
+        if not word:
+            return word
+        return _singular(word)
+
+    @staticmethod
+    def get_plural(word: str) -> str:
+        if not word:
+            return word
+        return _plural(word)
+
+    @staticmethod
+    def load_lexicon(lexicon: dict[str, str]):
+        """
+        Load the lexicon before compiling, the names already created keep their forms.
+        :param lexicon: the plural form of the domain words, e.g. {'nurse': 'nurses'}.
+        """
+        for singular, plural in lexicon.items():
+            _lexicon_plurals[singular] = plural
+            _lexicon_singulars[plural] = singular
+        Inflection.clear_cache()
+
+    @staticmethod
+    def clear_lexicon():
+        _lexicon_plurals.clear()
+        _lexicon_singulars.clear()
+        Inflection.clear_cache()
+
+    @staticmethod
+    def clear_cache():
+        _singular.cache_clear()
+        _plural.cache_clear()
@@ -1,22 +1,79 @@
-from uuid import uuid4
-import inflect
+import hashlib
 
-class Utility:
+from cnl2asp.utility.compilation_context import CompilationContext
+from cnl2asp.utility.inflection import Inflection
+
+
+class _UtilityType(type):
+    # the options belong to the active compilation context
+
+    @property
+    def PRINT_WITH_FUNCTIONS(cls) -> bool:
+        return CompilationContext.get_current().print_with_functions
+
+    @PRINT_WITH_FUNCTIONS.setter
+    def PRINT_WITH_FUNCTIONS(cls, value: bool):
+        CompilationContext.get_current().print_with_functions = value
+
+    @property
+    def AUTO_ENTITY_LINK(cls) -> bool:
+        return CompilationContext.get_current().auto_entity_link
+
+    @AUTO_ENTITY_LINK.setter
+    def AUTO_ENTITY_LINK(cls, value: bool):
+        CompilationContext.get_current().auto_entity_link = value
+
+    @property
+    def POOL_SUBSTITUTIONS(cls) -> bool:
+        return CompilationContext.get_current().pool_substitutions
+
+    @POOL_SUBSTITUTIONS.setter
+    def POOL_SUBSTITUTIONS(cls, value: bool):
+        CompilationContext.get_current().pool_substitutions = value
+
+    @property
+    def POOL_FACTS(cls) -> bool:
+        return CompilationContext.get_current().pool_facts
+
+    @POOL_FACTS.setter
+    def POOL_FACTS(cls, value: bool):
+        CompilationContext.get_current().pool_facts = value
+
+    @property
+    def COMPACT_TEMPORAL_FACTS(cls) -> bool:
+        return CompilationContext.get_current().compact_temporal_facts
+
+    @COMPACT_TEMPORAL_FACTS.setter
+    def COMPACT_TEMPORAL_FACTS(cls, value: bool):
+        CompilationContext.get_current().compact_temporal_facts = value
+
+    @property
+    def REMOVE_DUPLICATE_RULES(cls) -> bool:
+        return CompilationContext.get_current().remove_duplicate_rules
+
+    @REMOVE_DUPLICATE_RULES.setter
+    def REMOVE_DUPLICATE_RULES(cls, value: bool):
+        CompilationContext.get_current().remove_duplicate_rules = value
+
+
+class Utility(metaclass=_UtilityType):
     NULL_VALUE = '_'
     ASP_NULL_VALUE = '_'
-    PRINT_WITH_FUNCTIONS = False
     DEFAULT_ATTRIBUTE = 'id'
     LOCKED_KEYWORDS = ["is", "identified", "and", "equal", "to", "are", "has", "be", "have", "by", "with", "in",
                        "exactly", "at", "most", "least", "any", "every", "more", "less", "greater", "after", "highest",
                        "lowest", "smallest", "biggest", "sum", "difference", "product", "division", "where", "between",
                        "whenever", "such", "that", "there", "than", "also", "then", "required", "prohibited", "or"]
-    AUTO_ENTITY_LINK = True
 
     @staticmethod
-    def create_unique_identifier():
-        return 'x_' + str(uuid4()).replace('-', '_')
+    def create_unique_identifier(seed: str) -> str:
+        """
+        Return an identifier derived from the hash of the seed, formatted as x_ followed by a uuid.
+        The same seed always gives the same identifier, so that the same input is compiled in the same code.
+        """
+        digest = hashlib.sha256(seed.encode('utf-8')).hexdigest()
+        return f'x_{digest[:8]}_{digest[8:12]}_{digest[12:16]}_{digest[16:20]}_{digest[20:32]}'
 
     @staticmethod
     def get_singular(string: str) -> str:
-        singular = inflect.engine().singular_noun(string)
-        return singular if singular else string
\ No newline at end of file
+        return Inflection.get_singular(string)
\ No newline at end of file
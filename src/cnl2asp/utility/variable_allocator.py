@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+CACHE_SIZE = 4096
+
+_VOWELS = str.maketrans('', '', 'AEIOUaeiou')
+_TRAILING_NUMBER = re.compile(r'\d+$')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _variable_name(name: str) -> str:
+    return name.translate(_VOWELS).upper()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _split_trailing_number(variable: str) -> tuple[str, int]:
+    match = _TRAILING_NUMBER.search(variable)
+    if match is None:
+        return variable, 1
+    return variable[:match.start()], int(match.group()) + 1
+
+
+class VariableAllocator:
+    """
+    Names of the variables used in a rule, and allocation of fresh ones.
+
+    A fresh variable for the name "nurse_id" is NRS_D, without vowels and in upper case. If it is already used,
+    a number is added or the trailing number is incremented: NRS_D1, NRS_D2, ... The next number to try is kept
+    for each variable, so that allocating many variables with the same name does not test the same numbers again.
+    """
+
+    def __init__(self, used: Iterable[str] = ()):
+        self._used: dict[str, None] = dict.fromkeys(used)  # ordered set, for a deterministic iteration
+        self._next_number: dict[str, int] = {}
+
+    def add(self, variable: str):
+        self._used[variable] = None
+
+    def update(self, variables: Iterable[str]):
+        self._used.update(dict.fromkeys(variables))
+
+    def new_variable(self, name: str) -> str:
+        variable = _variable_name(name)
+        if variable in self._used:
+            prefix, number = _split_trailing_number(variable)
+            number = self._next_number.get(variable, number)
+            while f'{prefix}{number}' in self._used:
+                number += 1
+            self._next_number[variable] = number + 1
+            variable = f'{prefix}{number}'
+        self._used[variable] = None
+        return variable
+
+    def copy(self) -> VariableAllocator:
+        allocator = VariableAllocator(self._used)
+        allocator._next_number = self._next_number.copy()
+        return allocator
+
+    def __contains__(self, variable: str) -> bool:
+        return variable in self._used
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._used)
+
+    def __len__(self) -> int:
+        return len(self._used)
@@ -8,7 +8,7 @@ from cnl2asp.specification.aggregate_component import AggregateComponent, Aggreg
 from cnl2asp.specification.problem import Problem
 from cnl2asp.specification.proposition import Proposition, RequisiteComponent
 from cnl2asp.specification.signaturemanager import SignatureManager
-from cnl2asp.converter.asp_converter import ASPConverter
+from cnl2asp.converter.asp_converter import ASPConverter, EntityToAtom
 from cnl2asp.specification.attribute_component import AttributeComponent, AttributeOrigin
 from cnl2asp.specification.entity_component import EntityComponent
 from cnl2asp.specification.relation_component import RelationComponent
@@ -69,6 +69,29 @@ class TestASPConverter(unittest.TestCase):
         self.assertEqual(str(atom_1), 'entity_1(NTTY_2_FLD1)')
         self.assertEqual(str(atom_2), 'entity_2(NTTY_2_FLD1,_)')
 
+    def test_entity_to_atom_lookup(self):
+        entity = EntityComponent('tests', '', [AttributeComponent('key', ValueComponent('KEY'))], [])
+        copy = EntityComponent('tests', '', [AttributeComponent('key', ValueComponent('KEY'))], [])
+        other = EntityComponent('tests', '', [AttributeComponent('key', ValueComponent('OTHER'))], [])
+        atoms = EntityToAtom()
+        self.assertIsNone(atoms.get_atom(entity))
+        first, last = ASPAtom('tests', []), ASPAtom('tests', [])
+        atoms.add(copy, first)
+        self.assertIs(atoms.get_atom(entity), first)
+        atoms.add(copy.copy(), last)
+        self.assertIs(atoms.get_atom(entity), last)
+        self.assertIs(atoms.get_atom(copy), first)
+        self.assertIsNone(atoms.get_atom(other))
+
+    def test_entity_to_atom_lookup_of_modified_entities(self):
+        entity = EntityComponent('tests', '', [AttributeComponent('key', ValueComponent('KEY'))], [])
+        atoms = EntityToAtom()
+        atom = ASPAtom('tests', [])
+        atoms.add(entity, atom)
+        entity.label = 'L'
+        self.assertIs(atoms.get_atom(entity), atom)
+        self.assertIs(atoms.get_atom(entity.copy()), atom)
+
     def test_multiple_problems(self):
         entity = EntityComponent('entity', '', [], [
             AttributeComponent('field', ValueComponent('FIELD'), AttributeOrigin('entity'))])
@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from cnl2asp.ASP_elements.asp_aggregate import ASPAggregate
@@ -7,10 +8,11 @@ from cnl2asp.ASP_elements.asp_conjunction import ASPConjunction
 from cnl2asp.ASP_elements.asp_encoding import ASPEncoding
 from cnl2asp.ASP_elements.asp_operation import ASPOperation, ASPTemporalOperation
 from cnl2asp.ASP_elements.asp_program import ASPProgram
-from cnl2asp.ASP_elements.asp_rule import ASPRule, ASPRuleHead, ASPWeakConstraint
+from cnl2asp.ASP_elements.asp_rule import ASPRule, ASPRuleHead, ASPWeakConstraint, ASPFacts, ASPTemporalFacts
 from cnl2asp.ASP_elements.asp_temporal_formula import ASPTemporalFormula
 from cnl2asp.specification.aggregate_component import AggregateOperation
-from cnl2asp.specification.attribute_component import AttributeOrigin
+from cnl2asp.specification.attribute_component import AttributeOrigin, ValueComponent
+from cnl2asp.specification.entity_component import EntityType, TemporalRange
 from cnl2asp.specification.operation_component import Operators
 
 from cnl2asp.ASP_elements.asp_attribute import ASPValue
@@ -84,6 +86,21 @@ class TestASPElements(unittest.TestCase):
                          ':- body(FIELD), body2(FIELD).\n',
                          'Incorrect constraint print.')
 
+    def test_duplicates_removal(self):
+        repeated = ASPAtom('body', [ASPAttribute('field', ASPValue('FIELD'))])
+        operation = ASPOperation(Operators.EQUALITY, ASPValue('FIELD'), ASPValue('1'))
+        body = ASPConjunction([ASPAtom('body', [ASPAttribute('field', ASPValue('FIELD'))]), repeated, operation,
+                               ASPAtom('body2', [ASPAttribute('field', ASPValue('FIELD'))]), operation,
+                               ASPAtom('body2', [ASPAttribute('field', ASPValue('FIELD'))]), repeated])
+        condition = ASPConjunction([ASPAtom('body2', [ASPAttribute('field', ASPValue('FIELD'))]),
+                                    ASPAtom('condition', [ASPAttribute('field', ASPValue('FIELD'))])])
+        rule = ASPRule(body, [ASPRuleHead(ASPAtom('head', [ASPAttribute('field', ASPValue('FIELD'))]), condition)])
+        # equal atoms are removed keeping the last one, the same atom or operation repeated is kept
+        self.assertEqual(str(rule), 'head(FIELD): condition(FIELD) :- '
+                                    'body(FIELD), FIELD = 1, FIELD = 1, body2(FIELD), body(FIELD).\n')
+        self.assertIs(body.conjunction[0], repeated)
+        self.assertEqual(hash(rule), hash(ASPRule(ASPConjunction(list(body.conjunction)), list(rule.head))))
+
     def test_program_to_string(self):
         condition = ASPConjunction([ASPAtom('condition', [ASPAttribute('field', ASPValue('FIELD'))]),
                                     ASPAtom('condition2', [ASPAttribute('field', ASPValue('FIELD'))])])
@@ -181,5 +198,38 @@ class TestASPElements(unittest.TestCase):
         encoding.add_program(program_dynamic)
         self.assertEqual(str(encoding).strip(), '''#program base.\n:- atom(FIELD).\n\n#program dynamic.\n:- atom(FIELD).''')
 
+    def test_write_to_stream(self):
+        atom = ASPAtom('atom', [ASPAttribute('field', ASPValue('FIELD'))])
+        temporal_formula = ASPTemporalFormula([ASPTemporalOperation(Operators.PREVIOUS, atom)])
+        encoding = ASPEncoding()
+        program = ASPProgram('base')
+        program.add_rule(ASPRule(ASPConjunction([atom, temporal_formula]), [ASPRuleHead(atom)]))
+        program.add_rule(ASPWeakConstraint(ASPConjunction([atom]), '1', 2, [atom.attributes[0]] * 2))
+        encoding.add_program(program)
+        encoding.add_program(ASPProgram('empty'))
+        stream = io.StringIO()
+        encoding.write_to(stream)
+        self.assertEqual(stream.getvalue(), '#program base.\n'
+                                            'atom(FIELD) :- atom(FIELD),not not &tel {< atom(FIELD)}.\n'
+                                            ':~ atom(FIELD). [1@2,FIELD]\n\n'
+                                            '#program empty.\n')
+        self.assertEqual(str(encoding), stream.getvalue())
+        stream = io.StringIO()
+        ASPEncoding().write_to(stream)
+        self.assertEqual(stream.getvalue(), '\n')
+
+    def test_facts(self):
+        facts = [ASPAtom('color', [ASPAttribute('id', ASPValue(f'"{color}"'))]) for color in ['red', 'green']]
+        self.assertEqual(str(ASPFacts(facts, pooled=True)), 'color("red";"green").\n')
+        self.assertEqual(hash(ASPFacts(facts)), hash(ASPFacts(list(facts))))
+        values = TemporalRange.from_bounds(EntityType.STEP, ValueComponent('1'), ValueComponent('3'), ValueComponent('1'))
+        temporal_facts = ASPTemporalFacts('step', values)
+        self.assertEqual(str(temporal_facts), 'step(0,"1").\nstep(1,"2").\nstep(2,"3").\n')
+        same_values = TemporalRange(EntityType.STEP, 1, 1, 3)
+        self.assertEqual(temporal_facts, ASPTemporalFacts('step', same_values))
+        self.assertEqual(hash(temporal_facts), hash(ASPTemporalFacts('step', same_values)))
+        self.assertEqual(str(ASPTemporalFacts('step', values, labelled=False)), 'step(0..2,unlabelled).\n')
+        self.assertNotEqual(temporal_facts, ASPTemporalFacts('step', same_values, labelled=False))
+
 if __name__ == '__main__':
     unittest.main()
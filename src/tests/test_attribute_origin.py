@@ -0,0 +1,37 @@
+import copy
+import pickle
+import unittest
+
+from cnl2asp.specification.attribute_component import AttributeOrigin, is_same_origin
+
+
+class TestAttributeOrigin(unittest.TestCase):
+
+    def test_origins_are_interned(self):
+        origin = AttributeOrigin('shift', AttributeOrigin('nurse works'))
+        self.assertIs(origin, AttributeOrigin('shift', AttributeOrigin('nurse works')))
+        self.assertIs(origin, copy.deepcopy(origin))
+        self.assertIs(origin, pickle.loads(pickle.dumps(origin)))
+        self.assertEqual(str(origin), 'shift nurse works')
+        with self.assertRaises(AttributeError):
+            origin.origin = None
+
+    def test_equality_uses_singular_names(self):
+        self.assertEqual(AttributeOrigin('shifts', AttributeOrigin('nurse')),
+                         AttributeOrigin('shift', AttributeOrigin('nurses')))
+        self.assertEqual(hash(AttributeOrigin('shifts')), hash(AttributeOrigin('shift')))
+        self.assertNotEqual(AttributeOrigin('shift', AttributeOrigin('nurse')), AttributeOrigin('shift'))
+        self.assertEqual(AttributeOrigin('shift', AttributeOrigin('shift')), AttributeOrigin('shift'))
+
+    def test_same_origin(self):
+        shift = AttributeOrigin('shift')
+        nested = AttributeOrigin('nurse', shift)
+        self.assertTrue(is_same_origin(shift, nested))
+        self.assertTrue(is_same_origin(nested, shift))
+        self.assertFalse(is_same_origin(AttributeOrigin('day'), nested))
+        self.assertFalse(is_same_origin(shift, None))
+        self.assertTrue(is_same_origin(None, None))
+
+    def test_angle_origin(self):
+        self.assertTrue(AttributeOrigin('position', AttributeOrigin('angle')).is_angle())
+        self.assertFalse(AttributeOrigin('position').is_angle())
@@ -30,9 +30,9 @@ class TestCnlPropositions(unittest.TestCase):
         asp = self.compute_asp(input_string)
         self.assertEqual(asp.strip(), expected_output)
 
-    @patch('cnl2asp.utility.utility.uuid4')
-    def test_cts(self, mock_uuid):
-        mock_uuid.return_value = 'support'
+    @patch('cnl2asp.utility.utility.Utility.create_unique_identifier')
+    def test_cts(self, mock_identifier):
+        mock_identifier.return_value = 'x_support'
         self.check_input_to_output('''A timeslot is a temporal concept expressed in minutes ranging from 07:30 AM to 01:30 PM with a length of 10 minutes.
 A day is a temporal concept expressed in days ranging from 01/01/2022 to 07/01/2022.
 A patient is identified by an id, and has a preference.
@@ -9,6 +9,7 @@ from cnl2asp.ASP_elements.asp_program import ASPProgram
 from cnl2asp.converter.asp_converter import ASPConverter
 from cnl2asp.parser.parser import CNLTransformer
 from cnl2asp.specification.signaturemanager import SignatureManager
+from cnl2asp.utility.compilation_context import CompilationContext
 
 cnl_parser = Lark(open(os.path.join(os.path.dirname(__file__), "..", "cnl2asp", "grammar.lark"), "r").read())
 
@@ -93,6 +94,18 @@ class TestCnlPropositions(unittest.TestCase):
                                     Waiter W works in pub P.''',
                                    'work_in(W,P) :- waiter(W), pub(P).')
 
+    def test_pooled_variable_substitution(self):
+        context = CompilationContext(pool_substitutions=True)
+        problem = CNLTransformer(context).transform(cnl_parser.parse('''
+                                    A node goes from 1 to 5.
+                                    Node 1 is connected to node X, where X is one of 2, 3.
+                                    It is required that the number of nodes that are connected to node X is equal to 1, where X is one of 2, 3.'''))
+        self.assertEqual(str(problem.convert(ASPConverter(context))).strip(),
+                         'node(1..5).\n'
+                         'connected_to(1,X) :- node(1), node(X), X = (2;3).\n'
+                         ':- #count{X: connected_to(X,_), node(X), X = 2} != 1.\n'
+                         ':- #count{X: connected_to(X,_), node(X), X = 3} != 1.')
+
     def test_compounded_clause_definition(self):
         self.check_input_to_output('A day goes from 1 to 365.', 'day(1..365).')
 
@@ -105,6 +118,29 @@ class TestCnlPropositions(unittest.TestCase):
             'A drink is one of alcoholic, nonalcoholic and has color that is equal to respectively blue, yellow.',
             'drink("alcoholic","blue").\ndrink("nonalcoholic","yellow").')
 
+    def test_pooled_compounded_clause_match(self):
+        context = CompilationContext(pool_facts=True)
+        problem = CNLTransformer(context).transform(cnl_parser.parse(
+            'A drink is one of alcoholic, nonalcoholic and has color that is equal to respectively blue, yellow.'))
+        self.assertEqual(str(problem.convert(ASPConverter(context))).strip(),
+                         'drink("alcoholic","blue";"nonalcoholic","yellow").')
+
+    def test_compact_temporal_facts(self):
+        definitions = '''
+                                    A timeslot is a temporal concept expressed in minutes ranging from 07:30 AM to 07:50 AM with a length of 10 minutes.
+                                    An entity is identified by a timeslot.
+                                    It is required that the entity is after 07:40 AM.'''
+        label_constraint = '''
+                                    It is prohibited that there is a timeslot with value equal to V, where V is one of a.'''
+        context = CompilationContext(compact_temporal_facts=True)
+        problem = CNLTransformer(context).transform(cnl_parser.parse(definitions))
+        self.assertEqual(str(problem.convert(ASPConverter(context))).strip(),
+                         'timeslot(0..2,unlabelled).\n'
+                         ':- entity(TMSLT_NTTY), TMSLT_NTTY <= 1.')
+        context = CompilationContext(compact_temporal_facts=True)
+        problem = CNLTransformer(context).transform(cnl_parser.parse(definitions + label_constraint))
+        self.assertTrue(str(problem.convert(ASPConverter(context))).startswith('timeslot(0,"07:30 AM").\n'))
+
     def test_fact_proposition(self):
         self.check_input_to_output('A movie is identified by an id, by a director, by a title, by a year.' \
                                    'There is a movie with id equal to 1, with director equal to spielberg, ' \
@@ -160,9 +196,9 @@ class TestCnlPropositions(unittest.TestCase):
                                         and the id of the day is equal to 1.''',
                                    ':- patient(PTNT_D), day(DY_D), (PTNT_D + DY_D) != 1.')
 
-    @patch('cnl2asp.utility.utility.uuid4')
-    def test_duration_clause(self, mock_uuid):
-        mock_uuid.return_value = "support"
+    @patch('cnl2asp.utility.utility.Utility.create_unique_identifier')
+    def test_duration_clause(self, mock_identifier):
+        mock_identifier.return_value = "x_support"
         self.check_input_to_output('''
                                     A timeslot is a temporal concept expressed in minutes ranging 
                                         from 07:30 AM to 07:40 AM with a length of 10 minutes.
@@ -175,9 +211,9 @@ class TestCnlPropositions(unittest.TestCase):
                                     {x_support(P,T)} :- patient(P), timeslot(T,_).
                                     assignment(P,T..T+2) :- patient(P), timeslot(T,_), x_support(P,T).''')
 
-    @patch('cnl2asp.utility.utility.uuid4')
-    def test_duration_clause_with_parameter_as_attribute(self, mock_uuid):
-        mock_uuid.return_value = "support"
+    @patch('cnl2asp.utility.utility.Utility.create_unique_identifier')
+    def test_duration_clause_with_parameter_as_attribute(self, mock_identifier):
+        mock_identifier.return_value = "x_support"
         self.check_input_to_output('''
                                     A timeslot is a temporal concept expressed in minutes ranging 
                                         from 07:30 AM to 07:40 AM with a length of 10 minutes.
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+
+from cnl2asp.cnl2asp import Cnl2asp, Symbol, SymbolType
+from cnl2asp.utility.compilation_cache import CompilationCache
+from cnl2asp.utility.compilation_context import CompilationContext
+
+from tests.test_sentence_transformer import GRAPH_COLORING
+
+
+class TestCompilationCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_directory = tempfile.TemporaryDirectory()
+        self.cache = CompilationCache(self._tmp_directory.name)
+
+    def tearDown(self):
+        self._tmp_directory.cleanup()
+
+    def _cache_files(self) -> list[str]:
+        return sorted(file_name for file_name in os.listdir(self._tmp_directory.name) if file_name.endswith('.txt'))
+
+    def test_results_are_reused(self):
+        expected = Cnl2asp(GRAPH_COLORING).compile()
+        self.assertEqual(Cnl2asp(GRAPH_COLORING, cache=self.cache).compile(), expected)
+        self.assertEqual(len(self._cache_files()), 1)
+        compiler = Cnl2asp(GRAPH_COLORING, cache=self.cache)
+        self.assertEqual(compiler.compile(), expected)
+        self.assertIsNone(compiler._session)  # nothing compiled
+        self.assertEqual(Cnl2asp(GRAPH_COLORING, cache=self.cache).get_symbols(), Cnl2asp(GRAPH_COLORING).get_symbols())
+        self.assertEqual(len(self._cache_files()), 2)
+
+    def test_optimized_statements_are_reused(self):
+        compiler = Cnl2asp(GRAPH_COLORING, cache=self.cache)
+        expected = [str(statement) for statement in compiler.optimize(compiler.compile(), as_statements=True)]
+        self.assertEqual(len(self._cache_files()), 2)
+        compiler = Cnl2asp(GRAPH_COLORING, cache=self.cache)
+        self.assertEqual([str(statement) for statement in compiler.optimize(compiler.compile(), as_statements=True)],
+                         expected)
+        self.assertEqual(len(self._cache_files()), 2)
+
+    def test_options_are_part_of_the_key(self):
+        Cnl2asp(GRAPH_COLORING, cache=self.cache).compile()
+        compiler = Cnl2asp(GRAPH_COLORING, context=CompilationContext(print_with_functions=True), cache=self.cache)
+        self.assertEqual(compiler.compile(), Cnl2asp(GRAPH_COLORING,
+                                                     context=CompilationContext(print_with_functions=True)).compile())
+        Cnl2asp(GRAPH_COLORING, cache=self.cache).compile(auto_link_entities=False)
+        Cnl2asp(GRAPH_COLORING + '\n', cache=self.cache).compile()
+        self.assertEqual(len(self._cache_files()), 4)
+        self.assertNotEqual(CompilationCache.get_key('code', 'input', optimize=True),
+                            CompilationCache.get_key('code', 'input', optimize=False))
+        symbol = Symbol('node', ['id'], ['id'], SymbolType.DEFAULT)
+        self.assertNotEqual(Cnl2asp._symbols_key([symbol]),
+                            Cnl2asp._symbols_key([Symbol('node', [], ['id'], SymbolType.DEFAULT)]))
+
+    def test_symbols_are_stored_as_json(self):
+        expected = Cnl2asp(GRAPH_COLORING).get_symbols()
+        self.assertEqual(Cnl2asp(GRAPH_COLORING, cache=self.cache).get_symbols(), expected)
+        compiler = Cnl2asp(GRAPH_COLORING, cache=self.cache)
+        self.assertEqual(compiler.get_symbols(), expected)
+        self.assertIsNone(compiler._session)  # nothing compiled
+
+    def test_least_recently_used_results_are_removed(self):
+        keys = [CompilationCache.get_key('code', str(i)) for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            self.cache.put(key, 'x' * 100)
+            os.utime(self.cache._cache_file(key), (i, i))
+        self.assertEqual(self.cache.get(keys[0]), 'x' * 100)  # now the most recently used
+        self.cache.max_size = 2 * os.path.getsize(self.cache._cache_file(keys[0])) + 100
+        self.cache.put(keys[2], 'x' * 100)
+        self.assertEqual(self.cache.get(keys[0]), 'x' * 100)
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertEqual(self.cache.get(keys[2]), 'x' * 100)
+        self.assertFalse([file_name for file_name in os.listdir(self._tmp_directory.name)
+                          if file_name.endswith('.tmp')])
+
+    def test_directory_is_scanned_only_when_the_estimated_size_is_exceeded(self):
+        self.cache.put(CompilationCache.get_key('code', '0'), 'x' * 100)
+        scans = []
+        entries = self.cache._entries
+        self.cache._entries = lambda: scans.append(None) or entries()
+        self.cache.put(CompilationCache.get_key('code', '1'), 'x' * 100)
+        self.assertEqual(scans, [])
+        self.cache.max_size = 100
+        self.cache.put(CompilationCache.get_key('code', '2'), 'x' * 100)
+        self.assertEqual(scans, [None])
+        self.assertEqual(self._cache_files(), [])
+
+    def test_corrupted_results_are_ignored(self):
+        key = CompilationCache.get_key('code', 'input')
+        with open(self.cache._cache_file(key), 'w') as file:
+            file.write('corrupted')
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, 'code')
+        with open(self.cache._cache_file(key), 'a') as file:
+            file.write('changed')
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, 'code')
+        self.assertEqual(self.cache.get(key), 'code')
+        self.cache.clear()
+        self.assertEqual(self._cache_files(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import io
+import os
+import subprocess
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from clingo import ast
+
+from cnl2asp.ASP_elements.solver.clingo_wrapper import Clingo
+from cnl2asp.cnl2asp import Cnl2asp
+from cnl2asp.specification.entity_component import EntityComponent
+from cnl2asp.specification.signaturemanager import SignatureManager
+from cnl2asp.utility.compilation_context import CompilationContext
+from cnl2asp.utility.utility import Utility
+
+from tests.test_sentence_transformer import GRAPH_COLORING
+
+DURATION = 'A timeslot is a temporal concept expressed in minutes ranging from 07:30 AM to 07:50 AM ' \
+           'with a length of 10 minutes.\n' \
+           'A patient is identified by an id.\n' \
+           'Whenever there is a patient P, whenever there is a timeslot T, ' \
+           'then we can have an assignment for 2 timeslots.\n' \
+           'Whenever there is a patient P, whenever there is a timeslot T, ' \
+           'then we can have a visit for 1 timeslots.'
+
+CLIQUE = 'A node goes from 1 to 5.\n' \
+         'Node 1 is connected to node X, where X is one of 2, 3, 4.\n' \
+         'Every node can be chosen.\n' \
+         'It is required that the number of nodes that are chosen is equal to 3.'
+
+
+class TestCompilationContext(unittest.TestCase):
+
+    def test_signatures_and_options_belong_to_the_active_context(self):
+        context = CompilationContext(print_with_functions=True)
+        with context.activate():
+            SignatureManager.add_signature(EntityComponent('node', '', [], []))
+            self.assertTrue(Utility.PRINT_WITH_FUNCTIONS)
+            self.assertTrue(SignatureManager.has_signature('node'))
+        self.assertEqual(len(context.signatures), 1)
+        self.assertFalse(SignatureManager.has_signature('node'))
+        self.assertFalse(Utility.PRINT_WITH_FUNCTIONS)
+
+    def test_utility_options_set_after_the_creation_of_the_compiler(self):
+        compiler = Cnl2asp(GRAPH_COLORING)
+        explicit_context = Cnl2asp(GRAPH_COLORING, context=CompilationContext())
+        expected = Cnl2asp(GRAPH_COLORING, context=CompilationContext(print_with_functions=True)).compile()
+        Utility.PRINT_WITH_FUNCTIONS = True
+        try:
+            self.assertEqual(compiler.compile(), expected)
+            self.assertEqual(''.join(compiler.compile_iter()), expected)
+            self.assertNotEqual(explicit_context.compile(), expected)
+        finally:
+            Utility.PRINT_WITH_FUNCTIONS = False
+        self.assertNotEqual(compiler.compile(), expected)
+
+    def test_compilations_do_not_share_state(self):
+        graph_coloring = Cnl2asp(GRAPH_COLORING)
+        clique = Cnl2asp(CLIQUE)
+        expected = [graph_coloring.compile(), clique.compile()]
+        chunks = clique.compile_iter()
+        first_chunk = next(chunks)
+        self.assertEqual(graph_coloring.compile(), expected[0])
+        self.assertEqual(first_chunk + ''.join(chunks), expected[1])
+
+    def test_concurrent_compilations(self):
+        inputs = [GRAPH_COLORING, CLIQUE] * 4
+        expected = [Cnl2asp(cnl_input).compile() for cnl_input in inputs]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda cnl_input: Cnl2asp(cnl_input).compile(), inputs))
+        self.assertEqual(results, expected)
+
+    def test_remove_duplicate_rules(self):
+        cnl_input = 'A node goes from 1 to 5.\n' \
+                    'Node 1 is connected to node X, where X is one of 2, 3, 2.'
+        duplicates = Cnl2asp(cnl_input).compile()
+        self.assertEqual(duplicates.count('connected_to(1,X) :- node(1), node(X), X = 2.'), 2)
+        compiler = Cnl2asp(cnl_input, context=CompilationContext(remove_duplicate_rules=True))
+        expected = 'node(1..5).\n' \
+                   'connected_to(1,X) :- node(1), node(X), X = 2.\n' \
+                   'connected_to(1,X) :- node(1), node(X), X = 3.\n'
+        self.assertEqual(compiler.compile(), expected)
+        self.assertEqual(''.join(compiler.compile_iter()), expected)
+
+    def test_compile_ast(self):
+        for cnl, context in [(GRAPH_COLORING, CompilationContext()),
+                             (GRAPH_COLORING, CompilationContext(print_with_functions=True, pool_facts=True)),
+                             (CLIQUE, CompilationContext(pool_substitutions=True))]:
+            compiler = Cnl2asp(cnl, context=context)
+            parsed = []
+            ast.parse_string(compiler.compile(), parsed.append)
+            statements = compiler.compile_ast()
+            self.assertEqual([str(statement) for statement in statements], [str(statement) for statement in parsed])
+            self.assertEqual([statement.location.begin.line for statement in statements],
+                             [statement.location.begin.line for statement in parsed])
+        solver = Clingo()
+        solver.load(Cnl2asp(CLIQUE).compile_ast())
+        models = solver.solve()
+        solver = Clingo()
+        solver.load(Cnl2asp(CLIQUE).compile())
+        self.assertEqual(models, solver.solve())
+        compiler = Cnl2asp(CLIQUE)
+        optimized = compiler.optimize(compiler.compile_ast(), as_statements=True)
+        self.assertEqual(''.join(f'{statement}\n' for statement in optimized), compiler.optimize(compiler.compile()))
+
+    def test_session_shares_the_artifacts(self):
+        expected = Cnl2asp(GRAPH_COLORING).compile()
+        compiler = Cnl2asp(io.StringIO(GRAPH_COLORING))  # a stream can be read only once
+        session = compiler.session()
+        self.assertEqual(compiler.compile(), expected)
+        self.assertIs(compiler.session(), session)
+        self.assertIs(session.specification, session.specification)
+        self.assertIn('node', [symbol.predicate for symbol in compiler.get_symbols()])
+        self.assertTrue(compiler.cnl_to_json()['assignments'])
+        self.assertTrue(session.specification.get_problems()[0].get_propositions())
+        compiler.update_input(CLIQUE)
+        self.assertIsNot(compiler.session(), session)
+        self.assertEqual(compiler.compile(), Cnl2asp(CLIQUE).compile())
+
+    def test_session_is_replaced_when_the_options_change(self):
+        for incremental in [False, True]:
+            compiler = Cnl2asp(GRAPH_COLORING, incremental=incremental)
+            self.assertEqual(compiler.compile(), Cnl2asp(GRAPH_COLORING).compile())
+            compiler.context.print_with_functions = True
+            self.assertEqual(compiler.compile(),
+                             Cnl2asp(GRAPH_COLORING, context=CompilationContext(print_with_functions=True)).compile())
+            compiler.context.pool_substitutions = True
+            compiler.update_input(CLIQUE)
+            compiler.compile()
+            compiler.context.pool_substitutions = False
+            self.assertEqual(compiler.compile(),
+                             Cnl2asp(CLIQUE, context=CompilationContext(print_with_functions=True)).compile())
+
+    def test_output_is_identical_across_compilations(self):
+        code = Cnl2asp(DURATION).compile()
+        self.assertIn('x_', code)  # the support entities of the durations
+        self.assertEqual(Cnl2asp(DURATION).compile(), code)
+        compiler = Cnl2asp(DURATION, incremental=True)
+        compiler.compile()
+        edited_input = DURATION.replace('a visit', 'an appointment')
+        compiler.update_input(edited_input)
+        self.assertEqual(compiler.compile(), Cnl2asp(edited_input).compile())
+        self.assertIn(code.splitlines()[3], compiler.compile())  # the unchanged sentences keep their identifiers
+        sentences = DURATION.split('\n')
+        sentences.insert(2, 'Whenever there is a patient P, whenever there is a timeslot T, '
+                            'then we can have a checkup for 1 timeslots.')
+        extended_code = Cnl2asp('\n'.join(sentences)).compile()
+        self.assertIn(code.splitlines()[3], extended_code)  # the sentences after the new one keep their identifiers
+        self.assertIn(code.splitlines()[5], extended_code)
+        process = subprocess.run([sys.executable, '-c', 'import sys\n'
+                                                        'from cnl2asp.cnl2asp import Cnl2asp\n'
+                                                        'sys.stdout.write(Cnl2asp(sys.stdin.read()).compile())'],
+                                 input=DURATION, capture_output=True, text=True, check=True,
+                                 cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 env={**os.environ, 'PYTHONHASHSEED': '1'})
+        self.assertEqual(process.stdout, code)
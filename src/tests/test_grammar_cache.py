@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from cnl2asp.parser.grammar_cache import GrammarCache, is_private
+
+
+class TestGrammarCache(unittest.TestCase):
+
+    def setUp(self):
+        self._cache_directory = GrammarCache.CACHE_DIRECTORY
+        self._tmp_directory = tempfile.TemporaryDirectory()
+        GrammarCache.CACHE_DIRECTORY = self._tmp_directory.name
+        GrammarCache.clear()
+
+    def tearDown(self):
+        GrammarCache.clear()
+        GrammarCache.CACHE_DIRECTORY = self._cache_directory
+        self._tmp_directory.cleanup()
+
+    def test_parser_is_shared(self):
+        parser = GrammarCache.get_parser(propagate_positions=True)
+        self.assertIs(parser, GrammarCache.get_parser(propagate_positions=True))
+        self.assertIsNot(parser, GrammarCache.get_parser())
+
+    def test_parser_is_loaded_from_disk(self):
+        text = 'A node is identified by an id.\nWhenever there is a node N, then we can have a color C.'
+        parser = GrammarCache.get_parser(propagate_positions=True)
+        self.assertEqual(len([x for x in os.listdir(self._tmp_directory.name) if x.endswith('.pickle')]), 1)
+        GrammarCache.clear()
+        loaded_parser = GrammarCache.get_parser(propagate_positions=True)
+        self.assertIsNot(parser, loaded_parser)
+        self.assertEqual(parser.parse(text), loaded_parser.parse(text))
+
+    def test_corrupted_cache_file_is_replaced(self):
+        key = GrammarCache.get_key(GrammarCache.get_grammar())
+        with open(os.path.join(self._tmp_directory.name, f'grammar_{key}.pickle'), 'wb') as file:
+            file.write(b'corrupted')
+        parser = GrammarCache.get_parser()
+        self.assertTrue(parser.parse('A node is identified by an id.'))
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'file owners and permissions are not available')
+    def test_parser_is_not_loaded_from_a_shared_directory(self):
+        GrammarCache.get_parser(propagate_positions=True)
+        key = GrammarCache.get_key(GrammarCache.get_grammar(), propagate_positions=True)
+        self.assertTrue(is_private(self._tmp_directory.name))
+        self.assertIsNotNone(GrammarCache._load(key))
+        os.chmod(self._tmp_directory.name, 0o777)  # other users could replace the pickles
+        self.assertFalse(is_private(self._tmp_directory.name))
+        self.assertIsNone(GrammarCache._load(key))
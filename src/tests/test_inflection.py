@@ -0,0 +1,31 @@
+import unittest
+
+from cnl2asp.specification.name_component import NameComponent
+from cnl2asp.utility.inflection import Inflection, _singular
+from cnl2asp.utility.utility import Utility
+
+
+class TestInflection(unittest.TestCase):
+
+    def tearDown(self):
+        Inflection.clear_lexicon()
+
+    def test_singular_and_plural(self):
+        self.assertEqual(Inflection.get_singular('nurses'), 'nurse')
+        self.assertEqual(Inflection.get_singular('nurse'), 'nurse')
+        self.assertEqual(Inflection.get_plural('nurse'), 'nurses')
+        self.assertEqual(Inflection.get_singular(''), '')
+        self.assertEqual(Utility.get_singular('days'), 'day')
+
+    def test_forms_are_memoized(self):
+        Inflection.clear_cache()
+        Inflection.get_singular('shifts')
+        Inflection.get_singular('shifts')
+        self.assertEqual((_singular.cache_info().hits, _singular.cache_info().misses), (1, 1))
+
+    def test_lexicon(self):
+        Inflection.load_lexicon({'datum': 'data'})
+        self.assertEqual(Inflection.get_singular('data'), 'datum')
+        self.assertEqual(Inflection.get_singular('datum'), 'datum')
+        self.assertEqual(Inflection.get_plural('datum'), 'data')
+        self.assertEqual(NameComponent('data'), 'datum')
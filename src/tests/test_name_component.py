@@ -0,0 +1,41 @@
+import copy
+import pickle
+import unittest
+
+from cnl2asp.specification.attribute_component import AttributeComponent, ValueComponent
+from cnl2asp.specification.name_component import NameComponent
+
+
+class TestNameComponent(unittest.TestCase):
+
+    def test_names_are_interned(self):
+        name = NameComponent('nurses')
+        self.assertIs(name, NameComponent('nurses'))
+        self.assertIs(name, name.copy())
+        self.assertIs(name, copy.deepcopy(name))
+        self.assertIs(name, pickle.loads(pickle.dumps(name)))
+
+    def test_singular_and_plural_are_equal(self):
+        self.assertEqual(NameComponent('nurses'), NameComponent('nurse'))
+        self.assertEqual(hash(NameComponent('nurses')), hash(NameComponent('nurse')))
+        self.assertEqual(NameComponent('nurses'), 'nurse')
+        self.assertNotEqual(NameComponent('nurse'), NameComponent('shift'))
+        self.assertEqual(len({NameComponent('day'), NameComponent('days')}), 1)
+
+    def test_names_are_equal_to_their_singular_and_plural_strings(self):
+        self.assertEqual(NameComponent('node'), 'nodes')
+        self.assertEqual(NameComponent('nodes'), 'node')
+        self.assertEqual(NameComponent('nodes'), 'nodes')
+        self.assertEqual(NameComponent('class'), 'classes')
+        self.assertEqual(NameComponent('bus'), 'bus')
+        self.assertNotEqual(NameComponent('bus'), 'node')
+        self.assertEqual(hash(NameComponent('bus')), hash(NameComponent('bu')))
+
+    def test_names_are_immutable(self):
+        name = NameComponent('shift')
+        with self.assertRaises(AttributeError):
+            name.name = 'day'
+        attribute = AttributeComponent('shift_id', ValueComponent('_'))
+        attribute.removesuffix('_id')
+        self.assertEqual(attribute.get_name(), 'shift')
+        self.assertEqual(str(NameComponent('shift_id')), 'shift_id')
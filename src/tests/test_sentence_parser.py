@@ -0,0 +1,58 @@
+import unittest
+
+from lark import UnexpectedInput
+
+from cnl2asp.cnl2asp import Cnl2asp
+from cnl2asp.parser.grammar_cache import GrammarCache
+from cnl2asp.parser.sentence_parser import split_sentences, SentenceParser, SentenceParserType, ParserProfile
+from cnl2asp.specification.signaturemanager import SignatureManager
+
+
+class TestSentenceParser(unittest.TestCase):
+
+    def setUp(self):
+        SignatureManager.signatures = []
+
+    def test_split_sentences(self):
+        text = 'A node is identified by an id. // comment. with dots.\n' \
+               '/* multi\nline. */ A weight is equal to 0.5.\n' \
+               'The following propositions always apply:\n' \
+               'There is a node with id "a". There is'
+        sentences = list(split_sentences(text))
+        self.assertEqual([x.text for x in sentences], ['A node is identified by an id.',
+                                                       'A weight is equal to 0.5.',
+                                                       'The following propositions always apply:',
+                                                       'There is a node with id "a".',
+                                                       'There is'])
+        self.assertEqual([(x.line, x.column) for x in sentences], [(1, 1), (3, 10), (4, 1), (5, 1), (5, 30)])
+        self.assertTrue(sentences[2].is_problem_identifier)
+
+    def test_same_tree_of_the_document_parser(self):
+        text = 'A node goes from 1 to 3.\n' \
+               'A color is one of red, green, blue.\n' \
+               'Every node can be assigned to exactly 1 color.\n' \
+               'The following propositions always apply:\n' \
+               'It is required that when node X is connected to node Y then node X is not assigned to color C ' \
+               'and also node Y is not assigned to color C.'
+        parser = SentenceParser()
+        self.assertEqual(parser.parse(text), GrammarCache.get_parser(propagate_positions=True).parse(text))
+        self.assertEqual([x.parser for x in parser.parsed_sentences], [SentenceParserType.EARLEY] * 4)
+
+    def test_positions_are_relative_to_the_input(self):
+        parser = SentenceParser()
+        tree = parser.parse('A node is identified by an id.\n\n  A color is one of red, green.')
+        self.assertEqual((tree.children[2].meta.line, tree.children[2].meta.column), (3, 3))
+
+    def test_document_parser_reports_errors(self):
+        parser = SentenceParser()
+        with self.assertRaises(UnexpectedInput) as context:
+            parser.parse('A node is identified by an id.\nThe following propositions always apply:\n'
+                         'A color is identified by an id.')
+        self.assertEqual(context.exception.line, 3)
+
+    def test_parser_profiles_compile_the_same_program(self):
+        text = 'A node goes from 1 to 3.\n' \
+               'A color is one of red, green, blue.\n' \
+               'Node 1 is connected to node X, where X is one of 2, 3.\n' \
+               'Every node can be assigned to exactly 1 color.'
+        self.assertEqual(Cnl2asp(text).compile(), Cnl2asp(text, parser_profile=ParserProfile.DOCUMENT).compile())
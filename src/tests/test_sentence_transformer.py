@@ -0,0 +1,142 @@
+import unittest
+
+from lark import UnexpectedInput
+from lark.exceptions import VisitError
+
+from cnl2asp.cnl2asp import Cnl2asp
+from cnl2asp.converter.asp_converter import ASPConverter
+from cnl2asp.parser.parser import CNLTransformer
+from cnl2asp.parser.sentence_parser import SentenceParser, split_sentences
+from cnl2asp.parser.sentence_transformer import SentenceTransformer, IncrementalTransformer
+from cnl2asp.specification.signaturemanager import SignatureManager
+
+GRAPH_COLORING = 'A node goes from 1 to 3.\n' \
+                 'A color is one of red, green, blue.\n' \
+                 'Node 1 is connected to node X, where X is one of 2, 3.\n' \
+                 'Every node can be assigned to exactly 1 color.\n' \
+                 'The following propositions always apply:\n' \
+                 'It is required that when node X is connected to node Y then node X is not assigned to color C ' \
+                 'and also node Y is not assigned to color C.'
+
+
+class TestSentenceTransformer(unittest.TestCase):
+
+    def setUp(self):
+        SignatureManager.signatures = []
+
+    def test_same_specification_of_the_document_transformer(self):
+        parser = SentenceParser()
+        specification = SentenceTransformer().transform(parser.parse_sentences(split_sentences(GRAPH_COLORING)))
+        program = str(specification.convert(ASPConverter()))
+        SignatureManager.signatures = []
+        specification = CNLTransformer().transform(parser.parse(GRAPH_COLORING))
+        self.assertEqual(program, str(specification.convert(ASPConverter())))
+
+    def test_only_edited_sentences_are_transformed(self):
+        cnl2asp = Cnl2asp(GRAPH_COLORING, incremental=True)
+        cnl2asp.compile()
+        transformer: IncrementalTransformer = cnl2asp._incremental_transformer
+        self.assertEqual(transformer.transformed_sentences, 6)
+        for edited in [GRAPH_COLORING.replace('exactly 1 color', 'at most 1 color'),
+                       GRAPH_COLORING.replace('exactly 1 color', 'at least 1 color')]:
+            cnl2asp.update_input(edited)
+            self.assertEqual(cnl2asp.compile(), Cnl2asp(edited).compile())
+        # the first edit restarts from the beginning and saves the state before the edited sentence
+        self.assertEqual(transformer.transformed_sentences, 3)
+        cnl2asp.update_input(edited)
+        cnl2asp.compile()
+        self.assertEqual(transformer.transformed_sentences, 0)
+
+    def test_checkpoints_do_not_copy_the_propositions(self):
+        cnl2asp = Cnl2asp(GRAPH_COLORING, incremental=True)
+        cnl2asp.compile()
+        checkpoints = cnl2asp._incremental_transformer._checkpoints
+        self.assertEqual(len(checkpoints), 2)
+        for (sentence_transformer, _), _ in checkpoints.values():
+            self.assertFalse(sentence_transformer.transformer.get_specification().get_problems())
+            self.assertFalse(sentence_transformer.transformer.get_problem().get_propositions())
+        edited = 'A node goes from 1 to 4.\n' + GRAPH_COLORING.split('\n', 1)[1]
+        cnl2asp.update_input(edited)
+        self.assertEqual(cnl2asp.compile(), Cnl2asp(edited).compile())
+
+    def test_unparsable_sentence_falls_back_to_the_document(self):
+        cnl2asp = Cnl2asp(GRAPH_COLORING, incremental=True)
+        cnl2asp.compile()
+        cnl2asp.update_input(GRAPH_COLORING.replace('A color is one of', 'A color is one of of'))
+        with self.assertRaises(UnexpectedInput):
+            cnl2asp.compile()
+        cnl2asp.update_input(GRAPH_COLORING)
+        self.assertEqual(cnl2asp.compile(), Cnl2asp(GRAPH_COLORING).compile())
+
+
+class _LineReader:
+    # input that tracks the lines read
+    def __init__(self, text: str, seekable: bool = False):
+        self.lines = text.splitlines(keepends=True)
+        self.read_lines = 0
+        self._seekable = seekable
+
+    def __iter__(self):
+        for line in self.lines:
+            self.read_lines += 1
+            yield line
+
+    def seekable(self):
+        return self._seekable
+
+
+class TestStreamingCompilation(unittest.TestCase):
+
+    def test_same_program_of_compile(self):
+        self.assertEqual(''.join(Cnl2asp(GRAPH_COLORING).compile_iter()), Cnl2asp(GRAPH_COLORING).compile())
+        text = GRAPH_COLORING.replace('The following propositions always apply:\n', '')
+        self.assertEqual(''.join(Cnl2asp(text).compile_iter()), Cnl2asp(text).compile())
+
+    def test_rules_are_yielded_before_reading_the_whole_input(self):
+        text = GRAPH_COLORING.replace('The following propositions always apply:\n', '') + \
+               '\nIt is prohibited that node 1 is assigned to color red.'
+        for seekable in [False, True]:
+            reader = _LineReader(text, seekable)
+            rules = Cnl2asp(reader).compile_iter()
+            self.assertEqual(next(rules), 'node(1..3).\n')
+            self.assertLess(reader.read_lines, len(reader.lines))
+            self.assertEqual('node(1..3).\n' + ''.join(rules), Cnl2asp(text).compile())
+
+    def test_definitions_are_yielded_before_reading_the_whole_input(self):
+        text = ''.join(f'A thing{i} is one of a, b.\n' for i in range(20))
+        reader = _LineReader(text)
+        rules = Cnl2asp(reader).compile_iter()
+        self.assertEqual(next(rules), 'thing0("a").\nthing0("b").\n')
+        self.assertLess(reader.read_lines, len(reader.lines))
+        self.assertEqual('thing0("a").\nthing0("b").\n' + ''.join(rules), Cnl2asp(text).compile())
+
+    def test_definitions_are_yielded_again_in_the_program_of_the_identifier(self):
+        text = 'A color is one of red, green.\n' \
+               'The following propositions always apply:\n' \
+               'A node goes from 1 to 3.'
+        rules = ''.join(Cnl2asp(_LineReader(text)).compile_iter())
+        self.assertEqual(rules, 'color("red").\ncolor("green").\n\n' + Cnl2asp(text).compile())
+
+    def test_parser_error_position(self):
+        text = GRAPH_COLORING.replace('A color is one of', 'A color is one of of')
+        with self.assertRaises(UnexpectedInput) as context:
+            list(Cnl2asp(text).compile_iter())
+        self.assertEqual((context.exception.line, context.exception.column), (2, 22))
+
+
+class TestPositions(unittest.TestCase):
+
+    def test_same_program_without_positions(self):
+        self.assertEqual(Cnl2asp(GRAPH_COLORING, propagate_positions=False).compile(),
+                         Cnl2asp(GRAPH_COLORING).compile())
+
+    def test_error_line_without_positions(self):
+        text = GRAPH_COLORING.replace('Every node can be assigned to exactly 1 color.',
+                                      'Every node can be assigned to exactly 1 \nshape.')
+        for cnl2asp in [Cnl2asp(text, propagate_positions=False), Cnl2asp(text)]:
+            with self.assertRaises(VisitError) as context:
+                cnl2asp.compile()
+            self.assertIn('line 5', str(context.exception))
+        with self.assertRaises(VisitError) as context:
+            list(Cnl2asp(text, propagate_positions=False).compile_iter())
+        self.assertIn('line 4', str(context.exception))
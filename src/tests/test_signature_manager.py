@@ -0,0 +1,112 @@
+import unittest
+
+from cnl2asp.cnl2asp import Cnl2asp
+from cnl2asp.exception.cnl2asp_exceptions import AttributeNotFound, EntityNotFound
+from cnl2asp.specification.attribute_component import AttributeComponent, ValueComponent, AttributeOrigin
+from cnl2asp.specification.entity_component import EntityComponent, EntityType
+from cnl2asp.specification.name_component import NameComponent
+from cnl2asp.specification.signaturemanager import SignatureManager
+
+
+class TestSignatureManager(unittest.TestCase):
+
+    def setUp(self):
+        SignatureManager.signatures = []
+
+    def tearDown(self):
+        SignatureManager.signatures = []
+
+    @staticmethod
+    def _entity(name: str, keys: list[str], attributes: list[str] = None, entity_type=EntityType.GENERIC):
+        return EntityComponent(name, '', [AttributeComponent(key, ValueComponent('_'), AttributeOrigin(name)) for key in keys],
+                               [AttributeComponent(attribute, ValueComponent('_')) for attribute in attributes or []],
+                               entity_type=entity_type)
+
+    def test_lookup_by_singular_and_plural(self):
+        SignatureManager.add_signature(self._entity('nurse', ['id']))
+        self.assertTrue(SignatureManager.has_signature('nurses'))
+        self.assertTrue(SignatureManager.has_signature(NameComponent('nurse')))
+        self.assertIs(SignatureManager.find_signature('nurse'), SignatureManager.get_signature('nurses'))
+        self.assertFalse(SignatureManager.has_signature('shift'))
+        self.assertIsNone(SignatureManager.find_signature('shift'))
+        with self.assertRaises(EntityNotFound):
+            SignatureManager.get_signature('shift')
+
+    def test_replaced_signatures_are_reindexed(self):
+        SignatureManager.add_signature(self._entity('nurse', ['id']))
+        SignatureManager.signatures = [self._entity('shift', ['id'])]
+        self.assertFalse(SignatureManager.has_signature('nurse'))
+        self.assertTrue(SignatureManager.has_signature('shift'))
+
+    def test_type_lookup(self):
+        SignatureManager.add_signature(self._entity('day', ['id'], entity_type=EntityType.DATE))
+        self.assertTrue(SignatureManager.is_temporal_entity('days'))
+        self.assertFalse(SignatureManager.is_temporal_entity('nurse'))
+        self.assertEqual(SignatureManager.get_signature_from_type(EntityType.DATE).get_name(), 'day')
+        with self.assertRaises(EntityNotFound):
+            SignatureManager.get_signature_from_type(EntityType.TIME)
+
+    def test_declared_attributes_are_replaced_by_keys(self):
+        SignatureManager.add_signature(self._entity('assignment', ['id'], ['nurse', 'day']))
+        SignatureManager.add_signature(self._entity('nurse', ['name', 'surname']))
+        attributes = [attribute.get_name() for attribute in SignatureManager.get_signature('assignment').attributes]
+        self.assertEqual(attributes, ['day', 'name', 'surname'])
+
+    def test_declared_keys_are_not_replaced(self):
+        signatures = Cnl2asp('A segment is identified by an image, and by a color.\n'
+                             'An image is identified by an id, and has a sequence.\n').session().signatures
+        segment = next(signature for signature in signatures if signature.get_name() == 'segment')
+        self.assertEqual([key.get_name() for key in segment.keys], ['image', 'color'])
+        self.assertEqual(segment.attributes, [])
+
+    def test_signature_view(self):
+        SignatureManager.add_signature(self._entity('nurse', ['id'], ['name']))
+        view = SignatureManager.get_signature_view('nurses')
+        self.assertEqual([key.get_name() for key in view.get_keys()], ['id'])
+        self.assertEqual(view.entity_type, EntityType.GENERIC)
+        with self.assertRaises(AttributeError):
+            view.keys = []
+        with self.assertRaises(EntityNotFound):
+            SignatureManager.get_signature_view('shift')
+
+    def test_cloned_signatures_are_copied_on_write(self):
+        SignatureManager.add_signature(self._entity('nurse', ['id'], ['name']))
+        signature = SignatureManager.get_signature('nurse')
+        clone = SignatureManager.clone_signature('nurse')
+        self.assertIs(clone._keys, signature.keys)
+        self.assertEqual(clone.get_keys(), tuple(signature.keys))
+        self.assertEqual(clone.get_attributes(), tuple(signature.attributes))
+        with self.assertRaises(AttributeError):
+            clone.get_keys().remove(signature.keys[0])  # shared with the signature, modified through keys
+        self.assertEqual(clone.find_attributes_by_name('name'), signature.attributes)
+        self.assertTrue(clone._shared)  # reading does not copy
+        clone.set_attribute_value('id', ValueComponent('1'))
+        self.assertIsNot(clone.keys, signature.keys)
+        self.assertEqual(clone.keys[0].value, '1')
+        self.assertEqual(signature.keys[0].value, '_')
+
+    def test_clones_do_not_see_later_declarations(self):
+        SignatureManager.add_signature(self._entity('assignment', ['id'], ['nurse']))
+        clone = SignatureManager.clone_signature('assignment')
+        SignatureManager.add_signature(self._entity('nurse', ['name']))
+        self.assertEqual([attribute.get_name() for attribute in clone.attributes], ['nurse'])
+
+    def test_attribute_lookup_by_name(self):
+        entity = self._entity('nurse', ['id'], ['name'])
+        self.assertEqual(entity.find_attributes_by_name('ids'), [entity.keys[0]])
+        self.assertEqual(entity.find_attributes_by_name('surname'), [])
+        entity.attributes.append(AttributeComponent('surname', ValueComponent('_')))
+        self.assertEqual(entity.find_attributes_by_name('surname'), [entity.attributes[1]])
+        entity.attributes[1].set_name('age')
+        self.assertEqual(entity.find_attributes_by_name('surname'), [])
+        entity.attributes[1] = AttributeComponent('surname', ValueComponent('_'))  # same length
+        self.assertEqual(entity.find_attributes_by_name('surname'), [entity.attributes[1]])
+        self.assertEqual(entity.find_attributes_by_name('age'), [])
+        self.assertEqual(entity.find_attributes_by_name_and_origin('id', AttributeOrigin('nurse')), [entity.keys[0]])
+        self.assertEqual(entity.find_attributes_by_name_and_origin('id', AttributeOrigin('shift')), [])
+
+    def test_attribute_not_found_message(self):
+        entity = self._entity('nurse', ['id'])
+        with self.assertRaises(AttributeNotFound) as error:
+            entity.get_attributes_by_name_and_origin('id', AttributeOrigin('shift'))
+        self.assertEqual(str(error.exception), 'Entity "nurse" do not contain attribute "shift id".\nDid you mean "nurse id"?')
@@ -0,0 +1,32 @@
+import unittest
+
+from cnl2asp.specification.entity_component import TemporalEntityComponent, EntityType
+
+
+class TestTemporalRange(unittest.TestCase):
+
+    def test_time_range(self):
+        timeslot = TemporalEntityComponent('timeslot', '', '11:50 PM', '11:59 PM', '5', EntityType.TIME)
+        self.assertEqual(list(timeslot.values.items()), [('11:50 PM', 0), ('11:55 PM', 1)])
+        self.assertEqual(timeslot.get_temporal_value_id('11:55 PM'), 1)
+        for value in ['11:52 PM', '12:00 AM', '11:5 PM', 1]:
+            with self.assertRaises(KeyError):
+                timeslot.get_temporal_value_id(value)
+
+    def test_date_range(self):
+        day = TemporalEntityComponent('day', '', '30/12/2022', '02/01/2023', None, EntityType.DATE)
+        self.assertEqual(len(day.values), 4)
+        self.assertEqual(day.values.get_value(3), '02/01/2023')
+        self.assertEqual(day.get_temporal_value_id('01/01/2023'), 2)
+        self.assertIs(day.copy().values, day.values)
+
+    def test_step_range(self):
+        time = TemporalEntityComponent('time', '', '1', '3', None, EntityType.STEP)
+        self.assertEqual(list(time.values.items()), [(1, 0), (2, 1), (3, 2)])
+        self.assertEqual(time.get_temporal_value_id(3), 2)
+        with self.assertRaises(KeyError):
+            time.get_temporal_value_id(4)
+
+    def test_wrong_bounds(self):
+        with self.assertRaises(Exception):
+            TemporalEntityComponent('day', '', '07:30 AM', '08:30 AM', None, EntityType.DATE)
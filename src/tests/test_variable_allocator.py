@@ -0,0 +1,26 @@
+import unittest
+
+from cnl2asp.utility.variable_allocator import VariableAllocator
+
+
+class TestVariableAllocator(unittest.TestCase):
+
+    def test_new_variables(self):
+        variables = VariableAllocator(['NRS'])
+        self.assertEqual(variables.new_variable('nurse_id'), 'NRS_D')
+        self.assertEqual([variables.new_variable('nurse') for _ in range(3)], ['NRS1', 'NRS2', 'NRS3'])
+        self.assertEqual(variables.new_variable('nurse2'), 'NRS4')
+        self.assertEqual(variables.new_variable('nurse9'), 'NRS9')
+        self.assertEqual(variables.new_variable('nurse9'), 'NRS10')
+
+    def test_used_variables_are_skipped(self):
+        variables = VariableAllocator()
+        self.assertEqual(variables.new_variable('day'), 'DY')
+        variables.update(['DY1', 'DY2'])
+        self.assertEqual(variables.new_variable('day'), 'DY3')
+        variables.add('DY4')
+        copy = variables.copy()
+        self.assertEqual(copy.new_variable('day'), 'DY5')
+        self.assertEqual(list(variables), ['DY', 'DY1', 'DY2', 'DY3', 'DY4'])
+        self.assertIn('DY5', copy)
+        self.assertNotIn('DY5', variables)